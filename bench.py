@@ -0,0 +1,262 @@
+"""
+Diceball benchmarks — micro (pitch lookup, B.A.T.S., each AI decision) and
+macro (CPU-vs-CPU at-bats per second), with JSON results and baseline checks.
+
+Usage:
+    uv run bench.py                                   # run everything, write bench.json
+    uv run bench.py --save-baseline                   # ...and keep it as bench_baseline.json
+    uv run bench.py --baseline bench_baseline.json    # fail (exit 1) on a >10% slowdown
+    uv run bench.py --filter play_at_bat --threshold 0.05 --repeat 7
+
+Every benchmark is run once to warm the pitch tables and memo caches, then
+timed `repeat` times; the best run is the figure compared against the baseline
+(the median is saved alongside). A /cold benchmark clears every memo cache
+before each run instead, so it times the computation the warm ones look up.
+Timings are ns per operation — lower is better.
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+from importlib import import_module
+from itertools import combinations_with_replacement
+
+from game.ai import PitcherTable, _pitcher_plan, make_hitter_decision, make_pitcher_decision
+from game.bats import calculate_bats_probabilities
+from game.cache import clear_caches
+from game.config import GameConfig
+from game.dice import DiceSource
+from game.engine import play_at_bat
+from game.pitch_utils import PITCH_TYPES, PitchTable, find_pitch_outcome
+
+COUNTS = [(b, s) for b in range(4) for s in range(3)]
+STREAKS = [(None, 0), ("FB", 1), ("FB", 2), ("OFFSPEED", 1), ("OFFSPEED", 3)]
+RE_ROLLS = {0: "", 1: "1", 2: "1 2"}
+
+BENCHMARKS = {}
+COLD = set()  # benchmarks run with every memo cache cleared
+
+
+def benchmark(name, cold=False):
+    """Registers fn() -> number of operations it performed. cold: clear the memo caches before every run."""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        if cold:
+            COLD.add(name)
+        return fn
+    return register
+
+
+def clear_memos():
+    """Empties every config cache and the config-free lru_cache tables (game.perf.LRU_CACHES)."""
+    from game.perf import LRU_CACHES
+    clear_caches()
+    for module, name in LRU_CACHES:
+        getattr(import_module(module), name).cache_clear()
+
+
+def _hands(num_dice):
+    return [list(hand) for hand in combinations_with_replacement(range(1, 7), num_dice)]
+
+
+def _find_pitch_outcome_bench(num_dice):
+    config = GameConfig(pitcher_dice=num_dice)
+    hands = _hands(num_dice)
+
+    def run():
+        for hand in hands:
+            for pitch_type in PITCH_TYPES:
+                find_pitch_outcome(hand, pitch_type, config)
+        return len(hands) * len(PITCH_TYPES)
+    return run
+
+
+benchmark("find_pitch_outcome/4d")(_find_pitch_outcome_bench(4))
+benchmark("find_pitch_outcome/5d")(_find_pitch_outcome_bench(5))
+
+
+@benchmark("pitch_table_build/5d", cold=True)
+def _pitch_table_build():
+    """The cold cost find_pitch_outcome pays once per pitch rules: every 5-die hand."""
+    PitchTable(GameConfig()).row((1, 2, 3, 4, 5))
+    return 1
+
+
+def _bats_bench(num_reroll):
+    config = GameConfig(pitcher_dice=5)
+    hands = _hands(5)
+    re_roll_input = RE_ROLLS[num_reroll]
+
+    def run():
+        for hand in hands:
+            for swing_type in ("p", "c"):
+                calculate_bats_probabilities(hand, re_roll_input, swing_type, 0, 0, 0, 0, "FB", 2, "s", "fb",
+                                             gas_remaining=num_reroll, config=config)
+        return len(hands) * 2
+    return run
+
+
+for _num_reroll in RE_ROLLS:
+    benchmark(f"calculate_bats_probabilities/{_num_reroll}-reroll")(_bats_bench(_num_reroll))
+    benchmark(f"calculate_bats_probabilities/{_num_reroll}-reroll/cold", cold=True)(_bats_bench(_num_reroll))
+
+
+def _pitcher_decision_bench(num_dice):
+    config = GameConfig(pitcher_dice=num_dice)
+    hands = _hands(num_dice)
+
+    def run():
+        rng = DiceSource(1)
+        ops = 0
+        for hand in hands:
+            for balls, strikes in COUNTS:
+                for streak_type, streak_count in STREAKS:
+                    make_pitcher_decision(hand, balls, strikes, streak_type, streak_count, config.effective_gas(),
+                                          config=config, verbose=False, rng=rng)
+                    ops += 1
+        return ops
+    return run
+
+
+benchmark("make_pitcher_decision/4d")(_pitcher_decision_bench(4))
+benchmark("make_pitcher_decision/5d")(_pitcher_decision_bench(5))
+
+
+def _pitcher_plan_bench(num_dice):
+    """The heuristic behind make_pitcher_decision, which its (warm, or saved) table only looks up."""
+    config = GameConfig(pitcher_dice=num_dice)
+    hands = _hands(num_dice)
+
+    def run():
+        ops = 0
+        for hand in hands:
+            for balls, strikes in COUNTS:
+                for streak_type, streak_count in STREAKS:
+                    _pitcher_plan(hand, balls, strikes, streak_type, streak_count, config.effective_gas(), config)
+                    ops += 1
+        return ops
+    return run
+
+
+benchmark("pitcher_plan/4d/cold", cold=True)(_pitcher_plan_bench(4))
+benchmark("pitcher_plan/5d/cold", cold=True)(_pitcher_plan_bench(5))
+
+
+@benchmark("pitcher_table_compile/5d", cold=True)
+def _pitcher_table_compile():
+    """The cold cost of compiling every 5-die pitcher decision (make_pitcher_decision pays it slot by slot)."""
+    PitcherTable(GameConfig(), 5).compile()
+    return 1
+
+
+def _hitter_decision_bench(num_dice):
+    config = GameConfig(pitcher_dice=num_dice)
+    hands = _hands(num_dice)
+
+    def run():
+        rng = DiceSource(1)
+        ops = 0
+        for hand in hands:
+            for re_roll_input in RE_ROLLS.values():
+                for balls, strikes in COUNTS:
+                    make_hitter_decision(hand, re_roll_input, balls, strikes, "FB", 2, 2,
+                                         config=config, verbose=False, rng=rng)
+                    ops += 1
+        return ops
+    return run
+
+
+benchmark("make_hitter_decision/4d")(_hitter_decision_bench(4))
+benchmark("make_hitter_decision/5d")(_hitter_decision_bench(5))
+benchmark("make_hitter_decision/4d/cold", cold=True)(_hitter_decision_bench(4))
+benchmark("make_hitter_decision/5d/cold", cold=True)(_hitter_decision_bench(5))
+
+
+def _play_at_bat_bench(num_dice, n=2000):
+    config = GameConfig(pitcher_dice=num_dice)
+
+    def run():
+        rng = DiceSource(7)
+        for _ in range(n):
+            play_at_bat(num_dice, pitcher_is_ai=True, hitter_is_ai=True, verbose=False, config=config, rng=rng)
+        return n
+    return run
+
+
+benchmark("play_at_bat/4d")(_play_at_bat_bench(4))
+benchmark("play_at_bat/5d")(_play_at_bat_bench(5))
+
+
+def run_benchmarks(names, repeat=5):
+    """Times each named benchmark. Returns {name: {"ns_per_op", "median_ns_per_op", "ops"}}."""
+    results = {}
+    for name in names:
+        fn, cold = BENCHMARKS[name], name in COLD
+        if not cold:
+            fn()  # warm the tables and memo caches
+        timings = []
+        for _ in range(repeat):
+            if cold:
+                clear_memos()
+            start = time.perf_counter_ns()
+            ops = fn()
+            timings.append((time.perf_counter_ns() - start) / ops)
+        results[name] = {"ns_per_op": min(timings), "median_ns_per_op": statistics.median(timings), "ops": ops}
+        print(f"  {name:<40} {min(timings):>12,.0f} ns/op   ({1e9 / min(timings):>12,.0f} ops/s)")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Prints each benchmark against the baseline. Returns the names that got more than threshold slower."""
+    regressions = []
+    print(f"\n  {'Benchmark':<40} {'Baseline':>12} {'Now':>12} {'Change':>8}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"  {name:<40} {'—':>12} {result['ns_per_op']:>12,.0f} {'new':>8}")
+            continue
+        change = result["ns_per_op"] / before["ns_per_op"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:<40} {before['ns_per_op']:>12,.0f} {result['ns_per_op']:>12,.0f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Diceball benchmarks.")
+    parser.add_argument("--out", default="bench.json", help="where to write this run's results")
+    parser.add_argument("--baseline", default=None, help="results file to compare against")
+    parser.add_argument("--save-baseline", nargs="?", const="bench_baseline.json", default=None,
+                        help="also save this run as the baseline (default bench_baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before a benchmark counts as a regression (0.10 = 10%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark (the best is kept)")
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter is None or args.filter in name]
+    print(f"Running {len(names)} benchmarks (best of {args.repeat})...")
+    results = run_benchmarks(names, args.repeat)
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": results,
+    }
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(document, f, indent=2)
+    print(f"\nResults written to {args.out}.")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["benchmarks"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) more than {args.threshold:.0%} slower than {args.baseline}.")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
@@ -1,13 +1,9 @@
 """Quick diagnostic: what contact probabilities does the AI see when it takes?"""
-import builtins
 from collections import defaultdict
 from game.engine import roll_dice
 from game.pitch_utils import find_pitch_outcome
 from game.bats import calculate_bats_probabilities
 
-_real_print = builtins.print
-builtins.print = lambda *a, **k: None
-
 import random
 samples = 5000
 contact_probs_on_take = []
@@ -44,19 +40,17 @@ for _ in range(samples):
     else:
         contact_probs_on_take.append(wc)
 
-builtins.print = _real_print
-
 def stats(lst):
     if not lst: return "n/a"
     return f"min={min(lst):.2f} mean={sum(lst)/len(lst):.2f} max={max(lst):.2f}"
 
-_real_print(f"Samples: {samples}")
-_real_print(f"Would swing ({len(contact_probs_on_swing)}): {stats(contact_probs_on_swing)}")
-_real_print(f"Would take  ({len(contact_probs_on_take)}):  {stats(contact_probs_on_take)}")
-_real_print(f"\nContact prob distribution on takes:")
+print(f"Samples: {samples}")
+print(f"Would swing ({len(contact_probs_on_swing)}): {stats(contact_probs_on_swing)}")
+print(f"Would take  ({len(contact_probs_on_take)}):  {stats(contact_probs_on_take)}")
+print(f"\nContact prob distribution on takes:")
 buckets = defaultdict(int)
 for p in contact_probs_on_take:
     buckets[int(p * 10) / 10] += 1
 for k in sorted(buckets):
     bar = '#' * (buckets[k] // 20)
-    _real_print(f"  {k:.1f}-{k+0.1:.1f}  {buckets[k]:>5}  {bar}")
+    print(f"  {k:.1f}-{k+0.1:.1f}  {buckets[k]:>5}  {bar}")
@@ -1,8 +1,16 @@
-from itertools import combinations
-from game.pitch_utils import check_pitch_combo, calc_difficulty
-from game.config import DEFAULT_CONFIG
-import random
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, combinations, combinations_with_replacement
+from threading import Lock
+from game.pitch_utils import PITCH_TYPES, check_pitch_combo, pitch_table
+from game.cache import config_cache
+from game.config import DEFAULT_CONFIG, PITCH_FIELDS
+from game.bats import _bats_rows, _pitch_difficulty_distributions, _split_reroll
+from game.dice import default_dice
+from game.policy import STREAKS, _STREAK_INDEX, policy_table
+from game.tables import artifact_path, fields_digest, open_artifact, write_artifact
 import math
+import random
 
 def _pitcher_min_difficulty(balls, strikes):
     """
@@ -18,19 +26,19 @@ def _pitcher_min_difficulty(balls, strikes):
     return 1       # All other counts: throw anything valid, avoid free balls
 
 
-def make_pitcher_decision(dice, balls, strikes, streak_type, streak_count, gas_remaining,
-                           config=None, verbose=True):
-    """
-    Determines the AI pitcher's move: optional re-roll (costs 1 gas per die) + pitch commitment.
-    Count-aware: will intentionally ball a weak pitch rather than gift an easy hit.
+_GOTCHA_PITCH_RATE = 0.10   # chance a weak hand is thrown anyway instead of an intentional ball
 
-    Returns: (re_roll_input, chosen_pitch)
+
+def _pitcher_plan(dice, balls, strikes, streak_type, streak_count, gas_remaining, config):
     """
-    if config is None:
-        config = DEFAULT_CONFIG
-    if verbose:
-        print("\nAI Pitcher is thinking...")
+    The AI pitcher's options for one hand, before any randomness is drawn.
 
+    Returns (draw, branches, weights). Each branch is (re_roll_input, chosen_pitch, note),
+    where note is the narration printed when that branch is taken (or None).
+      draw None     — one branch, no random draw
+      draw "mix"    — rng.choices over the branches with the given weights
+      draw "gotcha" — branches[0] with probability _GOTCHA_PITCH_RATE, else branches[1]
+    """
     analysis = _analyze_dice(dice, config)
     possible_pitches = analysis["possible"]
     must_throw = balls >= 3   # another ball = walk
@@ -53,16 +61,17 @@ def make_pitcher_decision(dice, balls, strikes, streak_type, streak_count, gas_r
         # commits a surprise pitch — creating genuine uncertainty BATS can't resolve.
         valid = [p for p in possible_pitches if p['difficulty'] >= min_diff]
         if must_throw or len(valid) == 1:
-            chosen = best_in_hand
-        else:
-            scores = [pitch_score(p) for p in valid]
-            max_s = max(scores)
-            # T=0.5: ~86% best pitch, ~12% one step down, ~2% two steps down
-            weights = [math.exp((s - max_s) / 0.5) for s in scores]
-            chosen = random.choices(valid, weights=weights)[0]
-            if verbose and chosen['type'] != best_in_hand['type']:
-                print(f"  AI Pitcher mixes it up — going with {chosen['type']} (diff {chosen['difficulty']}).")
-        return "", chosen['type']
+            return None, [("", best_in_hand['type'], None)], None
+        scores = [pitch_score(p) for p in valid]
+        max_s = max(scores)
+        # T=0.5: ~86% best pitch, ~12% one step down, ~2% two steps down
+        weights = [math.exp((s - max_s) / 0.5) for s in scores]
+        branches = [
+            ("", p['type'], None if p['type'] == best_in_hand['type'] else
+             f"  AI Pitcher mixes it up — going with {p['type']} (diff {p['difficulty']}).")
+            for p in valid
+        ]
+        return "mix", branches, weights
 
     # --- Try to re-roll toward a better pitch ---
     if gas_remaining > 0:
@@ -82,62 +91,263 @@ def make_pitcher_decision(dice, balls, strikes, streak_type, streak_count, gas_r
             viable = [p for p in near_misses if must_throw or p['potential_difficulty'] >= min_diff]
             if viable:
                 best_target = max(viable, key=lambda p: p['score'])
-                if verbose:
-                    reason = "aiming higher" if best_in_hand else "building pitch"
-                    print(f"  AI Pitcher re-rolling toward {best_target['type']} ({reason})")
-                return best_target['reroll_indices'], best_target['type']
+                reason = "aiming higher" if best_in_hand else "building pitch"
+                note = f"  AI Pitcher re-rolling toward {best_target['type']} ({reason})"
+                return None, [(best_target['reroll_indices'], best_target['type'], note)], None
 
     # --- No gas / no viable re-roll ---
     if must_throw:
         # Have to throw something, even weak
         if best_in_hand:
-            if verbose:
-                print(f"  AI Pitcher commits {best_in_hand['type']} (diff {best_in_hand['difficulty']}) — must avoid a walk.")
-            return "", best_in_hand['type']
-        # No valid pitch at all — commit FB, it'll be a ball but nothing to be done
-        return "", "FB"
+            note = f"  AI Pitcher commits {best_in_hand['type']} (diff {best_in_hand['difficulty']}) — must avoid a walk."
+            return None, [("", best_in_hand['type'], note)], None
+        # No valid pitch at all — commit the first in the arsenal, it'll be a ball but nothing to be done
+        return None, [("", config.pitch_types()[0], None)], None
 
     # Not forced — intentionally ball the weak pitch, but occasionally surprise them
     if best_in_hand:
-        if random.random() < 0.10:
-            # "Gotcha" pitch: commit the weak pitch hoping hitter is sitting on a bluff
-            if verbose:
-                print(f"  AI Pitcher surprises — throws {best_in_hand['type']} (diff {best_in_hand['difficulty']}) to catch them looking.")
-            return "", best_in_hand['type']
+        # "Gotcha" pitch: commit the weak pitch hoping hitter is sitting on a bluff
+        gotcha = ("", best_in_hand['type'],
+                  f"  AI Pitcher surprises — throws {best_in_hand['type']} (diff {best_in_hand['difficulty']}) to catch them looking.")
 
         have_types = {p['type'] for p in possible_pitches}
         for t in ["CB", "CU", "FB"]:   # prefer to fake off-speed (more plausible bluff)
-            if t not in have_types:
-                if verbose:
-                    print(f"  AI Pitcher holds off — diff {best_in_hand['difficulty']} too hittable at {balls}-{strikes}. Intentional ball.")
-                return "", t
-        # Somehow holds all 3 types — throw best anyway
-        return "", best_in_hand['type']
+            if t in config.pitch_types() and t not in have_types:
+                note = f"  AI Pitcher holds off — diff {best_in_hand['difficulty']} too hittable at {balls}-{strikes}. Intentional ball."
+                return "gotcha", [gotcha, ("", t, note)], None
+        # Holds every pitch in the arsenal — no ball to fake, throw best anyway
+        return "gotcha", [gotcha, ("", best_in_hand['type'], None)], None
 
-    # No valid pitch, no gas, not forced — just commit FB (ball)
-    return "", "FB"
+    # No valid pitch, no gas, not forced — just commit the first in the arsenal (ball)
+    return None, [("", config.pitch_types()[0], None)], None
 
-def _analyze_dice(dice, config=None):
-    """Helper to find possible pitches in the current hand."""
+class PitcherTable:
+    """
+    _pitcher_plan compiled for one set of pitch rules and pool size.
+
+    Each (sorted hand, count, streak, gas) slot points at its plan's branches:
+    a run of codes (re-roll mask x 3 + pitch index) and the cumulative weights
+    rng.choices would build, or (_GOTCHA_PITCH_RATE, 1) for a gotcha plan.
+    Sampling draws the same single uniform make_pitcher_decision would, so the
+    moves match it exactly for any rng. A slot's branches are appended the
+    first time its state comes up; compile() fills every slot.
+
+    Streaks past 3 play like 3 and gas past the pool size like the pool size
+    (a re-roll never uses more dice than the hand has).
+
+    save() writes a fully compiled table as a game.tables artifact; load() maps
+    one back, read-only, so a process starts with every slot compiled.
+    """
+
+    _ARRAYS = ("offsets", "n_branches", "codes", "cum_weights")
+
+    def __init__(self, config, num_dice, arrays=None):
+        self.config = config
+        self.num_dice = num_dice
+        self._hands = {hand: i for i, hand in enumerate(combinations_with_replacement(range(1, 7), num_dice))}
+        self._gas_levels = num_dice + 1
+        self.slots = len(self._hands) * 12 * len(STREAKS) * self._gas_levels
+        if arrays is None:
+            arrays = (array("I", bytes(4 * self.slots)),  # where the slot's branches start, + 1 (0 = not compiled yet)
+                      array("B", bytes(self.slots)), array("H"), array("d"))
+        self.offsets, self.n_branches, self.codes, self.cum_weights = arrays
+        self._rerolls = [" ".join(str(i + 1) for i in range(num_dice) if mask >> i & 1)
+                         for mask in range(1 << num_dice)]
+        self._lock = Lock()
+
+    def nbytes(self):
+        return sum(getattr(self, name).itemsize * len(getattr(self, name)) for name in self._ARRAYS)
+
+    def _slot(self, hand, balls, strikes, streak, gas):
+        state = (balls * 3 + strikes) * len(STREAKS) + streak
+        return (self._hands[hand] * 12 * len(STREAKS) + state) * self._gas_levels + min(gas, self.num_dice)
+
+    def _compile(self, slot, hand, balls, strikes, streak, gas):
+        streak_type, streak_count = STREAKS[streak]
+        draw, branches, weights = _pitcher_plan(list(hand), balls, strikes, streak_type, streak_count, gas,
+                                                self.config)
+        if draw == "gotcha":
+            weights = [_GOTCHA_PITCH_RATE, 1 - _GOTCHA_PITCH_RATE]  # cumulative (rate, 1): u < rate throws it
+        elif draw is None:
+            weights = [1.0]
+        codes = [sum(1 << (int(i) - 1) for i in re_roll_input.split()) * len(PITCH_TYPES)
+                 + PITCH_TYPES.index(chosen_pitch) for re_roll_input, chosen_pitch, _ in branches]
+        with self._lock:  # threads share tables (game.server) — keep each run contiguous
+            self.n_branches[slot] = len(branches)
+            start = len(self.codes)
+            self.codes.extend(codes)
+            self.cum_weights.extend(accumulate(weights))
+            self.offsets[slot] = start + 1
+
+    def compile(self):
+        """Compiles every slot up front. Returns self."""
+        for hand in self._hands:
+            for balls in range(4):
+                for strikes in range(3):
+                    for streak in range(len(STREAKS)):
+                        for gas in range(self._gas_levels):
+                            slot = self._slot(hand, balls, strikes, streak, gas)
+                            if not self.offsets[slot]:
+                                self._compile(slot, hand, balls, strikes, streak, gas)
+        return self
+
+    def check(self, seed=0, draws=4):
+        """
+        Replays _pitcher_plan against the table: for every slot, `draws` decisions from
+        move() and from the heuristic on two rngs with the same seed, which must agree
+        draw for draw. Returns the (hand, balls, strikes, streak, gas) slots that don't.
+        """
+        table_rng, plan_rng = random.Random(seed), random.Random(seed)
+        mismatches = []
+        for hand in self._hands:
+            for balls in range(4):
+                for strikes in range(3):
+                    for streak in range(len(STREAKS)):
+                        streak_type, streak_count = STREAKS[streak]
+                        for gas in range(self._gas_levels):
+                            plan = _pitcher_plan(list(hand), balls, strikes, streak_type, streak_count, gas,
+                                                 self.config)
+                            for _ in range(draws):
+                                moved = self.move(hand, balls, strikes, streak_type, streak_count, gas, table_rng)
+                                if moved != _draw_branch(*plan, plan_rng)[:2]:
+                                    mismatches.append((hand, balls, strikes, streak, gas))
+                                    table_rng.setstate(plan_rng.getstate())  # resync, so one slot stays one miss
+                                    break
+        return mismatches
+
+    def save(self):
+        """Compiles every slot and saves the table to its artifact path. Returns the path."""
+        self.compile()
+        path = pitcher_table_path(self.config, self.num_dice)
+        write_artifact(path, "pitcher", fields_digest(self.config, PITCH_FIELDS),
+                       {name: getattr(self, name) for name in self._ARRAYS}, {"num_dice": self.num_dice})
+        return path
+
+    @classmethod
+    def load(cls, config, num_dice):
+        """The saved table for a config's pitch rules and a pool size, memory-mapped — or None if there isn't a valid one."""
+        opened = open_artifact(pitcher_table_path(config, num_dice), "pitcher", fields_digest(config, PITCH_FIELDS))
+        if opened is None or opened[0]["num_dice"] != num_dice:
+            return None
+        table = cls(config, num_dice, tuple(opened[1][name] for name in cls._ARRAYS))
+        return table if len(table.offsets) == table.slots else None
+
+    def move(self, dice, balls, strikes, streak_type, streak_count, gas_remaining, rng):
+        """
+        make_pitcher_decision's (re_roll_input, chosen_pitch), or None for a state the table
+        doesn't cover (dice not in sorted order — the re-roll indices depend on the order).
+        """
+        hand = tuple(dice)
+        streak = _STREAK_INDEX.get((streak_type, min(streak_count, 3)))
+        if hand not in self._hands or streak is None:
+            return None
+        slot = self._slot(hand, balls, strikes, streak, gas_remaining)
+        if not self.offsets[slot]:
+            self._compile(slot, hand, balls, strikes, streak, gas_remaining)
+        start, n = self.offsets[slot] - 1, self.n_branches[slot]
+        if n > 1:
+            last = start + n - 1
+            start = bisect_right(self.cum_weights, rng.random() * self.cum_weights[last], start, last)
+        mask, pitch = divmod(self.codes[start], len(PITCH_TYPES))
+        return self._rerolls[mask], PITCH_TYPES[pitch]
+
+
+_PITCHER_TABLES = config_cache("pitcher_tables", PITCH_FIELDS, maxsize=64)
+
+
+def pitcher_table_path(config, num_dice):
+    """Where the compiled table for a config's pitch rules and a pool size is saved."""
+    return artifact_path("pitcher", fields_digest(config, PITCH_FIELDS), f"{num_dice}d")
+
+
+def pitcher_table(config, num_dice):
+    """The shared PitcherTable for a config's pitch rules and a pool size: mapped from tables/ if saved there."""
+    key = (_PITCHER_TABLES.project(config), num_dice)
+    table = _PITCHER_TABLES.get(key)
+    if table is None:
+        table = _PITCHER_TABLES.put(key, PitcherTable.load(config, num_dice) or PitcherTable(config, num_dice))
+    return table
+
+
+def _draw_branch(draw, branches, weights, rng):
+    """The branch of a _pitcher_plan that one decision takes."""
+    if draw == "mix":
+        return rng.choices(branches, weights=weights)[0]
+    if draw == "gotcha":
+        return branches[0] if rng.random() < _GOTCHA_PITCH_RATE else branches[1]
+    return branches[0]
+
+
+def make_pitcher_decision(dice, balls, strikes, streak_type, streak_count, gas_remaining,
+                           config=None, verbose=True, rng=None):
+    """
+    Determines the AI pitcher's move: optional re-roll (costs 1 gas per die) + pitch commitment.
+    Count-aware: will intentionally ball a weak pitch rather than gift an easy hit.
+    With config.pitcher_ai == "equilibrium" it plays the solved strategy (game.policy) instead.
+
+    Returns: (re_roll_input, chosen_pitch)
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    if rng is None:
+        rng = default_dice()
+    if verbose:
+        print("\nAI Pitcher is thinking...")
+    if config.pitcher_ai == "equilibrium":
+        return policy_table(config, len(dice)).pitcher_move(
+            dice, balls, strikes, streak_type, streak_count, gas_remaining, rng)
+    if not verbose:  # the compiled table has the moves but not the narration
+        move = pitcher_table(config, len(dice)).move(dice, balls, strikes, streak_type, streak_count,
+                                                     gas_remaining, rng)
+        if move is not None:
+            return move
+
+    re_roll_input, chosen_pitch, note = _draw_branch(
+        *_pitcher_plan(dice, balls, strikes, streak_type, streak_count, gas_remaining, config), rng)
+    if verbose and note:
+        print(note)
+    return re_roll_input, chosen_pitch
+
+
+def pitcher_decision_distribution(dice, balls, strikes, streak_type, streak_count, gas_remaining,
+                                  config=None):
+    """
+    Every move make_pitcher_decision can return for this state, with its probability.
+    Returns: [(re_roll_input, chosen_pitch, probability), ...]
+    """
     if config is None:
         config = DEFAULT_CONFIG
-    from game.pitch_utils import find_key_dice
-    possible = []
-    for pitch_type in ["FB", "CB", "CU"]:
-        for combo_indices in combinations(range(len(dice)), 3):
-            combo_dice = [dice[i] for i in combo_indices]
-            key_dice = find_key_dice(combo_dice, pitch_type, config)
-            if key_dice is not None:
-                possible.append({
-                    "type": pitch_type,
-                    "difficulty": calc_difficulty(key_dice, config.difficulty_method),
-                    "combo": combo_dice
-                })
+    if config.pitcher_ai == "equilibrium":
+        return policy_table(config, len(dice)).pitcher_distribution(
+            dice, balls, strikes, streak_type, streak_count, gas_remaining)
+    draw, branches, weights = _pitcher_plan(dice, balls, strikes, streak_type, streak_count,
+                                            gas_remaining, config)
+    if draw == "mix":
+        total = sum(weights)
+        probs = [w / total for w in weights]
+    elif draw == "gotcha":
+        probs = [_GOTCHA_PITCH_RATE, 1 - _GOTCHA_PITCH_RATE]
+    else:
+        probs = [1.0]
+
+    moves = {}
+    for (re_roll_input, chosen_pitch, _), prob in zip(branches, probs):
+        moves[(re_roll_input, chosen_pitch)] = moves.get((re_roll_input, chosen_pitch), 0.0) + prob
+    return [(re_roll_input, chosen_pitch, prob) for (re_roll_input, chosen_pitch), prob in moves.items()]
+
+def _analyze_dice(dice, config=None):
+    """Helper to find possible pitches in the current hand."""
+    possible = [
+        {"type": pitch_type, "difficulty": difficulty, "combo": list(combo)}
+        for pitch_type, difficulty, combo in pitch_table(config).possible(dice)
+    ]
     return {"possible": possible}
 
 
 def _find_near_misses(dice, config=None):
-    """Find 2-of-3 near-miss opportunities and which dice to re-roll to complete them."""
+    """Find 2-of-3 near-miss opportunities (for the pitches in the arsenal) and which dice to re-roll to complete them."""
+    if config is None:
+        config = DEFAULT_CONFIG
     near_misses = []
 
     # FB: two of a kind
@@ -175,7 +385,7 @@ def _find_near_misses(dice, config=None):
                 "reroll_indices": " ".join(reroll_indices)
             })
 
-    return near_misses
+    return [p for p in near_misses if p['type'] in config.pitch_types()]
 
 
 def _hitter_swing_threshold(balls, strikes):
@@ -192,49 +402,36 @@ def _hitter_swing_threshold(balls, strikes):
     return 0.0, False       # All other counts: hack away — don't give away free balls
 
 
-def make_hitter_decision(pitcher_dice, re_roll_input, balls, strikes,
-                          pitch_streak_type, pitch_streak_count, pitcher_gas,
-                          config=None, verbose=True):
-    """
-    AI hitter's post-dice decision. Count-aware: works the count, protects the plate,
-    and won't waste a 3-0 count by hacking at a bad pitch.
-
-    Returns: (swing_decision, commit_pitch, swing_type)
-    """
-    from game.bats import calculate_bats_probabilities
-    if config is None:
-        config = DEFAULT_CONFIG
+HIT_VALUES = {'HR': 4.0, 'TRIPLE': 2.5, 'DOUBLE': 1.5, 'SINGLE': 1.0}
 
-    HIT_VALUES = {'HR': 4.0, 'TRIPLE': 2.5, 'DOUBLE': 1.5, 'SINGLE': 1.0}
+_HITTER_SWING_CHOICES = config_cache("hitter_swing_choices", PITCH_FIELDS + ("hitter_power_bonus",),
+                                     maxsize=1 << 15)
 
-    min_contact, always_take = _hitter_swing_threshold(balls, strikes)
-
-    if always_take:
-        if verbose:
-            print("\nAI Hitter takes — 3-0, sitting on a walk.")
-        return 'n', None, None
 
-    # --- 0-2 read: pitcher has max cushion to waste a pitch ---
-    # On 0-2 the pitcher will bluff weak dice ~90% of the time. Hitter reads this
-    # but imperfectly — takes 25% of the time when expecting a bluff, occasionally
-    # getting burned by a surprise commit → K Looking.
-    if strikes == 2 and balls == 0:
-        pitcher_hand = _analyze_dice(pitcher_dice, config)
-        best_diff = max((p['difficulty'] for p in pitcher_hand['possible']), default=0)
-        if best_diff < _pitcher_min_difficulty(balls, strikes):
-            if random.random() < 0.50:
-                if verbose:
-                    print(f"\nAI Hitter reads weak hand at 0-2 — takes (expecting bluff).")
-                return 'n', None, None
+def _hitter_swing_choice(kept_dice, num_reroll, pitch_streak_type, pitch_streak_count, config):
+    """
+    The AI hitter's best (ev, commit, swing_type, weighted_contact) over all six
+    commit x swing-type combinations for a hand the hitter has seen.
 
+    The dice, visible re-roll and gas only matter through the kept dice and the
+    number re-rolled, and the count only moves the take threshold, so the choice
+    is memoized on (kept dice, num_reroll, streak) and reused across every count.
+    """
+    key = (tuple(sorted(kept_dice)), num_reroll, pitch_streak_type, pitch_streak_count,
+           _HITTER_SWING_CHOICES.project(config))
+    choice = _HITTER_SWING_CHOICES.get(key)
+    if choice is not None:
+        return choice
+
+    # Pitch difficulty distributions don't depend on the commit or swing type — compute once
+    difficulty_distributions = _pitch_difficulty_distributions(kept_dice, num_reroll, config)
     best_ev, best_commit, best_swing, best_contact = -1.0, 'FB', 'p', 0.0
 
     for commit_pitch in ['FB', 'CB', 'CU']:
         for st in ['p', 'c']:
-            results = calculate_bats_probabilities(
-                pitcher_dice, re_roll_input, st, 0, 0, 0, 0,
-                pitch_streak_type, pitch_streak_count, 's', commit_pitch.lower(), pitcher_gas,
-                config=config
+            results = _bats_rows(
+                difficulty_distributions, st,
+                pitch_streak_type, pitch_streak_count, 's', commit_pitch.lower(), config
             )
             if not results:
                 continue
@@ -252,6 +449,62 @@ def make_hitter_decision(pitcher_dice, re_roll_input, balls, strikes,
             if ev > best_ev:
                 best_ev, best_commit, best_swing, best_contact = ev, commit_pitch, st, weighted_contact
 
+    return _HITTER_SWING_CHOICES.put(key, (best_ev, best_commit, best_swing, best_contact))
+
+
+_BLUFF_READ_TAKE_RATE = 0.50
+
+
+def _hitter_reads_bluff(pitcher_dice, balls, strikes, config):
+    """True at 0-2 when the hand is too weak for the pitcher to commit — a likely bluff."""
+    if strikes == 2 and balls == 0:
+        pitcher_hand = _analyze_dice(pitcher_dice, config)
+        best_diff = max((p['difficulty'] for p in pitcher_hand['possible']), default=0)
+        return best_diff < _pitcher_min_difficulty(balls, strikes)
+    return False
+
+
+def make_hitter_decision(pitcher_dice, re_roll_input, balls, strikes,
+                          pitch_streak_type, pitch_streak_count, pitcher_gas,
+                          config=None, verbose=True, rng=None):
+    """
+    AI hitter's post-dice decision. Count-aware: works the count, protects the plate,
+    and won't waste a 3-0 count by hacking at a bad pitch.
+    With config.hitter_ai == "equilibrium" it plays the solved strategy (game.policy) instead.
+
+    Returns: (swing_decision, commit_pitch, swing_type)
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    if rng is None:
+        rng = default_dice()
+    if config.hitter_ai == "equilibrium":
+        kept_dice, num_reroll = _split_reroll(pitcher_dice, re_roll_input, pitcher_gas)
+        return policy_table(config, len(pitcher_dice)).hitter_move(
+            kept_dice, num_reroll, balls, strikes, pitch_streak_type, pitch_streak_count, pitcher_gas, rng)
+
+    min_contact, always_take = _hitter_swing_threshold(balls, strikes)
+
+    if always_take:
+        if verbose:
+            print("\nAI Hitter takes — 3-0, sitting on a walk.")
+        return 'n', None, None
+
+    # --- 0-2 read: pitcher has max cushion to waste a pitch ---
+    # On 0-2 the pitcher will bluff weak dice ~90% of the time. Hitter reads this
+    # but imperfectly — takes 25% of the time when expecting a bluff, occasionally
+    # getting burned by a surprise commit → K Looking.
+    if _hitter_reads_bluff(pitcher_dice, balls, strikes, config):
+        if rng.random() < _BLUFF_READ_TAKE_RATE:
+            if verbose:
+                print(f"\nAI Hitter reads weak hand at 0-2 — takes (expecting bluff).")
+            return 'n', None, None
+
+    kept_dice, num_reroll = _split_reroll(pitcher_dice, re_roll_input, pitcher_gas)
+    best_ev, best_commit, best_swing, best_contact = _hitter_swing_choice(
+        kept_dice, num_reroll, pitch_streak_type, pitch_streak_count, config
+    )
+
     if best_contact < min_contact:
         if verbose:
             if strikes == 2:
@@ -273,6 +526,37 @@ def make_hitter_decision(pitcher_dice, re_roll_input, balls, strikes,
     return 's', best_commit, best_swing
 
 
+def hitter_decision_distribution(pitcher_dice, re_roll_input, balls, strikes,
+                                 pitch_streak_type, pitch_streak_count, pitcher_gas, config=None):
+    """
+    Every decision make_hitter_decision can return for this state, with its probability.
+    Returns: [((swing_decision, commit_pitch, swing_type), probability), ...]
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    if config.hitter_ai == "equilibrium":
+        kept_dice, num_reroll = _split_reroll(pitcher_dice, re_roll_input, pitcher_gas)
+        return policy_table(config, len(pitcher_dice)).hitter_distribution(
+            kept_dice, num_reroll, balls, strikes, pitch_streak_type, pitch_streak_count, pitcher_gas)
+    take = ('n', None, None)
+
+    min_contact, always_take = _hitter_swing_threshold(balls, strikes)
+    if always_take:
+        return [(take, 1.0)]
+
+    read_take = _BLUFF_READ_TAKE_RATE if _hitter_reads_bluff(pitcher_dice, balls, strikes, config) else 0.0
+
+    kept_dice, num_reroll = _split_reroll(pitcher_dice, re_roll_input, pitcher_gas)
+    best_ev, best_commit, best_swing, best_contact = _hitter_swing_choice(
+        kept_dice, num_reroll, pitch_streak_type, pitch_streak_count, config
+    )
+    if best_contact < min_contact:
+        return [(take, 1.0)]
+    if read_take:
+        return [(take, read_take), (('s', best_commit, best_swing), 1 - read_take)]
+    return [(('s', best_commit, best_swing), 1.0)]
+
+
 def _infer_likely_pitch(dice):
     """Look at pitcher's dice and guess the most likely pitch they can throw."""
     for pitch_type in ['FB', 'CB', 'CU']:
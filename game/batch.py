@@ -0,0 +1,302 @@
+"""
+Vectorized batch at-bat simulator (requires NumPy).
+
+Advances N CPU-vs-CPU at-bats in lockstep as arrays — count, streak, gas and
+dice — and masks each at-bat out once it ends. Pitch classification reads the
+PitchTable, and both AIs read decision tables that are filled lazily from
+pitcher_decision_distribution / hitter_decision_distribution the first time a
+state comes up, so results follow the same distribution as play_at_bat.
+"""
+from itertools import combinations_with_replacement
+from math import factorial
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency — only the batch engine needs it
+    np = None
+
+from game.ai import pitcher_decision_distribution, hitter_decision_distribution
+from game.bats import POWER_RESULTS, _contact_outcome_counts, power_outcomes
+from game.cache import config_cache
+from game.config import DEFAULT_CONFIG
+from game.pitch_utils import PITCH_TYPES, pitch_table
+
+RESULTS = ("BB", "K_S", "K_L", "SINGLE", "DOUBLE", "TRIPLE", "HR", "OUT", "WEAK_OUT")
+_BB, _K_S, _K_L, _SINGLE, _DOUBLE, _TRIPLE, _HR, _OUT, _WEAK_OUT = range(len(RESULTS))
+
+# Streak states: 0 = no streak, 1-3 = FB streak of 1, 2, 3+, 4-6 = off-speed streak of 1, 2, 3+.
+# Streaks past 3 play exactly like 3 (the setup bonus caps at +2).
+_STREAKS = [(None, 0), ("FB", 1), ("FB", 2), ("FB", 3), ("OFFSPEED", 1), ("OFFSPEED", 2), ("OFFSPEED", 3)]
+_N_STREAKS = len(_STREAKS)
+_MAX_CHOICES = 3   # a pitcher state mixes over at most three moves
+_MAX_DIFFICULTY = 8  # a 6 with the +2 setup bonus
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("The batch simulator needs NumPy — install the batch extra: "
+                           "`uv sync --extra batch` (or `pip install -e .[batch]`).")
+
+
+def _reroll_mask(re_roll_input):
+    """'1 3' -> 0b101: bit i set when die i (sorted position) is re-rolled."""
+    mask = 0
+    for index in re_roll_input.split():
+        mask |= 1 << (int(index) - 1)
+    return mask
+
+
+def _multiset_ways(hand):
+    """Number of ordered rolls that sort to this hand."""
+    ways = factorial(len(hand))
+    for face in set(hand):
+        ways //= factorial(hand.count(face))
+    return ways
+
+
+def _mask_string(mask, num_dice):
+    return " ".join(str(i + 1) for i in range(num_dice) if mask >> i & 1)
+
+
+class BatchTables:
+    """Hand indexing, pitch outcomes and lazily-filled AI decision tables for one config and pool size."""
+
+    def __init__(self, config, num_dice):
+        _require_numpy()
+        self.config = config
+        self.num_dice = num_dice
+        self.max_gas = config.effective_gas()
+
+        self.hands = list(combinations_with_replacement(range(1, 7), num_dice))
+        self.place = 6 ** np.arange(num_dice)
+        self.hand_dice = np.array(self.hands, dtype=np.int8)
+        self.hand_index = np.full(6 ** num_dice, -1, dtype=np.int64)
+        self.hand_index[self._code(self.hand_dice)] = np.arange(len(self.hands))
+        # Chance of rolling each hand: its multinomial count over 6**num_dice
+        ways = np.array([_multiset_ways(hand) for hand in self.hands], dtype=np.float64)
+        self.hand_cdf = np.cumsum(ways) / 6 ** num_dice
+        self.hand_cdf[-1] = 1.0
+
+        table = pitch_table(config)
+        n_hands = len(self.hands)
+        self.difficulty = np.zeros((n_hands, len(PITCH_TYPES)), dtype=np.int8)
+        self.strike = np.zeros((n_hands, len(PITCH_TYPES)), dtype=bool)
+        for i, hand in enumerate(self.hands):
+            row = table.row(hand)
+            for p, pitch_type in enumerate(PITCH_TYPES):
+                _, difficulty, pitch_result = row[pitch_type]
+                self.difficulty[i, p] = difficulty
+                self.strike[i, p] = pitch_result == "STRIKE"
+
+        # Swing outcomes: [power swing?, right commit?, difficulty] -> (P(contact), P(contact or foul))
+        self.contact_cdf = np.zeros((2, 2, _MAX_DIFFICULTY + 1, 2))
+        for power_swing in (0, 1):
+            contact_dice = 2 if power_swing else 4
+            for right, bonus in ((0, config.wrong_commit_penalty), (1, config.correct_commit_bonus)):
+                for difficulty in range(_MAX_DIFFICULTY + 1):
+                    contact, foul, _ = _contact_outcome_counts(contact_dice, bonus, difficulty)
+                    total = 6 ** contact_dice
+                    self.contact_cdf[power_swing, right, difficulty] = (contact / total, (contact + foul) / total)
+        # [power swing?] -> CDF over POWER_RESULTS
+        self.power_cdf = np.array([
+            power_outcomes(2, config.hitter_power_bonus, False).cdf,
+            power_outcomes(4, config.hitter_power_bonus, True).cdf,
+        ])
+        self.power_codes = np.array([RESULTS.index(result) for result in POWER_RESULTS])
+
+        # Pitcher: (hand, balls, strikes, streak, gas) -> up to three (mask, pitch) moves + CDF
+        n_pitcher = n_hands * 4 * 3 * _N_STREAKS * (self.max_gas + 1)
+        self.pitcher_ready = np.zeros(n_pitcher, dtype=bool)
+        self.pitcher_cdf = np.ones((n_pitcher, _MAX_CHOICES))
+        self.pitcher_mask = np.zeros((n_pitcher, _MAX_CHOICES), dtype=np.int8)
+        self.pitcher_pitch = np.zeros((n_pitcher, _MAX_CHOICES), dtype=np.int8)
+
+        # Hitter: (hand, visible mask, balls, strikes, streak) -> take probability, commit, swing type
+        n_hitter = n_hands * 2 ** num_dice * 4 * 3 * _N_STREAKS
+        self.hitter_ready = np.zeros(n_hitter, dtype=bool)
+        self.hitter_take = np.zeros(n_hitter)
+        self.hitter_commit = np.zeros(n_hitter, dtype=np.int8)
+        self.hitter_power = np.zeros(n_hitter, dtype=bool)
+
+    def _code(self, sorted_dice):
+        return ((sorted_dice - 1) * self.place).sum(axis=-1)
+
+    def index_hands(self, sorted_dice):
+        return self.hand_index[self._code(sorted_dice)]
+
+    def pitcher_states(self, hand, balls, strikes, streak, gas):
+        state = (((hand * 4 + balls) * 3 + strikes) * _N_STREAKS + streak) * (self.max_gas + 1) + gas
+        missing = np.unique(state[~self.pitcher_ready[state]])
+        for s in missing.tolist():
+            self._fill_pitcher(s)
+        return state
+
+    def _fill_pitcher(self, state):
+        s, gas = divmod(state, self.max_gas + 1)
+        s, streak = divmod(s, _N_STREAKS)
+        s, strikes = divmod(s, 3)
+        hand, balls = divmod(s, 4)
+        streak_type, streak_count = _STREAKS[streak]
+        moves = pitcher_decision_distribution(list(self.hands[hand]), balls, strikes,
+                                              streak_type, streak_count, gas, self.config)
+        running = 0.0
+        for k, (re_roll_input, chosen_pitch, prob) in enumerate(moves):
+            running += prob
+            self.pitcher_cdf[state, k] = running
+            self.pitcher_mask[state, k] = _reroll_mask(re_roll_input)
+            self.pitcher_pitch[state, k] = PITCH_TYPES.index(chosen_pitch)
+        self.pitcher_cdf[state, len(moves) - 1:] = 1.0
+        self.pitcher_ready[state] = True
+
+    def hitter_states(self, hand, visible_mask, balls, strikes, streak):
+        state = (((hand * 2 ** self.num_dice + visible_mask) * 4 + balls) * 3 + strikes) * _N_STREAKS + streak
+        missing = np.unique(state[~self.hitter_ready[state]])
+        for s in missing.tolist():
+            self._fill_hitter(s)
+        return state
+
+    def _fill_hitter(self, state):
+        s, streak = divmod(state, _N_STREAKS)
+        s, strikes = divmod(s, 3)
+        s, balls = divmod(s, 4)
+        hand, mask = divmod(s, 2 ** self.num_dice)
+        streak_type, streak_count = _STREAKS[streak]
+        decisions = hitter_decision_distribution(
+            list(self.hands[hand]), _mask_string(mask, self.num_dice), balls, strikes,
+            streak_type, streak_count, self.max_gas, self.config
+        )
+        for (swing_decision, commit_pitch, swing_type), prob in decisions:
+            if swing_decision == 'n':
+                self.hitter_take[state] = prob
+            else:
+                self.hitter_commit[state] = PITCH_TYPES.index(commit_pitch)
+                self.hitter_power[state] = swing_type == 'p'
+        self.hitter_ready[state] = True
+
+
+_BATCH_TABLES = config_cache("batch_tables", maxsize=16)
+
+
+def batch_tables(config, num_dice):
+    """The shared BatchTables for a config and pool size."""
+    key = (_BATCH_TABLES.project(config), num_dice)
+    tables = _BATCH_TABLES.get(key)
+    if tables is None:
+        tables = _BATCH_TABLES.put(key, BatchTables(config, num_dice))
+    return tables
+
+
+def _play_chunk(tables, n, rng):
+    """Plays n at-bats to completion. Returns (result totals, pitch-type totals, total pitches)."""
+    config = tables.config
+
+    # State of the at-bats still in progress — compacted as at-bats finish
+    balls = np.zeros(n, dtype=np.int64)
+    strikes = np.zeros(n, dtype=np.int64)
+    streak = np.zeros(n, dtype=np.int64)
+    gas = np.full(n, tables.max_gas, dtype=np.int64)
+    result_totals = np.zeros(len(RESULTS), dtype=np.int64)
+    pitch_totals = np.zeros(len(PITCH_TYPES), dtype=np.int64)
+    total_pitches = 0
+
+    bits = 1 << np.arange(tables.num_dice)
+    streak_category = np.array([-1, 0, 0, 0, 1, 1, 1])
+    streak_count = np.array([0, 1, 2, 3, 1, 2, 3])
+
+    while balls.size:
+        m = balls.size
+        total_pitches += m
+
+        # --- Pitcher rolls (a hand is drawn straight from the multiset distribution), then moves ---
+        hand = np.searchsorted(tables.hand_cdf, rng.random(m), side='right')
+        p_state = tables.pitcher_states(hand, balls, strikes, streak, gas)
+        choice = (rng.random(m)[:, None] >= tables.pitcher_cdf[p_state]).sum(axis=1)
+        choice = np.minimum(choice, _MAX_CHOICES - 1)
+        mask = tables.pitcher_mask[p_state, choice].astype(np.int64)
+        pitch = tables.pitcher_pitch[p_state, choice].astype(np.int64)
+
+        # --- Hitter decides after seeing the dice (and the re-roll plan unless it's hidden) ---
+        visible = np.zeros_like(mask) if config.hidden_reroll else mask
+        h_state = tables.hitter_states(hand, visible, balls, strikes, streak)
+        swings = rng.random(m) >= tables.hitter_take[h_state]
+        commit = tables.hitter_commit[h_state]
+        power_swing = tables.hitter_power[h_state].astype(np.int64)
+
+        # --- Re-roll ---
+        rolling = np.flatnonzero(mask)
+        if rolling.size:
+            rerolled = (mask[rolling, None] & bits) != 0
+            fresh = rng.integers(1, 7, size=rerolled.shape, dtype=np.int8)
+            dice = np.sort(np.where(rerolled, fresh, tables.hand_dice[hand[rolling]]), axis=1)
+            hand[rolling] = tables.index_hands(dice)
+            gas[rolling] -= rerolled.sum(axis=1)
+
+        # --- Pitch outcome ---
+        pitch_totals += np.bincount(pitch, minlength=len(PITCH_TYPES))
+        difficulty = tables.difficulty[hand, pitch].astype(np.int64)
+        is_strike = tables.strike[hand, pitch]
+
+        category = (pitch != 0).astype(np.int64)
+        prev_category, prev_count = streak_category[streak], streak_count[streak]
+        difficulty += np.where(prev_count >= 2,
+                               np.where(category != prev_category, np.minimum(prev_count - 1, 2), -1), 0)
+        new_count = np.where(category == prev_category, np.minimum(prev_count + 1, 3), 1)
+        streak = 1 + category * 3 + (new_count - 1)
+
+        # --- Swings: contact roll, then power roll on contact (both sampled from their tables) ---
+        right = (commit == pitch).astype(np.int64)
+        contact_cdf = tables.contact_cdf[power_swing, right, difficulty]
+        u = rng.random(m)
+        contact = swings & (u < contact_cdf[:, 0])
+        foul = swings & ~contact & (u < contact_cdf[:, 1])
+        miss = swings & ~contact & ~foul
+
+        power_cdf = tables.power_cdf[power_swing]
+        power_outcome = tables.power_codes[(rng.random(m)[:, None] >= power_cdf).sum(axis=1).clip(max=5)]
+
+        # --- Count ---
+        balls = balls + (~swings & ~is_strike)
+        strikes = strikes + (~swings & is_strike) + (foul & (strikes < 2)) + miss
+
+        # The last strike was swinging only if it came on a miss
+        outcome = np.where(contact, power_outcome, -1)
+        outcome = np.where((outcome < 0) & (strikes >= 3), np.where(miss, _K_S, _K_L), outcome)
+        outcome = np.where((outcome < 0) & (balls >= 4), _BB, outcome)
+
+        done = outcome >= 0
+        result_totals += np.bincount(outcome[done], minlength=len(RESULTS))
+        going = ~done
+        balls, strikes, streak, gas = balls[going], strikes[going], streak[going], gas[going]
+
+    return result_totals, pitch_totals, total_pitches
+
+
+def simulate_batch(config=None, n=1_000_000, seed=None, chunk_size=1_000_000, pitcher_dice=None):
+    """
+    Simulates n CPU-vs-CPU at-bats with the vectorized engine.
+    Returns (counts, pitch_counts) in the same shape as simulator.run_simulations.
+    """
+    _require_numpy()
+    if config is None:
+        config = DEFAULT_CONFIG
+    if config.pitcher_ai != "heuristic" or config.hitter_ai != "heuristic":
+        # The decision tables hold at most _MAX_CHOICES pitcher moves and one swing per state
+        raise ValueError("The batch simulator only plays the heuristic AIs — "
+                         "use the per-pitch engine (or solve_at_bat) for equilibrium play.")
+    num_dice = config.pitcher_dice if pitcher_dice is None else pitcher_dice
+    tables = batch_tables(config, num_dice)
+    rng = np.random.default_rng(seed)
+
+    result_totals = np.zeros(len(RESULTS), dtype=np.int64)
+    pitch_totals = np.zeros(len(PITCH_TYPES), dtype=np.int64)
+    remaining = n
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        results, pitches, _ = _play_chunk(tables, size, rng)
+        result_totals += results
+        pitch_totals += pitches
+        remaining -= size
+
+    counts = {name: int(c) for name, c in zip(RESULTS, result_totals)}
+    pitch_counts = {pitch_type: int(c) for pitch_type, c in zip(PITCH_TYPES, pitch_totals)}
+    return counts, pitch_counts
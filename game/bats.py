@@ -1,7 +1,10 @@
-import random
-from itertools import product, combinations
-from game.pitch_utils import find_pitch_outcome, check_pitch_combo, find_key_dice, calc_difficulty
-from game.config import DEFAULT_CONFIG
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from math import comb, factorial
+from game.cache import config_cache
+from game.pitch_utils import PITCH_TYPES, pitch_table
+from game.config import DEFAULT_CONFIG, PITCH_FIELDS
 
 def _get_swing_dice(swing_type, bonus_dice_allocation):
     """Determines the base number of contact and power dice for a swing."""
@@ -12,100 +15,192 @@ def _get_swing_dice(swing_type, bonus_dice_allocation):
     elif bonus_dice_allocation == 'p': power_dice += 1
     return contact_dice, power_dice
 
+@lru_cache(maxsize=None)
+def _contact_outcome_counts(contact_dice, contact_roll_bonus, pitch_difficulty):
+    """
+    Counts the contact rolls (out of 6**contact_dice) that end in contact, a foul and a miss.
+
+    Each die is a natural 6, a non-6 that meets the difficulty, or a non-6 that misses,
+    so the rolls are counted by how many dice land in each group instead of one by one.
+    """
+    six_succeeds = 6 + contact_roll_bonus >= pitch_difficulty
+    hit_faces = sum(1 for face in range(1, 6) if face + contact_roll_bonus >= pitch_difficulty)
+    miss_faces = 5 - hit_faces
+
+    contact = foul = miss = 0
+    for sixes in range(contact_dice + 1):
+        for hits in range(contact_dice - sixes + 1):
+            misses = contact_dice - sixes - hits
+            ways = (comb(contact_dice, sixes) * comb(contact_dice - sixes, hits)
+                    * hit_faces ** hits * miss_faces ** misses)
+            successful_dice = hits + (sixes if six_succeeds else 0)
+            if successful_dice >= 2 or sixes >= 2:
+                contact += ways
+            elif successful_dice == 1:
+                foul += ways
+            else:
+                miss += ways
+    return contact, foul, miss
+
+
+@lru_cache(maxsize=None)
 def _simulate_contact_prob(contact_dice, contact_roll_bonus, pitch_difficulty):
     """Calculates the probability of making contact (2+ successful dice or crit)."""
     if contact_dice <= 0: return 0.0
+    contact, _, _ = _contact_outcome_counts(contact_dice, contact_roll_bonus, pitch_difficulty)
+    return contact / 6 ** contact_dice
+
+HIT_RESULTS = ("HR", "TRIPLE", "DOUBLE", "SINGLE")
+POWER_RESULTS = HIT_RESULTS + ("OUT", "WEAK_OUT")
+
+
+def power_result(power_value, full_range):
+    """
+    Reads a power total (dice + bonus) as a swing result.
+    full_range: power swing (2c/4p) — HR, TRIPLE, DOUBLE, SINGLE possible.
+    Otherwise contact swing (4c/2p) — hard line drives; ceiling is double (max roll).
+    """
+    if full_range:
+        if power_value >= 20: return "HR"
+        if power_value == 19: return "TRIPLE"
+        if power_value == 18: return "DOUBLE"
+        if power_value >= 16: return "SINGLE"
+        if power_value >= 7: return "OUT"
+        return "WEAK_OUT"
+    if power_value == 12: return "DOUBLE"
+    if power_value >= 10: return "SINGLE"
+    if power_value >= 6: return "OUT"
+    return "WEAK_OUT"
+
+
+@lru_cache(maxsize=None)
+def _power_sum_counts(power_dice):
+    """Ways to roll each total on power_dice d6 (index = total), built by convolving one die at a time."""
+    counts = [1]
+    for _ in range(max(0, power_dice)):
+        rolled = [0] * (len(counts) + 6)
+        for total, ways in enumerate(counts):
+            if ways:
+                for face in range(1, 7):
+                    rolled[total + face] += ways
+        counts = rolled
+    return tuple(counts)
+
+
+class PowerOutcomes:
+    """
+    Outcome distribution of one power roll: power_dice d6 plus a flat bonus,
+    read against one swing type's thresholds. Shared and cached — don't mutate.
+    """
+
+    def __init__(self, power_dice, power_bonus, full_range):
+        self.power_dice = power_dice
+        self.power_bonus = power_bonus
+        self.full_range = full_range
+
+        counts = _power_sum_counts(power_dice)
+        total_outcomes = 6 ** max(0, power_dice)
+        result_counts = dict.fromkeys(POWER_RESULTS, 0)
+        for total, ways in enumerate(counts):
+            if ways:
+                result_counts[power_result(total + power_bonus, full_range)] += ways
 
-    possible_rolls = product(range(1, 7), repeat=contact_dice)
-    total_outcomes = 6 ** contact_dice
-    successful_outcomes = 0
+        self.probs = {result: count / total_outcomes for result, count in result_counts.items()}
+        self.hit_probs = {result: self.probs[result] for result in HIT_RESULTS}
+        self.cdf = []
+        running = 0
+        for result in POWER_RESULTS:
+            running += result_counts[result]
+            self.cdf.append(running / total_outcomes)
 
-    for roll in possible_rolls:
-        is_critical_hit = roll.count(6) >= 2
-        successful_dice = sum(1 for die in roll if (die + contact_roll_bonus) >= pitch_difficulty)
-        if successful_dice >= 2 or is_critical_hit:
-            successful_outcomes += 1
+    def sample(self, u):
+        """The result for a uniform draw u in [0, 1)."""
+        return POWER_RESULTS[min(bisect_right(self.cdf, u), len(POWER_RESULTS) - 1)]
 
-    return successful_outcomes / total_outcomes
 
-def _calculate_power_probs(power_dice, swing_type='p'):
+@lru_cache(maxsize=None)
+def power_outcomes(power_dice, power_bonus=0, full_range=True):
+    """The cached PowerOutcomes for a power roll."""
+    return PowerOutcomes(power_dice, power_bonus, full_range)
+
+
+def _calculate_power_probs(power_dice, swing_type='p', power_bonus=0):
     """Calculates the probability of each hit result given power dice."""
-    if power_dice <= 0:
-        return {"SINGLE": 0, "DOUBLE": 0, "TRIPLE": 0, "HR": 0}
-
-    possible_rolls = product(range(1, 7), repeat=power_dice)
-    total_outcomes = 6 ** power_dice
-
-    single_count, double_count, triple_count, hr_count = 0, 0, 0, 0
-
-    for roll in possible_rolls:
-        power_value = sum(roll)
-        if swing_type == 'p':
-            # Power swing: HR, TRIPLE, DOUBLE, SINGLE — matches engine thresholds
-            if power_value >= 20: hr_count += 1
-            elif power_value == 19: triple_count += 1
-            elif power_value == 18: double_count += 1
-            elif power_value >= 16: single_count += 1
-        else:
-            # Contact swing: hard line drives — double on max roll (12), single otherwise
-            if power_value == 12: double_count += 1
-            elif power_value >= 10: single_count += 1
-
-    return {
-        "HR": hr_count / total_outcomes,
-        "TRIPLE": triple_count / total_outcomes,
-        "DOUBLE": double_count / total_outcomes,
-        "SINGLE": single_count / total_outcomes,
-    }
+    return power_outcomes(power_dice, power_bonus, swing_type == 'p').hit_probs
 
-def _calculate_pitch_difficulty_probs(kept_dice, num_reroll, pitch_type, config=None):
+@lru_cache(maxsize=None)
+def _reroll_outcomes(num_reroll):
+    """Each distinct multiset of num_reroll d6, with how many ordered rolls produce it."""
+    outcomes = []
+    for roll in combinations_with_replacement(range(1, 7), num_reroll):
+        ways = factorial(num_reroll)
+        for face in set(roll):
+            ways //= factorial(roll.count(face))
+        outcomes.append((roll, ways))
+    return tuple(outcomes)
+
+
+_PITCH_OUTCOME_DISTRIBUTIONS = config_cache("pitch_outcome_distributions", PITCH_FIELDS, maxsize=1 << 14)
+
+
+def _pitch_outcome_distribution(kept_dice, num_reroll, config=None):
     """
-    Calculates the probability of forming a pitch at each possible difficulty level.
-    Returns a dictionary mapping difficulty (int) to probability (float).
+    How a hand finishes after the re-roll, for every pitch type.
+    Returns {pitch_type: {(pitch_result, difficulty): ways}} out of 6**num_reroll ways.
+    Memoized on (sorted kept dice, num_reroll, pitch rules).
     """
     if config is None:
         config = DEFAULT_CONFIG
-    difficulty_counts = {i: 0 for i in range(1, 7)}
-
-    if len(kept_dice) + num_reroll < 3:
-        return {i: 0.0 for i in range(1, 7)}
+    kept = tuple(sorted(kept_dice))
+    key = (kept, num_reroll, _PITCH_OUTCOME_DISTRIBUTIONS.project(config))
+    distribution = _PITCH_OUTCOME_DISTRIBUTIONS.get(key)
+    if distribution is None:
+        table = pitch_table(config)
+        distribution = {pitch_type: {} for pitch_type in PITCH_TYPES}
+        for roll, ways in _reroll_outcomes(num_reroll):
+            row = table.row(tuple(sorted(kept + roll)))
+            for pitch_type in PITCH_TYPES:
+                _, difficulty, pitch_result = row[pitch_type]
+                outcomes = distribution[pitch_type]
+                outcomes[(pitch_result, difficulty)] = outcomes.get((pitch_result, difficulty), 0) + ways
+        _PITCH_OUTCOME_DISTRIBUTIONS.put(key, distribution)
+    return distribution
 
-    possible_rolls = product(range(1, 7), repeat=num_reroll)
-    total_outcomes = 6 ** num_reroll
-    if total_outcomes == 0:
-        total_outcomes = 1
 
-    for roll in possible_rolls:
-        final_hand = kept_dice + list(roll)
+_PITCH_DIFFICULTY_PROBS = config_cache("pitch_difficulty_probs", PITCH_FIELDS, maxsize=1 << 15)
 
-        best_difficulty = -1
-        for combo in combinations(final_hand, 3):
-            key_dice = find_key_dice(list(combo), pitch_type, config)
-            if key_dice is not None:
-                difficulty = calc_difficulty(key_dice, config.difficulty_method)
-                if difficulty > best_difficulty:
-                    best_difficulty = difficulty
 
-        if best_difficulty != -1:
-            difficulty_counts[best_difficulty] += 1
+def _calculate_pitch_difficulty_probs(kept_dice, num_reroll, pitch_type, config=None):
+    """
+    Calculates the probability of forming a pitch at each possible difficulty level.
+    Returns a dictionary mapping difficulty (int) to probability (float).
+    The dictionary is memoized and shared between callers — don't mutate it.
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    key = (tuple(sorted(kept_dice)), num_reroll, pitch_type, _PITCH_DIFFICULTY_PROBS.project(config))
+    probs = _PITCH_DIFFICULTY_PROBS.get(key)
+    if probs is not None:
+        return probs
 
-    return {diff: count / total_outcomes for diff, count in difficulty_counts.items()}
+    if len(kept_dice) + num_reroll < 3:
+        probs = {i: 0.0 for i in range(1, 7)}
+    else:
+        difficulty_counts = {i: 0 for i in range(1, 7)}
+        outcomes = _pitch_outcome_distribution(kept_dice, num_reroll, config)[pitch_type]
+        for (pitch_result, difficulty), ways in outcomes.items():
+            if pitch_result == "STRIKE":
+                difficulty_counts[difficulty] += ways
+        total_outcomes = 6 ** num_reroll
+        probs = {diff: count / total_outcomes for diff, count in difficulty_counts.items()}
+    return _PITCH_DIFFICULTY_PROBS.put(key, probs)
 
 def _get_pitch_category(pitch_type):
     """Helper to get the category ('FB' or 'OFFSPEED') of a pitch."""
     return "FB" if pitch_type == "FB" else "OFFSPEED"
 
-def calculate_bats_probabilities(
-    pitcher_dice, re_roll_input, swing_type, contact_mod, power_mod, contact_roll_bonus,
-    bonus_dice, pitch_streak_type, pitch_streak_count, hitter_approach, hitter_sit_guess,
-    gas_remaining=0, config=None
-):
-    """
-    Calculates and displays the B.A.T.S. probabilities for the hitter.
-    """
-    if config is None:
-        config = DEFAULT_CONFIG
-    # --- Determine Kept vs. Re-rolled Dice ---
+def _split_reroll(pitcher_dice, re_roll_input, gas_remaining=0):
+    """Splits the pitcher's hand by the visible re-roll plan. Returns (kept_dice, num_reroll)."""
     kept_dice = []
     all_indices = list(range(len(pitcher_dice)))
     reroll_indices = []
@@ -117,8 +212,16 @@ def calculate_bats_probabilities(
         if i not in reroll_indices:
             kept_dice.append(pitcher_dice[i])
 
-    num_reroll = len(reroll_indices)
+    return kept_dice, len(reroll_indices)
+
+def _pitch_difficulty_distributions(kept_dice, num_reroll, config=None):
+    """Difficulty distributions for all three pitch types — shared by every commit and swing type."""
+    return {pitch_type: _calculate_pitch_difficulty_probs(kept_dice, num_reroll, pitch_type, config)
+            for pitch_type in PITCH_TYPES}
 
+def _bats_rows(difficulty_distributions, swing_type, pitch_streak_type, pitch_streak_count,
+               hitter_approach, hitter_sit_guess, config):
+    """Builds the B.A.T.S. rows for one swing type from precomputed pitch difficulty distributions."""
     analysis_results = []
     bonus_allocation = 'none'
 
@@ -134,7 +237,7 @@ def calculate_bats_probabilities(
         final_contact_dice = max(0, base_contact + current_contact_mod)
         final_power_dice = max(0, base_power + current_power_mod)
 
-        pitch_difficulty_probs = _calculate_pitch_difficulty_probs(kept_dice, num_reroll, pitch_type, config)
+        pitch_difficulty_probs = difficulty_distributions[pitch_type]
 
         for difficulty, pitch_prob in pitch_difficulty_probs.items():
             if pitch_prob < 0.01: continue
@@ -151,7 +254,7 @@ def calculate_bats_probabilities(
             contact_prob = _simulate_contact_prob(
                 final_contact_dice, current_contact_roll_bonus, final_difficulty
             )
-            power_probs = _calculate_power_probs(final_power_dice, swing_type)
+            power_probs = _calculate_power_probs(final_power_dice, swing_type, config.hitter_power_bonus)
 
             analysis_results.append({
                 "pitch_id": f"{pitch_type}-{difficulty}",
@@ -161,3 +264,19 @@ def calculate_bats_probabilities(
             })
 
     return sorted(analysis_results, key=lambda x: x['pitch_prob'], reverse=True)
+
+def calculate_bats_probabilities(
+    pitcher_dice, re_roll_input, swing_type, contact_mod, power_mod, contact_roll_bonus,
+    bonus_dice, pitch_streak_type, pitch_streak_count, hitter_approach, hitter_sit_guess,
+    gas_remaining=0, config=None
+):
+    """
+    Calculates and displays the B.A.T.S. probabilities for the hitter.
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    # --- Determine Kept vs. Re-rolled Dice ---
+    kept_dice, num_reroll = _split_reroll(pitcher_dice, re_roll_input, gas_remaining)
+    difficulty_distributions = _pitch_difficulty_distributions(kept_dice, num_reroll, config)
+    return _bats_rows(difficulty_distributions, swing_type, pitch_streak_type, pitch_streak_count,
+                      hitter_approach, hitter_sit_guess, config)
@@ -0,0 +1,82 @@
+"""
+Registry of the memo tables that are keyed on a GameConfig.
+
+Each table registers the config fields it depends on, and is keyed on just
+those fields (plus its own arguments) — pitch tables read only the pitch
+requirements, so every config that differs only in the hitter or pitcher
+levers shares them, and a hitter_search builds its pitch and re-roll tables
+once for all of its candidates.
+
+Every table is an LRU bounded by maxsize entries and counts its hits, misses
+and evictions (cache_stats(), and perf.report() with --profile).
+"""
+from collections import OrderedDict
+from operator import attrgetter
+
+from game.config import ALL_FIELDS
+
+_REGISTRY = {}
+
+
+class ConfigCache:
+    """An LRU of at most maxsize entries, keyed on (the config's `fields`, ...)."""
+
+    def __init__(self, name, fields, maxsize):
+        self.name = name
+        self.fields = tuple(fields)
+        self.maxsize = maxsize
+        self.project = attrgetter(*self.fields)  # config -> the part of the key it contributes
+        self._entries = OrderedDict()
+        self._touch = self._entries.move_to_end
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """The entry for key (counted as a hit and made most recent), or None (a miss)."""
+        try:
+            self._touch(key)
+            value = self._entries[key]
+        except KeyError:  # absent (or evicted by another thread in between)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {"fields": self.fields, "size": len(self._entries), "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def config_cache(name, fields=ALL_FIELDS, maxsize=4096):
+    """Registers (or returns the already registered) cache `name`, depending on the given config fields."""
+    cache = _REGISTRY.get(name)
+    if cache is None:
+        cache = _REGISTRY[name] = ConfigCache(name, fields, maxsize)
+    return cache
+
+
+def caches():
+    """Every registered cache, in registration order."""
+    return list(_REGISTRY.values())
+
+
+def cache_stats():
+    """{name: {"fields", "size", "maxsize", "hits", "misses", "evictions"}} for every registered cache."""
+    return {name: cache.stats() for name, cache in _REGISTRY.items()}
+
+
+def clear_caches():
+    for cache in _REGISTRY.values():
+        cache.clear()
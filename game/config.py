@@ -1,13 +1,22 @@
-from dataclasses import dataclass
+import hashlib
+import json
+from dataclasses import asdict, dataclass, fields, replace
+from functools import lru_cache
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GameConfig:
-    """All tunable levers for Diceball simulation."""
+    """
+    All tunable levers for Diceball simulation.
+
+    Frozen and hashable, so a config can key a cache directly: change a lever
+    with dataclasses.replace, which returns a new config.
+    """
 
     # Pitcher
     pitcher_dice: int = 4
     gas_per_at_bat: int = None  # None = auto: max(0, 6 - pitcher_dice)
+    arsenal: str = "FB/CB/CU"   # the pitches the pitcher throws; committing any other is a ball
 
     # Pitch requirements: how many dice must satisfy the pattern
     fb_match_count: int = 3  # 3 = three-of-a-kind, 2 = pair
@@ -26,10 +35,46 @@ class GameConfig:
     # Pitcher levers / information asymmetry
     hidden_reroll: bool = False  # True = hitter decides before pitcher re-rolls
 
+    # CPU players: "heuristic" (game/ai.py) or "equilibrium" (solved tables, game/policy.py)
+    pitcher_ai: str = "heuristic"
+    hitter_ai: str = "heuristic"
+
     def effective_gas(self):
         if self.gas_per_at_bat is not None:
             return self.gas_per_at_bat
         return max(0, 6 - self.pitcher_dice)
 
+    def pitch_types(self):
+        """The arsenal as a tuple of pitch types."""
+        return tuple(self.arsenal.split("/"))
+
+    def pitch_key(self):
+        """The pitch-requirement fields — everything that decides what a hand can throw."""
+        return (self.arsenal, self.fb_match_count, self.cb_run_length, self.cb_allow_six,
+                self.cu_diff_count, self.difficulty_method)
+
+    def digest(self):
+        """A stable hash of every field — equal levers give the same digest in any session."""
+        return _digest(self)
+
+
+@lru_cache(maxsize=1024)
+def _digest(config):
+    return hashlib.sha256(json.dumps(asdict(config), sort_keys=True).encode()).hexdigest()
+
 
 DEFAULT_CONFIG = GameConfig()
+
+ALL_FIELDS = tuple(field.name for field in fields(GameConfig))
+# The fields pitch_key() returns — what a hand can throw
+PITCH_FIELDS = ("arsenal", "fb_match_count", "cb_run_length", "cb_allow_six", "cu_diff_count", "difficulty_method")
+# The levers that belong to the hitter in a matchup; the rest are the pitcher's (and the rules')
+HITTER_FIELDS = ("correct_commit_bonus", "wrong_commit_penalty", "hitter_power_bonus", "hitter_ai")
+# Which AI plays each side — not part of the game's rules
+AI_FIELDS = ("pitcher_ai", "hitter_ai")
+AI_MODES = ("heuristic", "equilibrium")
+
+
+def matchup_config(pitcher, hitter):
+    """The config for one pitcher facing one hitter: the pitcher's config with the hitter's HITTER_FIELDS."""
+    return replace(pitcher, **{field: getattr(hitter, field) for field in HITTER_FIELDS})
@@ -0,0 +1,184 @@
+"""
+Dice sources: seedable random streams for the engine and the AI.
+
+A DiceSource is a random.Random, so the AI's random() / choices() draws come
+from the same stream, plus a d6 buffer filled from bulk getrandbits() calls
+instead of one randint() per die. Pass one as `rng` to play_at_bat (and the AI
+and swing functions) to make a single at-bat reproducible; spawn() gives
+independent child streams.
+
+The engine asks its rng for a named stream each time it rolls or consults an
+AI — rng.stream("pitch"), "reroll", "contact", "power", "pitcher_ai",
+"hitter_ai". A DiceSource answers with itself. DiceStreams gives each purpose
+its own stream and each request a fixed-size slice of it, so two configs
+playing the same at-bat seed see the same k-th pitcher roll, contact roll or
+AI draw (common random numbers) however differently the at-bat went before.
+"""
+import hashlib
+import random
+
+_ACCEPT = 252  # largest multiple of 6 that fits in a byte — bytes above it are redrawn
+
+
+def derive_seed(seed, *path):
+    """An independent 64-bit seed for one branch of a seeded run."""
+    key = ":".join(str(part) for part in (seed,) + path)
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")
+
+
+class DiceSource(random.Random):
+    """A random stream that deals d6 faces from a pre-generated buffer."""
+
+    def __init__(self, seed=None, buffer_size=4096):
+        self.buffer_size = buffer_size  # random bytes drawn per refill (~98% become faces)
+        self._faces = []
+        self._pos = 0
+        self._seed = seed
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        super().seed(a, version)
+        self._seed = a
+        self._faces, self._pos = [], 0
+
+    def getstate(self):
+        return super().getstate(), tuple(self._faces[self._pos:])
+
+    def setstate(self, state):
+        base, faces = state
+        super().setstate(base)
+        self._faces, self._pos = list(faces), 0
+
+    def _refill(self, needed):
+        faces = self._faces[self._pos:]
+        while len(faces) < needed:
+            raw = self.getrandbits(8 * self.buffer_size).to_bytes(self.buffer_size, "little")
+            faces += [b % 6 + 1 for b in raw if b < _ACCEPT]
+        self._faces, self._pos = faces, 0
+
+    def faces(self, num_dice):
+        """The next num_dice faces, in the order they were dealt."""
+        if num_dice <= 0:
+            return []
+        if self._pos + num_dice > len(self._faces):
+            self._refill(num_dice)
+        pos = self._pos
+        self._pos = pos + num_dice
+        return self._faces[pos:pos + num_dice]
+
+    def roll(self, num_dice):
+        """Rolls num_dice d6 and returns them sorted."""
+        dice = self.faces(num_dice)
+        dice.sort()
+        return dice
+
+    def d6(self):
+        """One die."""
+        if self._pos >= len(self._faces):
+            self._refill(1)
+        face = self._faces[self._pos]
+        self._pos += 1
+        return face
+
+    def stream(self, name):
+        """The stream for one purpose — a single DiceSource serves them all."""
+        return self
+
+    def spawn(self, *path):
+        """An independent child stream, derivable from this stream's seed and path."""
+        seed = self._seed if self._seed is not None else self.getrandbits(64)
+        return DiceSource(derive_seed(seed, *path), self.buffer_size)
+
+
+STREAMS = ("pitch", "reroll", "contact", "power", "pitcher_ai", "hitter_ai")
+_AI_STREAMS = ("pitcher_ai", "hitter_ai")
+_BLOCK = 8  # faces per dice request — more than any pool, re-roll or swing uses
+
+
+class _Block:
+    """One dice request's fixed slice of faces; roll(n) deals the first n."""
+
+    def __init__(self, faces, source):
+        self._faces = faces
+        self._source = source
+
+    def roll(self, num_dice):
+        dice = self._faces[:num_dice] if num_dice <= len(self._faces) else self._source.roll(num_dice)
+        dice.sort()
+        return dice
+
+
+class _Draw:
+    """One AI request's single uniform, served to random() or choices()."""
+
+    choices = random.Random.choices  # only needs self.random
+
+    def __init__(self, u):
+        self._u = u
+
+    def random(self):
+        return self._u
+
+
+class DiceStreams:
+    """
+    Common-random-number streams for one at-bat: one DiceSource per purpose, all
+    derived from one seed and created on first use with small buffers, so a
+    DiceStreams per at-bat stays cheap. Every stream() call takes a fixed-size
+    slice — _BLOCK faces for dice, one uniform for an AI decision.
+    """
+
+    def __init__(self, seed, buffer_size=64):
+        self.seed = seed
+        self.buffer_size = buffer_size
+        self._sources = {}
+
+    def stream(self, name):
+        source = self._sources.get(name)
+        if source is None:
+            source = self._sources[name] = DiceSource(derive_seed(self.seed, name), self.buffer_size)
+        if name in _AI_STREAMS:
+            return _Draw(source.random())
+        return _Block(source.faces(_BLOCK), source)
+
+
+class AliasTable:
+    """
+    Constant-time draws from a fixed discrete distribution (Vose's alias method):
+    one uniform picks a column, and its fraction picks the column's own outcome
+    or its alias.
+    """
+
+    def __init__(self, outcomes, weights):
+        n = len(outcomes)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self.outcomes = tuple(outcomes)
+        self._cut = [1.0] * n
+        self._alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            self._cut[s], self._alias[s] = scaled[s], g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+        # Whatever is left over is 1 up to rounding — keeps its own column
+        self._n = n
+
+    def index(self, rng):
+        """The index of one draw. rng: anything with random()."""
+        u = rng.random() * self._n
+        i = int(u)
+        return i if u - i < self._cut[i] else self._alias[i]
+
+    def sample(self, rng):
+        return self.outcomes[self.index(rng)]
+
+
+_DEFAULT_DICE = DiceSource()
+
+
+def default_dice():
+    """The process-wide stream used when no rng is passed."""
+    return _DEFAULT_DICE
@@ -1,17 +1,18 @@
-import random
 import time
-from game.pitch_utils import PITCH_REQUIREMENTS, check_pitch_combo, find_pitch_outcome
+from game.pitch_utils import PITCH_REQUIREMENTS
 from game.ai import make_pitcher_decision, make_hitter_decision
-from game.bats import calculate_bats_probabilities
-from game.config import GameConfig, DEFAULT_CONFIG
+from game.bats import calculate_bats_probabilities, power_outcomes
+from game.config import DEFAULT_CONFIG
+from game.dice import default_dice
+from game.rules import IN_PLAY, pitch, simulate_at_bat, start, swing
 
 # --- Helper Functions ---
 
-def roll_dice(num_dice):
-    """Rolls a number of d6 and returns a sorted list."""
-    if num_dice <= 0:
-        return []
-    return sorted([random.randint(1, 6) for _ in range(num_dice)])
+def roll_dice(num_dice, rng=None):
+    """Rolls a number of d6 and returns a sorted list. rng: a DiceSource (defaults to the shared one)."""
+    if rng is None:
+        rng = default_dice()
+    return rng.roll(num_dice)
 
 def display_dice(dice_pool):
     """Creates an ASCII display for a list of dice."""
@@ -44,7 +45,8 @@ def get_validated_input(prompt, valid_options):
         print(f"Invalid input. Please choose from: {', '.join(valid_options)}")
 
 def get_hitter_post_dice_choices(pitcher_dice, re_roll_input, balls,
-                                  pitch_streak_type, pitch_streak_count, pitcher_gas, swing_type_hint=None):
+                                  pitch_streak_type, pitch_streak_count, pitcher_gas, swing_type_hint=None,
+                                  config=None):
     """
     After seeing the pitcher's dice and re-roll plan, the hitter commits.
     Returns (final_swing_decision, commit_pitch, swing_type)
@@ -67,7 +69,8 @@ def get_hitter_post_dice_choices(pitcher_dice, re_roll_input, balls,
             )
             results = calculate_bats_probabilities(
                 pitcher_dice, re_roll_input, swing_to_analyze, 0, 0, 0,
-                0, pitch_streak_type, pitch_streak_count, 's', commit_to, pitcher_gas
+                0, pitch_streak_type, pitch_streak_count, 's', commit_to, pitcher_gas,
+                config=config
             )
             print(f"\nB.A.T.S. — committing to {commit_to.upper()} with {'power' if swing_to_analyze == 'p' else 'contact'} swing:")
             header = f"{'Pitch-Diff':<12} | {'Pitch %':>8} | {'Contact %':>10}"
@@ -78,8 +81,12 @@ def get_hitter_post_dice_choices(pitcher_dice, re_roll_input, balls,
                 print(f"{res['pitch_id']:<12} | {res['pitch_prob']:>7.1%} | {res['contact_prob']:>9.1%}")
             print("-" * len(header))
             if results:
-                power_probs = results[0]['power_probs']
-                print(f"\nHit % (if contact): Single {power_probs['SINGLE']:.1%}  Double {power_probs['DOUBLE']:.1%}  HR {power_probs['HR']:.1%}")
+                power_dice = 4 if swing_to_analyze == 'p' else 2
+                power_bonus = (config or DEFAULT_CONFIG).hitter_power_bonus
+                power_probs = power_outcomes(power_dice, power_bonus, swing_to_analyze == 'p').probs
+                print(f"\nHit % (if contact): Single {power_probs['SINGLE']:.1%}  Double {power_probs['DOUBLE']:.1%}  "
+                      f"Triple {power_probs['TRIPLE']:.1%}  HR {power_probs['HR']:.1%}  "
+                      f"Out {power_probs['OUT'] + power_probs['WEAK_OUT']:.1%}")
                 print("(Note: B.A.T.S. hit% is approximate — shown without bonus die allocation)")
         elif choice == 'n':
             return 'n', None, None
@@ -91,95 +98,129 @@ def get_hitter_post_dice_choices(pitcher_dice, re_roll_input, balls,
             )
             return 's', commit_pitch, swing_type
 
-def resolve_swing(swing_type, contact_mod, power_mod, contact_roll_bonus, pitch_difficulty, verbose=True, power_bonus=0):
+_HIT_CALLS = {
+    "HR": "That ball is OBLITERATED! HOME RUN!",
+    "TRIPLE": "Screaming line drive into the corner — TRIPLE!",
+    "DOUBLE": "Smoked into the gap! That's a DOUBLE!",
+    "SINGLE": "A sharp line drive for a SINGLE!",
+}
+
+
+def narrate(events):
+    """Plays a pitch's events out on the terminal, with the pauses and prompts of a live at-bat."""
+    for event in events:
+        kind = event[0]
+        if kind == "reroll":
+            print("\nPitcher adjusts... the final dice are:")
+            display_dice(event[1])
+        elif kind == "reroll_invalid":
+            print("Invalid re-roll input. Keeping all dice.")
+        elif kind == "streak":
+            _, modifier, streak_type, streak_count, category = event
+            if modifier > 0:
+                print(f"\nStreak of {streak_count} {streak_type} pitches sets up the {category}! PITCH DIFFICULTY +{modifier}!")
+            else:
+                print(f"\nPitcher getting predictable with {category} pitches! PITCH DIFFICULTY -1!")
+        elif kind == "pitch":
+            _, chosen_pitch, chosen_dice, difficulty, pitch_result = event
+            full_pitch_name = PITCH_REQUIREMENTS.get(chosen_pitch, {}).get("name", "Unknown")
+            print(f"\nPitcher's final dice for the {full_pitch_name} are {chosen_dice}.")
+            if pitch_result == "STRIKE":
+                print(f"It's a {full_pitch_name}! STRIKE — difficulty {difficulty}.")
+            else:
+                print(f"Failed {full_pitch_name}! BALL — difficulty {difficulty}.")
+            time.sleep(1)
+        elif kind == "take":
+            if event[1] == "STRIKE":
+                print("\nHitter takes for a called STRIKE!")
+            else:
+                print("\nHitter takes for a BALL!")
+        elif kind == "commit":
+            _, commit_pitch, chosen_pitch, contact_roll_bonus = event
+            if commit_pitch.upper() == chosen_pitch:
+                print(f"\nHitter's commit on {commit_pitch.upper()} was RIGHT! +{contact_roll_bonus} to all contact dice.")
+            else:
+                print(f"\nHitter committed to {commit_pitch.upper()} but it's a {chosen_pitch}! {contact_roll_bonus} to all contact dice.")
+        elif kind == "contact":
+            _, contact_dice, power_dice, difficulty, contact_roll_bonus, roll, critical = event
+            print(f"\nHitter is swinging with {contact_dice} Contact Dice and {power_dice} Power Dice!")
+            input(f"Press Enter for the Contact roll to beat Difficulty {difficulty}...")
+            print(f"Hitter rolls for Contact... {roll}")
+            if critical:
+                print("NATURAL 6s! A critical hit, the batter connects no matter the difficulty!")
+            if contact_roll_bonus > 0:
+                print(f"Applying BONUS of +{contact_roll_bonus} to each die from committing to the right pitch!")
+            elif contact_roll_bonus < 0:
+                print(f"Applying PENALTY of {contact_roll_bonus} to each die from committing to the wrong pitch!")
+            time.sleep(1)
+            print("\n...RESULT...")
+            time.sleep(1)
+        elif kind == "power":
+            _, roll, power_value, result = event
+            print("CONTACT! The ball is in play!")
+            input("Press Enter for the Power roll...")
+            print(f"Power roll: {roll} (sum {power_value})")
+            if result == "OUT": print("A routine grounder to the infield...")
+            elif result == "WEAK_OUT": print("A weak pop-up or dribbler...")
+        elif kind == "foul":
+            print("FOULED OFF! One die met the difficulty.")
+        elif kind == "miss":
+            print("Swing and a MISS!")
+        elif kind == "end":
+            result = event[1]
+            if result in IN_PLAY:
+                print(_HIT_CALLS.get(result, "...and the defense makes the play! OUT!"))
+            elif result == "BB":
+                print("\nBALL FOUR! Take your base.")
+            else:
+                print("\nSTRIKE THREE! You're out!")
+
+
+def resolve_swing(swing_type, contact_mod, power_mod, contact_roll_bonus, pitch_difficulty, verbose=True, power_bonus=0,
+                  rng=None):
     """Handles the dice rolls for a hitter's swing and determines the outcome."""
     if swing_type == 'p': contact_dice, power_dice = 2, 4
     else: contact_dice, power_dice = 4, 2
+    if rng is None:
+        rng = default_dice()
 
-    final_contact_dice = max(0, contact_dice + contact_mod)
-    final_power_dice = max(0, power_dice + power_mod)
-
-    if verbose:
-        print(f"\nHitter is swinging with {final_contact_dice} Contact Dice and {final_power_dice} Power Dice!")
-        input(f"Press Enter for the Contact roll to beat Difficulty {pitch_difficulty}...")
-
-    contact_roll_result = roll_dice(final_contact_dice)
+    events = [] if verbose else None
+    result = swing(max(0, contact_dice + contact_mod), max(0, power_dice + power_mod), contact_roll_bonus,
+                   pitch_difficulty, power_bonus, rng, events)
     if verbose:
-        print(f"Hitter rolls for Contact... {contact_roll_result}")
-
-    is_critical_hit = contact_roll_result.count(6) >= 2
-    if verbose:
-        if is_critical_hit:
-            print("NATURAL 6s! A critical hit, the batter connects no matter the difficulty!")
-        if contact_roll_bonus > 0:
-            print(f"Applying BONUS of +{contact_roll_bonus} to each die from committing to the right pitch!")
-        elif contact_roll_bonus < 0:
-            print(f"Applying PENALTY of {contact_roll_bonus} to each die from committing to the wrong pitch!")
-        time.sleep(1)
-
-    successful_dice = sum(1 for die in contact_roll_result if (die + contact_roll_bonus) >= pitch_difficulty)
-
-    if verbose:
-        print("\n...RESULT...")
-        time.sleep(1)
-
-    if successful_dice >= 2 or is_critical_hit:
-        power_roll_result = roll_dice(final_power_dice)
-        power_value = sum(power_roll_result) + power_bonus
-        if verbose:
-            print("CONTACT! The ball is in play!")
-            input("Press Enter for the Power roll...")
-            print(f"Power roll: {power_roll_result} (sum {power_value})")
-
-        if final_power_dice >= 3:  # power swing (2c/4p) — full range: HR, TRIPLE, DOUBLE, SINGLE
-            if power_value >= 20: result = "HR"
-            elif power_value == 19: result = "TRIPLE"
-            elif power_value == 18: result = "DOUBLE"
-            elif power_value >= 16: result = "SINGLE"
-            elif power_value >= 7:
-                if verbose: print("A routine grounder to the infield...")
-                result = "OUT"
-            else:
-                if verbose: print("A weak pop-up or dribbler...")
-                result = "WEAK_OUT"
-        else:  # contact swing (4c/2p) — hard line drives; ceiling is double (max roll)
-            if power_value == 12: result = "DOUBLE"
-            elif power_value >= 10: result = "SINGLE"
-            elif power_value >= 6:
-                if verbose: print("A routine grounder to the infield...")
-                result = "OUT"
-            else:
-                if verbose: print("A weak pop-up or dribbler...")
-                result = "WEAK_OUT"
-
-        return result
-    elif successful_dice == 1:
-        if verbose: print("FOULED OFF! One die met the difficulty.")
-        return "FOUL"
-    else:
-        if verbose: print("Swing and a MISS!")
-        return "MISS"
+        narrate(events)
+    return result
 
 # --- Main Game Loop ---
-def play_at_bat(pitcher_dice_pool, pitcher_is_ai=False, hitter_is_ai=False, verbose=True, config=None):
+def play_at_bat(pitcher_dice_pool, pitcher_is_ai=False, hitter_is_ai=False, verbose=True, config=None,
+                rng=None):
+    """
+    Plays one at-bat on the terminal — prompts for the human side(s), narrates
+    when verbose — on top of the rules in game.rules. A silent CPU-vs-CPU at-bat
+    goes straight to rules.simulate_at_bat.
+
+    rng: the DiceSource (or DiceStreams) behind every die and AI draw — pass a
+    seeded one to replay an at-bat exactly; defaults to the shared process-wide stream.
+    """
     if config is None:
         config = DEFAULT_CONFIG
-    balls, strikes, at_bat_over = 0, 0, False
-    pitcher_hand = ["FB", "CB", "CU"]
-    pitch_streak_type, pitch_streak_count = None, 0
-    pitcher_gas = config.effective_gas()
-    # Gas is spent down, not refilled — pitcher weakens over a long at-bat
-    final_result, pitch_count, last_strike_swinging = None, 0, False
+    if rng is None:
+        rng = default_dice()
+    if pitcher_is_ai and hitter_is_ai and not verbose:
+        return simulate_at_bat(pitcher_dice_pool, config, rng)
+
+    state = start(config)
+    pitcher_hand = config.pitch_types()
     pitch_type_counts = {"FB": 0, "CB": 0, "CU": 0}
 
     if verbose:
         print("========================================")
         print("      --== DICEBALL DUEL v4 ==--      ")
         print("========================================")
-        print(f"Pitcher starts with {pitcher_gas} gas 🔥 (spent on re-rolls, not refilled)")
+        print(f"Pitcher starts with {state.gas} gas 🔥 (spent on re-rolls, not refilled)")
 
-    while not at_bat_over:
-        pitch_count += 1
+    while state.result is None:
+        balls, strikes, pitch_streak_type, pitch_streak_count, pitcher_gas = state[:5]
         if verbose:
             print(f"\n--- NEW PITCH --- COUNT: {balls}-{strikes} ---")
             print(f"Pitcher gas remaining: {pitcher_gas} 🔥")
@@ -189,14 +230,14 @@ def play_at_bat(pitcher_dice_pool, pitcher_is_ai=False, hitter_is_ai=False, verb
 
         # --- PITCHER ROLLS ---
         if verbose: print("\nPitcher is winding up... rolls the dice!")
-        pitcher_dice = roll_dice(pitcher_dice_pool)
+        pitcher_dice = roll_dice(pitcher_dice_pool, rng.stream("pitch"))
         if verbose: display_dice(pitcher_dice)
 
         # --- PUBLIC PITCHER RE-ROLL DECISION + SECRET COMMIT ---
         if pitcher_is_ai:
             re_roll_input, chosen_pitch = make_pitcher_decision(
                 pitcher_dice, balls, strikes, pitch_streak_type, pitch_streak_count, pitcher_gas,
-                config=config, verbose=verbose
+                config=config, verbose=verbose, rng=rng.stream("pitcher_ai")
             )
             if verbose:
                 if re_roll_input:
@@ -222,26 +263,27 @@ def play_at_bat(pitcher_dice_pool, pitcher_is_ai=False, hitter_is_ai=False, verb
 
             print("\n--- Both players now make their secret choices! ---")
             chosen_pitch = get_validated_input(
-                "Pitcher, which pitch will you secretly commit to? [fb], [cb], or [cu]: ",
+                f"Pitcher, which pitch will you secretly commit to? {', '.join(f'[{p.lower()}]' for p in pitcher_hand)}: ",
                 [p.lower() for p in pitcher_hand]
             ).upper()
 
         # --- HITTER'S DECISION (after seeing dice + re-roll plan) ---
         if hitter_is_ai:
             hitter_reroll_info = "" if config.hidden_reroll else re_roll_input
-            final_swing_decision, commit_pitch, swing_type = make_hitter_decision(
+            decision = make_hitter_decision(
                 pitcher_dice, hitter_reroll_info, balls, strikes,
                 pitch_streak_type, pitch_streak_count, pitcher_gas,
-                config=config, verbose=verbose
+                config=config, verbose=verbose, rng=rng.stream("hitter_ai")
             )
         else:
-            final_swing_decision, commit_pitch, swing_type = get_hitter_post_dice_choices(
+            decision = get_hitter_post_dice_choices(
                 pitcher_dice, re_roll_input, balls,
-                pitch_streak_type, pitch_streak_count, pitcher_gas
+                pitch_streak_type, pitch_streak_count, pitcher_gas, config=config
             )
 
         # --- REVEAL ---
         if verbose:
+            final_swing_decision, commit_pitch, _ = decision
             print("\n--- REVEAL! ---")
             full_pitch_name = PITCH_REQUIREMENTS.get(chosen_pitch, {}).get("name", "Unknown")
             print(f"Pitcher committed to a {full_pitch_name}.")
@@ -251,103 +293,12 @@ def play_at_bat(pitcher_dice_pool, pitcher_is_ai=False, hitter_is_ai=False, verb
                 print("Hitter TAKES.")
             time.sleep(1)
 
-        # Execute the re-roll
-        if re_roll_input:
-            num_rerolled = len(re_roll_input.split())
-            pitcher_gas -= num_rerolled
-            try:
-                indices = [int(i) - 1 for i in re_roll_input.split()]
-                new_dice = roll_dice(len(indices))
-                for i, new_die in zip(indices, new_dice):
-                    if 0 <= i < len(pitcher_dice): pitcher_dice[i] = new_die
-                pitcher_dice.sort()
-                if verbose:
-                    print("\nPitcher adjusts... the final dice are:")
-                    display_dice(pitcher_dice)
-            except (ValueError, IndexError):
-                if verbose: print("Invalid re-roll input. Keeping all dice.")
-
-        # --- PITCH OUTCOME ---
+        # --- RE-ROLL, PITCH OUTCOME, RESOLUTION ---
         pitch_type_counts[chosen_pitch] = pitch_type_counts.get(chosen_pitch, 0) + 1
-        difficulty_modifier = 0
-        current_pitch_category = "FB" if chosen_pitch == "FB" else "OFFSPEED"
-
-        if current_pitch_category != pitch_streak_type:
-            if pitch_streak_count >= 2:
-                setup_bonus = min(pitch_streak_count - 1, 2)
-                difficulty_modifier = setup_bonus
-                if verbose: print(f"\nStreak of {pitch_streak_count} {pitch_streak_type} pitches sets up the {current_pitch_category}! PITCH DIFFICULTY +{setup_bonus}!")
-        else:
-            if pitch_streak_count >= 2:
-                difficulty_modifier = -1
-                if verbose: print(f"\nPitcher getting predictable with {current_pitch_category} pitches! PITCH DIFFICULTY -1!")
-
-        chosen_dice, pitch_difficulty, pitch_result = find_pitch_outcome(pitcher_dice, chosen_pitch, config)
-        pitch_difficulty += difficulty_modifier
-
+        events = [] if verbose else None
+        state = pitch(state, pitcher_dice, re_roll_input, chosen_pitch, decision, config, rng, events)
         if verbose:
-            full_pitch_name = PITCH_REQUIREMENTS.get(chosen_pitch, {}).get("name", "Unknown")
-            print(f"\nPitcher's final dice for the {full_pitch_name} are {chosen_dice}.")
-            if pitch_result == "STRIKE":
-                print(f"It's a {full_pitch_name}! STRIKE — difficulty {pitch_difficulty}.")
-            else:
-                print(f"Failed {full_pitch_name}! BALL — difficulty {pitch_difficulty}.")
-            time.sleep(1)
-
-        if current_pitch_category == pitch_streak_type:
-            pitch_streak_count += 1
-        else:
-            pitch_streak_type = current_pitch_category
-            pitch_streak_count = 1
-
-        # --- RESOLUTION ---
-        if final_swing_decision == 'n':
-            if pitch_result == "STRIKE":
-                strikes += 1
-                last_strike_swinging = False
-                if verbose: print("\nHitter takes for a called STRIKE!")
-            else:
-                balls += 1
-                if verbose: print("\nHitter takes for a BALL!")
-        else:  # Hitter swings
-            # Commit bonus: +1 if committed to correct pitch, -1 if wrong
-            contact_roll_bonus = 0
-            if commit_pitch:
-                if commit_pitch.upper() == chosen_pitch:
-                    contact_roll_bonus = config.correct_commit_bonus
-                    if verbose: print(f"\nHitter's commit on {commit_pitch.upper()} was RIGHT! +{contact_roll_bonus} to all contact dice.")
-                else:
-                    contact_roll_bonus = config.wrong_commit_penalty
-                    if verbose: print(f"\nHitter committed to {commit_pitch.upper()} but it's a {chosen_pitch}! {contact_roll_bonus} to all contact dice.")
-
-            swing_result = resolve_swing(swing_type, 0, 0, contact_roll_bonus, pitch_difficulty, verbose,
-                                         power_bonus=config.hitter_power_bonus)
-
-            if swing_result in ["SINGLE", "DOUBLE", "TRIPLE", "HR", "OUT", "WEAK_OUT"]:
-                if verbose:
-                    if swing_result == "HR": print("That ball is OBLITERATED! HOME RUN!")
-                    elif swing_result == "TRIPLE": print("Screaming line drive into the corner — TRIPLE!")
-                    elif swing_result == "DOUBLE": print("Smoked into the gap! That's a DOUBLE!")
-                    elif swing_result == "SINGLE": print("A sharp line drive for a SINGLE!")
-                    else: print("...and the defense makes the play! OUT!")
-                final_result = swing_result
-                at_bat_over = True
-            elif swing_result == "FOUL":
-                if strikes < 2: strikes += 1
-            elif swing_result == "MISS":
-                strikes += 1
-                last_strike_swinging = True
-
-        # Check end of at-bat conditions
-        if not at_bat_over:
-            if strikes >= 3:
-                if verbose: print("\nSTRIKE THREE! You're out!")
-                final_result = "K_S" if last_strike_swinging else "K_L"
-                at_bat_over = True
-            if balls >= 4:
-                if verbose: print("\nBALL FOUR! Take your base.")
-                final_result = "BB"
-                at_bat_over = True
+            narrate(events)
 
-    return {"result": final_result, "pitches": pitch_count, "balls": balls, "strikes": strikes,
+    return {"result": state.result, "pitches": state.pitches, "balls": state.balls, "strikes": state.strikes,
             "pitch_types": pitch_type_counts}
@@ -0,0 +1,288 @@
+"""
+Pitch-level event log: one fixed-width record per pitch, stored by column.
+
+A log is a directory holding one append-only binary file per column (the raw
+bytes of an array.array of that column's typecode) and a columns.json
+describing them and the config that was played. PitchLogWriter buffers
+records in arrays and appends them in chunks; PitchLogReader maps the column
+files into memory, so a log of a hundred million pitches can be scanned
+column by column without being read into RAM.
+
+Codes:
+    streak_type  index into STREAK_TYPES (0 = no streak)
+    dice         the hand packed 3 bits per die, first (lowest) die in the low bits — unpack_dice()
+    final_dice   the hand after the re-roll, packed the same way
+    reroll_mask  bit i set when die i of the sorted hand was re-rolled
+    pitch        index into PITCH_TYPES
+    decision     index into DECISIONS
+    outcome      index into OUTCOMES — what this pitch did
+    result       0 while the at-bat goes on, else 1 + index into RESULTS
+"""
+import json
+import mmap
+import sys
+from array import array
+from dataclasses import asdict
+from pathlib import Path
+
+from game.pitch_utils import PITCH_TYPES
+
+FORMAT_VERSION = 1
+
+COLUMNS = (
+    ("at_bat", "I"),        # at-bat number within the log
+    ("pitch_no", "H"),      # pitches already thrown in the at-bat
+    ("balls", "B"),
+    ("strikes", "B"),
+    ("streak_type", "B"),
+    ("streak_count", "B"),
+    ("gas", "B"),           # before this pitch's re-roll
+    ("num_dice", "B"),
+    ("dice", "I"),
+    ("reroll_mask", "B"),
+    ("final_dice", "I"),
+    ("pitch", "B"),
+    ("decision", "B"),
+    ("difficulty", "b"),    # after the streak modifier
+    ("outcome", "B"),
+    ("result", "B"),
+)
+
+STREAK_TYPES = (None, "FB", "OFFSPEED")
+DECISIONS = ("TAKE", "FB/p", "FB/c", "CB/p", "CB/c", "CU/p", "CU/c")
+OUTCOMES = ("BALL", "CALLED_STRIKE", "FOUL", "MISS", "SINGLE", "DOUBLE", "TRIPLE", "HR", "OUT", "WEAK_OUT")
+RESULTS = ("BB", "K_S", "K_L", "SINGLE", "DOUBLE", "TRIPLE", "HR", "OUT", "WEAK_OUT")
+
+_STREAK_CODE = {streak_type: i for i, streak_type in enumerate(STREAK_TYPES)}
+_PITCH_CODE = {pitch_type: i for i, pitch_type in enumerate(PITCH_TYPES)}
+_DECISION_CODE = {decision: i for i, decision in enumerate(DECISIONS)}
+_OUTCOME_CODE = {outcome: i for i, outcome in enumerate(OUTCOMES)}
+_RESULT_CODE = {result: i + 1 for i, result in enumerate(RESULTS)}
+
+
+def pack_dice(dice):
+    code = 0
+    for i, die in enumerate(dice):
+        code |= die << (3 * i)
+    return code
+
+
+def unpack_dice(code, num_dice):
+    return [code >> (3 * i) & 7 for i in range(num_dice)]
+
+
+def _reroll_mask(re_roll_input):
+    mask = 0
+    try:
+        for index in re_roll_input.split():
+            mask |= 1 << (int(index) - 1)
+    except ValueError:  # unreadable human input re-rolls nothing
+        return 0
+    return mask
+
+
+def _header(config):
+    return {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "columns": [[name, typecode, array(typecode).itemsize] for name, typecode in COLUMNS],
+        "config": asdict(config),
+        "config_digest": config.digest(),
+    }
+
+
+class PitchLogWriter:
+    """
+    Appends pitch records to a log directory, creating it on first use.
+    An existing log is extended, not overwritten — it must have been written for
+    the same config with the same column layout. Use as a context manager, or
+    call close() to write out the last chunk.
+    """
+
+    def __init__(self, path, config, chunk_size=1 << 16):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        header = _header(config)
+        meta = self.path / "columns.json"
+        if meta.exists():
+            existing = json.loads(meta.read_text())
+            for key in ("version", "byteorder", "columns", "config_digest"):
+                if existing[key] != header[key]:
+                    raise ValueError(f"{self.path} holds a log with a different {key}; "
+                                     f"write this run to a new directory.")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            meta.write_text(json.dumps(header, indent=2))
+
+        self._files = [open(self.path / f"{name}.bin", "ab") for name, _ in COLUMNS]
+        self._buffers = [array(typecode) for _, typecode in COLUMNS]
+        # Every column is flushed together, so a torn write only ever loses a tail —
+        # trim all columns to the shortest before carrying on.
+        self.records = min(f.tell() // buf.itemsize for f, buf in zip(self._files, self._buffers))
+        for f, buf in zip(self._files, self._buffers):
+            f.truncate(self.records * buf.itemsize)
+        self.at_bats = 0
+        if self.records:
+            # Number on from the last at-bat logged (one cut off mid-way keeps result 0 throughout)
+            last = array("I")
+            with open(self.path / "at_bat.bin", "rb") as f:
+                f.seek((self.records - 1) * last.itemsize)
+                last.frombytes(f.read(last.itemsize))
+            self.at_bats = last[0] + 1
+
+    def record(self, state, dice, re_roll_input, chosen_pitch, decision, events, next_state):
+        """
+        Logs one pitch. state / next_state: the AtBat before and after rules.pitch();
+        events: the list rules.pitch() filled.
+        """
+        swing_decision, commit_pitch, swing_type = decision
+        final_dice, difficulty, outcome = dice, 0, None
+        for event in events:
+            kind = event[0]
+            if kind == "reroll":
+                final_dice = event[1]
+            elif kind == "pitch":
+                difficulty = event[3]
+            elif kind == "take":
+                outcome = "CALLED_STRIKE" if event[1] == "STRIKE" else "BALL"
+            elif kind == "power":
+                outcome = event[3]
+            elif kind == "foul":
+                outcome = "FOUL"
+            elif kind == "miss":
+                outcome = "MISS"
+        decision_code = 0 if swing_decision == 'n' else _DECISION_CODE[f"{commit_pitch.upper()}/{swing_type}"]
+        result_code = _RESULT_CODE[next_state.result] if next_state.result is not None else 0
+
+        values = (self.at_bats, state.pitches, state.balls, state.strikes, _STREAK_CODE[state.streak_type],
+                  state.streak_count, state.gas, len(dice), pack_dice(dice), _reroll_mask(re_roll_input),
+                  pack_dice(final_dice), _PITCH_CODE[chosen_pitch], decision_code, difficulty,
+                  _OUTCOME_CODE[outcome], result_code)
+        for buf, value in zip(self._buffers, values):
+            buf.append(value)
+        self.records += 1
+        if result_code:
+            self.at_bats += 1
+        if len(self._buffers[0]) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        for f, buf in zip(self._files, self._buffers):
+            buf.tofile(f)
+            f.flush()
+            del buf[:]
+
+    def close(self):
+        self.flush()
+        for f in self._files:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PitchLogSet:
+    """
+    One log per config under a directory, for runs that play many configs (a season's
+    matchups). writer(config) is the PitchLogWriter for DIR/<first 16 hex of the config
+    digest>, opened on first use, so each log's columns.json describes its own records.
+    """
+
+    def __init__(self, path, chunk_size=1 << 16):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self._writers = {}
+
+    def writer(self, config):
+        log = self._writers.get(config)
+        if log is None:
+            log = self._writers[config] = PitchLogWriter(self.path / config.digest()[:16], config, self.chunk_size)
+        return log
+
+    def close(self):
+        for log in self._writers.values():
+            log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PitchLogReader:
+    """
+    Memory-mapped, read-only view of a log. column(name) is a memoryview of the
+    column's typecode (index, slice and iterate it without copying);
+    array(name) is the same bytes as a NumPy array, if NumPy is installed.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "columns.json").read_text())
+        if self.meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"{self.path} is log format {self.meta['version']}, this reader reads {FORMAT_VERSION}")
+        if self.meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"{self.path} was written on a {self.meta['byteorder']}-endian machine")
+        self.typecodes = {name: typecode for name, typecode, _ in self.meta["columns"]}
+        self._files, self._maps, self._views = {}, {}, {}
+        sizes = [(self.path / f"{name}.bin").stat().st_size // itemsize
+                 for name, _, itemsize in self.meta["columns"]]
+        self.records = min(sizes) if sizes else 0
+
+    def __len__(self):
+        return self.records
+
+    @property
+    def config(self):
+        return self.meta["config"]
+
+    def _buffer(self, name):
+        if name not in self._maps:
+            if name not in self.typecodes:
+                raise KeyError(f"no column {name!r} — columns are {', '.join(self.typecodes)}")
+            f = open(self.path / f"{name}.bin", "rb")
+            size = f.seek(0, 2)
+            self._files[name] = f
+            self._maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        return self._maps[name]
+
+    def column(self, name):
+        views = self._views.get(name)
+        if views is None:
+            whole = memoryview(self._buffer(name)).cast(self.typecodes[name])
+            views = self._views[name] = (whole, whole[:self.records])
+        return views[1]
+
+    def array(self, name):
+        try:
+            import numpy as np
+        except ImportError:
+            raise RuntimeError("PitchLogReader.array needs NumPy — install the batch extra (`uv sync --extra batch`), "
+                               "or use column().") from None
+        return np.frombuffer(self._buffer(name), dtype=np.dtype(self.typecodes[name]), count=self.records)
+
+    def close(self):
+        for whole, view in self._views.values():
+            view.release()
+            whole.release()
+        self._views.clear()
+        for m in self._maps.values():
+            if m:
+                try:
+                    m.close()
+                except BufferError:  # a NumPy array from array() still points into it
+                    pass
+        for f in self._files.values():
+            f.close()
+        self._maps.clear()
+        self._files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,206 @@
+"""
+Exact at-bat outcome distributions for CPU vs CPU.
+
+An at-bat is a Markov chain on (balls, strikes, streak, gas): every pitch rolls
+a fresh hand, so the dice only enter through each state's transition
+probabilities, which are summed over every hand (weighted by how many rolls
+give it), every AI move (pitcher_decision_distribution /
+hitter_decision_distribution, so the pitch mixing, gotcha pitches and 0-2
+takes count as probabilities), every re-roll and every swing outcome.
+
+Fouls with two strikes leave the count alone, so states that differ only in
+streak can cycle; those few states are solved together as a small linear
+system. Everything else is solved backwards from the end of the at-bat.
+"""
+from game.ai import hitter_decision_distribution, pitcher_decision_distribution
+from game.bats import (_contact_outcome_counts, _get_swing_dice, _pitch_outcome_distribution,
+                       _reroll_outcomes, _split_reroll, power_outcomes)
+from game.cache import config_cache
+from game.config import DEFAULT_CONFIG
+from game.pitch_utils import PITCH_TYPES
+
+RESULTS = ("BB", "K_S", "K_L", "SINGLE", "DOUBLE", "TRIPLE", "HR", "OUT", "WEAK_OUT")
+
+# A state's value vector: P(each result), then E[pitches], then E[pitches of each type]
+_PITCHES = len(RESULTS)
+_PITCH_TYPE_SLOT = {pitch_type: _PITCHES + 1 + i for i, pitch_type in enumerate(PITCH_TYPES)}
+_WIDTH = _PITCHES + 1 + len(PITCH_TYPES)
+_RESULT_SLOT = {result: i for i, result in enumerate(RESULTS)}
+
+
+def _streak_modifier(category, streak_type, streak_count):
+    """The difficulty change play_at_bat applies for the pitch's category against the streak."""
+    if streak_count < 2:
+        return 0
+    if category != streak_type:
+        return min(streak_count - 1, 2)
+    return -1
+
+
+def _next_streak(category, streak_type, streak_count):
+    """The streak after a pitch. Counts past 3 play exactly like 3, so they're capped there."""
+    if category == streak_type:
+        return category, min(streak_count + 1, 3)
+    return category, 1
+
+
+def pitch_transitions(balls, strikes, streak_type, streak_count, gas, pitcher_dice, config):
+    """
+    One pitch from a state, every hand and AI move accounted for.
+    Returns (ends, moves, pitch_mix): {result: p} for at-bats that end on this pitch,
+    {(balls, strikes, streak_type, streak_count, gas): p} for those that go on, and
+    {pitch_type: p} for the pitch thrown.
+    """
+    ends, moves, pitch_mix = {}, {}, dict.fromkeys(PITCH_TYPES, 0.0)
+    total_hands = 6 ** pitcher_dice
+
+    def end(result, p):
+        ends[result] = ends.get(result, 0.0) + p
+
+    def move(state, p):
+        moves[state] = moves.get(state, 0.0) + p
+
+    for hand, hand_ways in _reroll_outcomes(pitcher_dice):
+        dice = list(hand)
+        p_hand = hand_ways / total_hands
+        for re_roll_input, chosen_pitch, p_move in pitcher_decision_distribution(
+                dice, balls, strikes, streak_type, streak_count, gas, config):
+            p_pitch = p_hand * p_move
+            pitch_mix[chosen_pitch] += p_pitch
+
+            hitter_reroll_info = "" if config.hidden_reroll else re_roll_input
+            decisions = hitter_decision_distribution(dice, hitter_reroll_info, balls, strikes,
+                                                     streak_type, streak_count, gas, config)
+            kept_dice, num_reroll = _split_reroll(dice, re_roll_input, gas)
+            new_gas = gas - len(re_roll_input.split())
+            category = "FB" if chosen_pitch == "FB" else "OFFSPEED"
+            modifier = _streak_modifier(category, streak_type, streak_count)
+            streak = _next_streak(category, streak_type, streak_count)
+            total_rerolls = 6 ** num_reroll
+
+            outcomes = _pitch_outcome_distribution(kept_dice, num_reroll, config)[chosen_pitch]
+            for (pitch_result, difficulty), ways in outcomes.items():
+                p_outcome = p_pitch * ways / total_rerolls
+                for (swing_decision, commit_pitch, swing_type), p_decision in decisions:
+                    p = p_outcome * p_decision
+                    if swing_decision == 'n':
+                        if pitch_result == "STRIKE":
+                            if strikes + 1 >= 3:
+                                end("K_L", p)
+                            else:
+                                move((balls, strikes + 1) + streak + (new_gas,), p)
+                        elif balls + 1 >= 4:
+                            end("BB", p)
+                        else:
+                            move((balls + 1, strikes) + streak + (new_gas,), p)
+                        continue
+
+                    if commit_pitch.upper() == chosen_pitch:
+                        contact_roll_bonus = config.correct_commit_bonus
+                    else:
+                        contact_roll_bonus = config.wrong_commit_penalty
+                    contact_dice, power_dice = _get_swing_dice(swing_type, 'none')
+                    contact, foul, miss = _contact_outcome_counts(contact_dice, contact_roll_bonus,
+                                                                  difficulty + modifier)
+                    total_swings = 6 ** contact_dice
+                    if contact:
+                        power = power_outcomes(power_dice, config.hitter_power_bonus, power_dice >= 3)
+                        for result, p_result in power.probs.items():
+                            if p_result:
+                                end(result, p * contact / total_swings * p_result)
+                    if foul:
+                        move((balls, min(strikes + 1, 2)) + streak + (new_gas,), p * foul / total_swings)
+                    if miss:
+                        if strikes + 1 >= 3:
+                            end("K_S", p * miss / total_swings)
+                        else:
+                            move((balls, strikes + 1) + streak + (new_gas,), p * miss / total_swings)
+    return ends, moves, pitch_mix
+
+
+def _solve_linear(matrix, rhs):
+    """Solves matrix @ X = rhs by Gauss-Jordan elimination with partial pivoting (rhs: one row per unknown)."""
+    n = len(matrix)
+    a = [list(matrix[i]) + list(rhs[i]) for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        a[col], a[pivot] = a[pivot], a[col]
+        lead = a[col][col]
+        a[col] = [x / lead for x in a[col]]
+        for r in range(n):
+            if r != col and a[r][col]:
+                factor = a[r][col]
+                a[r] = [x - factor * y for x, y in zip(a[r], a[col])]
+    return [row[n:] for row in a]
+
+
+_SOLUTIONS = config_cache("exact_solutions", maxsize=4096)
+
+
+def solve_at_bat(config=None, pitcher_dice=None):
+    """
+    The exact CPU-vs-CPU at-bat distribution for a config.
+    pitcher_dice overrides the pool size (gas still follows the config, as in play_at_bat).
+
+    Returns {"results": {result: probability}, "pitches": expected pitches per PA,
+             "pitch_types": {pitch_type: expected pitches of that type per PA}}.
+    Memoized on the config's field values — don't mutate the returned dicts.
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    if pitcher_dice is None:
+        pitcher_dice = config.pitcher_dice
+    key = (_SOLUTIONS.project(config), pitcher_dice)
+    solution = _SOLUTIONS.get(key)
+    if solution is not None:
+        return solution
+
+    start = (0, 0, None, 0, config.effective_gas())
+
+    # Walk forward to find every reachable state and its one-pitch transitions
+    transitions = {}
+    frontier = [start]
+    while frontier:
+        state = frontier.pop()
+        if state in transitions:
+            continue
+        transitions[state] = pitch_transitions(*state, pitcher_dice, config)
+        frontier.extend(next_state for next_state in transitions[state][1] if next_state not in transitions)
+
+    # Group states by (balls, strikes, gas). Every move out of a group raises balls or
+    # strikes or spends gas, so groups are solved latest-first; within a group only
+    # two-strike fouls connect states.
+    groups = {}
+    for state in transitions:
+        balls, strikes, _, _, gas = state
+        groups.setdefault((balls, strikes, gas), []).append(state)
+
+    values = {}
+    for group_key in sorted(groups, key=lambda k: k[0] + k[1] - k[2], reverse=True):
+        members = groups[group_key]
+        index = {state: i for i, state in enumerate(members)}
+        matrix = [[float(i == j) for j in range(len(members))] for i in range(len(members))]
+        rhs = []
+        for i, state in enumerate(members):
+            ends, moves, pitch_mix = transitions[state]
+            row = [0.0] * _WIDTH
+            for result, p in ends.items():
+                row[_RESULT_SLOT[result]] += p
+            row[_PITCHES] = 1.0
+            for pitch_type, p in pitch_mix.items():
+                row[_PITCH_TYPE_SLOT[pitch_type]] += p
+            for next_state, p in moves.items():
+                if next_state in index:
+                    matrix[i][index[next_state]] -= p
+                else:
+                    row = [x + p * y for x, y in zip(row, values[next_state])]
+            rhs.append(row)
+        for state, value in zip(members, _solve_linear(matrix, rhs)):
+            values[state] = value
+
+    value = values[start]
+    return _SOLUTIONS.put(key, {
+        "results": {result: value[_RESULT_SLOT[result]] for result in RESULTS},
+        "pitches": value[_PITCHES],
+        "pitch_types": {pitch_type: value[_PITCH_TYPE_SLOT[pitch_type]] for pitch_type in PITCH_TYPES},
+    })
@@ -0,0 +1,141 @@
+"""
+Process-pool backend for CPU-vs-CPU simulation runs.
+
+A run of n at-bats is split into one shard per worker. Each shard gets its own
+seed derived from (run seed, config index, shard index), so a given
+(seed, n, workers) always reproduces the same counts, whatever order the
+shards finish in. Shards return Counters, which merge by addition.
+
+With crn=True, at-bat i instead plays on its own DiceStreams seeded from
+(run seed, i), whatever config or shard it lands in — common random numbers, so
+configs compared on the same seed see the same dice and AI draws.
+"""
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game.dice import DiceSource, DiceStreams, derive_seed
+from game.exact import solve_at_bat
+from game.rules import simulate_at_bat
+
+
+def shard_bounds(n, shards):
+    """Splits range(n) into `shards` contiguous (start, stop) pieces of near-equal size."""
+    base, extra = divmod(n, shards)
+    bounds, start = [], 0
+    for i in range(shards):
+        stop = start + base + (1 if i < extra else 0)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def simulate_shard(config, dice_counts, start, stop, seed, crn=False):
+    """
+    Plays at-bats start..stop-1 (at-bat i uses dice_counts[i % len(dice_counts)] pitcher dice).
+    All dice and AI draws come from one DiceSource seeded with `seed` — or with crn,
+    from DiceStreams(derive_seed(seed, i)) for at-bat i.
+    Returns (results, pitch_types, pitches_per_pa) Counters.
+    """
+    rng = None if crn else DiceSource(seed)
+    results, pitch_types, pitches = Counter(), Counter(), Counter()
+    for i in range(start, stop):
+        ab = simulate_at_bat(dice_counts[i % len(dice_counts)], config,
+                             DiceStreams(derive_seed(seed, i)) if crn else rng)
+        results[ab["result"]] += 1
+        pitch_types.update(ab["pitch_types"])
+        pitches[ab["pitches"]] += 1
+    return results, pitch_types, pitches
+
+
+_EXECUTOR = None
+_EXECUTOR_WORKERS = None
+
+
+def _executor(workers):
+    """A process pool kept alive between runs, so lever searches don't pay start-up per candidate."""
+    global _EXECUTOR, _EXECUTOR_WORKERS
+    if _EXECUTOR is None or _EXECUTOR_WORKERS != workers:
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown()
+        _EXECUTOR = ProcessPoolExecutor(max_workers=workers)
+        _EXECUTOR_WORKERS = workers
+    return _EXECUTOR
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def simulate_many(configs, n, workers=None, seed=None, dice_counts=None, crn=False, offset=0):
+    """
+    Simulates n at-bats for every config, all shards of all configs sharing one pool.
+    dice_counts defaults to each config's own pitcher_dice.
+    crn: every config plays the same per-at-bat streams (at-bats offset..offset+n-1),
+    so a run can be topped up later with offset=n and stay paired.
+    Returns a list of (results, pitch_types, pitches_per_pa) Counters, one per config.
+    """
+    workers = workers or default_workers()
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    pool = _executor(workers)
+    futures = []
+    for c, config in enumerate(configs):
+        counts = dice_counts or [config.pitcher_dice]
+        futures.append([
+            pool.submit(simulate_shard, config, counts, offset + start, offset + stop,
+                        seed if crn else derive_seed(seed, c, shard), crn)
+            for shard, (start, stop) in enumerate(shard_bounds(n, workers))
+            if stop > start
+        ])
+
+    merged = []
+    for shard_futures in futures:
+        results, pitch_types, pitches = Counter(), Counter(), Counter()
+        for future in shard_futures:
+            shard_results, shard_pitch_types, shard_pitches = future.result()
+            results += shard_results
+            pitch_types += shard_pitch_types
+            pitches += shard_pitches
+        merged.append((results, pitch_types, pitches))
+    return merged
+
+
+def simulate_parallel(config, n, workers=None, seed=None, dice_counts=None, crn=False, offset=0):
+    """simulate_many for a single config."""
+    return simulate_many([config], n, workers, seed, dice_counts, crn, offset)[0]
+
+
+def solve_many(configs, workers=None):
+    """
+    Exact at-bat solutions (game.exact.solve_at_bat) for many configs, spread over the
+    shared pool. Returns them in the order of configs; workers=1 solves in this process.
+    """
+    configs = list(configs)
+    workers = workers or default_workers()
+    if workers == 1 or len(configs) < 2:
+        return [solve_at_bat(config) for config in configs]
+    chunksize = max(1, len(configs) // (4 * workers))
+    return list(_executor(workers).map(solve_at_bat, configs, chunksize=chunksize))
+
+
+def imap_unordered(fn, jobs, workers=None):
+    """
+    Yields fn(*args) for every args tuple in jobs as each finishes, in whatever order,
+    on the shared pool; workers=1 runs them here, in order. Closing the generator
+    early (or an exception in the caller) cancels the jobs that haven't started.
+    """
+    workers = workers or default_workers()
+    if workers == 1:
+        for args in jobs:
+            yield fn(*args)
+        return
+    futures = [_executor(workers).submit(fn, *args) for args in jobs]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
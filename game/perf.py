@@ -0,0 +1,166 @@
+"""
+Opt-in timing for the simulation hot path.
+
+enable() swaps each function in PHASES for a timed wrapper — in its own module
+and in every module that imported it by name — and disable() puts the
+originals back. Nothing is wrapped until enable() is called, so an
+uninstrumented run pays nothing.
+
+Each phase counts calls and cumulative perf_counter_ns time. Phases nest (the
+AI decisions call into the memoized helpers), so times are inclusive and don't
+add up to the run. Phases memoized in a registered config cache (game/cache.py)
+also count hits — a call that doesn't add to the cache's misses was a hit — and
+the lru_cache functions in LRU_CACHES report hits from cache_info(). The report
+ends with every config cache's size, evictions and hit rate since start-up.
+
+Only the current process is timed: shards running in a --workers pool are not.
+"""
+import sys
+import time
+from functools import wraps
+from importlib import import_module
+
+from game.cache import cache_stats
+
+# (module, function, its ConfigCache or None), in report order
+PHASES = (
+    ("game.rules", "pitch", None),
+    ("game.ai", "make_pitcher_decision", None),
+    ("game.ai", "make_hitter_decision", None),
+    ("game.ai", "_hitter_swing_choice", "_HITTER_SWING_CHOICES"),
+    ("game.bats", "calculate_bats_probabilities", None),
+    ("game.bats", "_pitch_outcome_distribution", "_PITCH_OUTCOME_DISTRIBUTIONS"),
+    ("game.bats", "_calculate_pitch_difficulty_probs", "_PITCH_DIFFICULTY_PROBS"),
+    ("game.pitch_utils", "find_pitch_outcome", None),
+    ("game.rules", "swing", None),
+    ("game.engine", "resolve_swing", None),
+)
+
+LRU_CACHES = (
+    ("game.bats", "_contact_outcome_counts"),
+    ("game.bats", "_simulate_contact_prob"),
+    ("game.bats", "power_outcomes"),
+    ("game.bats", "_power_sum_counts"),
+    ("game.bats", "_reroll_outcomes"),
+)
+
+_originals = {}     # (module, function) -> the unwrapped function
+_stats = {}         # function -> [calls, ns, misses]
+_lru_baseline = {}  # (module, function) -> (hits, misses) when timing started
+_started = None
+
+
+def enabled():
+    return bool(_originals)
+
+
+def _rebind(old, new):
+    """Points every module-level name bound to `old` at `new`."""
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if not namespace:
+            continue
+        for name, value in list(namespace.items()):
+            if value is old:
+                namespace[name] = new
+
+
+def _timed(fn, stat, memo):
+    clock = time.perf_counter_ns
+    if memo is None:
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stat[1] += clock() - start
+                stat[0] += 1
+    else:
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            misses = memo.misses
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stat[1] += clock() - start
+                stat[0] += 1
+                if memo.misses != misses:
+                    stat[2] += 1
+    return timed
+
+
+def enable():
+    """Starts timing the phases (and resets the counters). Safe to call twice."""
+    if not _originals:
+        for module_name, name, memo_name in PHASES:
+            module = import_module(module_name)
+            fn = getattr(module, name)
+            stat = _stats.setdefault(name, [0, 0, 0])
+            memo = getattr(module, memo_name) if memo_name else None
+            _originals[(module_name, name)] = fn
+            _rebind(fn, _timed(fn, stat, memo))
+    reset()
+
+
+def disable():
+    """Puts the original functions back. The counters are kept for report()."""
+    for (module_name, name), fn in _originals.items():
+        _rebind(getattr(import_module(module_name), name), fn)
+    _originals.clear()
+
+
+def reset():
+    global _started
+    for stat in _stats.values():
+        stat[:] = [0, 0, 0]
+    for module_name, name in LRU_CACHES:
+        info = getattr(import_module(module_name), name).cache_info()
+        _lru_baseline[(module_name, name)] = (info.hits, info.misses)
+    _started = time.perf_counter_ns()
+
+
+def stats():
+    """
+    {"elapsed_ns": ns since enable()/reset(),
+     "phases": {function: {"calls", "ns", "hits" (memoized phases only)}},
+     "caches": {function: {"hits", "misses"}}}.
+    """
+    phases = {}
+    for _, name, memo_name in PHASES:
+        calls, ns, misses = _stats.get(name, (0, 0, 0))
+        phases[name] = {"calls": calls, "ns": ns}
+        if memo_name:
+            phases[name]["hits"] = calls - misses
+    caches = {}
+    for module_name, name in LRU_CACHES:
+        info = getattr(import_module(module_name), name).cache_info()
+        hits, misses = _lru_baseline.get((module_name, name), (0, 0))
+        caches[name] = {"hits": info.hits - hits, "misses": info.misses - misses}
+    elapsed = time.perf_counter_ns() - _started if _started is not None else 0
+    return {"elapsed_ns": elapsed, "phases": phases, "caches": caches}
+
+
+def report():
+    """Prints the per-phase breakdown since enable()/reset()."""
+    s = stats()
+    elapsed = s["elapsed_ns"] or 1
+    print(f"\n  {'Phase (inclusive)':<34} {'Calls':>10} {'Total ms':>10} {'% run':>6} {'ns/call':>9} {'Cache hit':>9}")
+    for name, phase in s["phases"].items():
+        calls, ns = phase["calls"], phase["ns"]
+        if not calls:
+            continue
+        hit = f"{phase['hits'] / calls:.1%}" if "hits" in phase else "—"
+        print(f"  {name:<34} {calls:>10,} {ns / 1e6:>10.1f} {ns / elapsed:>6.1%} {ns // calls:>9,} {hit:>9}")
+    for name, cache in s["caches"].items():
+        lookups = cache["hits"] + cache["misses"]
+        if lookups:
+            print(f"  {name + ' (lru_cache)':<34} {lookups:>10,} {'':>10} {'':>6} {'':>9} {cache['hits'] / lookups:>9.1%}")
+    print(f"  {'Run':<34} {'':>10} {s['elapsed_ns'] / 1e6:>10.1f}")
+
+    print(f"\n  {'Config cache':<34} {'Size':>10} {'Max':>10} {'Evicted':>9} {'Hit rate':>9}")
+    for name, cache in cache_stats().items():
+        lookups = cache["hits"] + cache["misses"]
+        hit = f"{cache['hits'] / lookups:.1%}" if lookups else "—"
+        print(f"  {name:<34} {cache['size']:>10,} {cache['maxsize']:>10,} {cache['evictions']:>9,} {hit:>9}")
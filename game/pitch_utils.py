@@ -1,12 +1,24 @@
-from itertools import combinations
+from itertools import combinations, combinations_with_replacement
 from collections import Counter
 
+from game.cache import config_cache
+from game.config import PITCH_FIELDS
+
 # Use FB, CB, CU for abbreviations
 PITCH_REQUIREMENTS = {
     "FB": {"type": "3-of-a-kind", "name": "Fastball"},
     "CB": {"type": "3-die run", "name": "Curveball"},
     "CU": {"type": "3 different odd or even dice", "name": "Changeup"}
 }
+PITCH_TYPES = ("FB", "CB", "CU")
+
+
+def arsenal(pitches):
+    """The GameConfig.arsenal lever for a collection of PITCH_TYPES. Raises ValueError."""
+    unknown = set(pitches) - set(PITCH_TYPES)
+    if unknown or not pitches:
+        raise ValueError(f"an arsenal is one or more of {'/'.join(PITCH_TYPES)}, not {'/'.join(pitches) or 'nothing'}")
+    return "/".join(pitch_type for pitch_type in PITCH_TYPES if pitch_type in pitches)
 
 
 def calc_difficulty(key_dice, method):
@@ -23,7 +35,10 @@ def find_key_dice(combo, pitch_type, config):
     """
     Returns the key dice that form the pitch within a 3-die combo, or None if invalid.
     Selects the best key set (maximizing difficulty by config.difficulty_method).
+    A pitch outside config.arsenal never forms.
     """
+    if pitch_type not in config.pitch_types():
+        return None
     if pitch_type == "FB":
         counts = Counter(combo)
         valid = [(val, cnt) for val, cnt in counts.items() if cnt >= config.fb_match_count]
@@ -84,17 +99,9 @@ def check_pitch_combo(dice_selection, pitch_type, config=None):
     return find_key_dice(dice_selection, pitch_type, config) is not None
 
 
-def find_pitch_outcome(dice_pool, committed_pitch, config=None):
-    """
-    Automatically finds the best possible version of the committed pitch.
-    Returns: (chosen_dice, difficulty, pitch_result)
-    """
-    if config is None:
-        from game.config import DEFAULT_CONFIG
-        config = DEFAULT_CONFIG
-
+def _search_pitch_outcome(dice_pool, committed_pitch, config):
+    """Brute-force search over every 3-die combo. Returns (chosen_dice, difficulty, pitch_result)."""
     best_combo = None
-    best_key_dice = None
     highest_difficulty = -1
 
     for combo in combinations(dice_pool, 3):
@@ -104,7 +111,6 @@ def find_pitch_outcome(dice_pool, committed_pitch, config=None):
             if difficulty > highest_difficulty:
                 highest_difficulty = difficulty
                 best_combo = sorted(list(combo))
-                best_key_dice = key_dice
 
     if best_combo:
         return best_combo, highest_difficulty, "STRIKE"
@@ -112,3 +118,86 @@ def find_pitch_outcome(dice_pool, committed_pitch, config=None):
         failed_attempt_dice = sorted(dice_pool, reverse=True)[:3]
         difficulty = calc_difficulty(failed_attempt_dice, config.difficulty_method)
         return failed_attempt_dice, difficulty, "BALL"
+
+
+class PitchTable:
+    """
+    Every hand's pitch outcomes under one config's pitch rules, precomputed.
+
+    A hand is looked up as its sorted multiset of dice. The first lookup for a
+    pool size builds the rows for every multiset of that size (252 for 5d6).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._outcomes = {}   # hand -> {pitch_type: (chosen_dice, difficulty, pitch_result)}
+        self._possible = {}   # hand -> ((pitch_type, difficulty, combo), ...) as _analyze_dice lists them
+        self._sizes = set()
+
+    def _build(self, size):
+        config = self.config
+        for hand in combinations_with_replacement(range(1, 7), size):
+            self._outcomes[hand] = {
+                pitch_type: _search_pitch_outcome(hand, pitch_type, config)
+                for pitch_type in PITCH_TYPES
+            }
+            possible = []
+            for pitch_type in PITCH_TYPES:
+                for combo in combinations(hand, 3):
+                    key_dice = find_key_dice(list(combo), pitch_type, config)
+                    if key_dice is not None:
+                        possible.append((pitch_type, calc_difficulty(key_dice, config.difficulty_method), combo))
+            self._possible[hand] = tuple(possible)
+        self._sizes.add(size)
+
+    def row(self, hand):
+        """All three pitch outcomes for a sorted hand tuple."""
+        row = self._outcomes.get(hand)
+        if row is None:
+            self._build(len(hand))
+            row = self._outcomes[hand]
+        return row
+
+    def outcome(self, dice_pool, pitch_type):
+        """Same answer as find_pitch_outcome: (chosen_dice, difficulty, pitch_result)."""
+        hand = tuple(sorted(dice_pool))
+        found = self.row(hand).get(pitch_type)
+        if found is None:  # not a pitch in the hand — always a ball
+            return _search_pitch_outcome(hand, pitch_type, self.config)
+        chosen_dice, difficulty, pitch_result = found
+        return list(chosen_dice), difficulty, pitch_result
+
+    def possible(self, dice_pool):
+        """Every (pitch_type, difficulty, combo) the hand can form, one entry per 3-die combo."""
+        hand = tuple(sorted(dice_pool))
+        if hand not in self._possible:
+            self._build(len(hand))
+        return self._possible[hand]
+
+    def best_difficulty(self, hand, pitch_type):
+        """Highest difficulty the sorted hand can throw the pitch at, or -1 if it can't."""
+        chosen_dice, difficulty, pitch_result = self.row(hand)[pitch_type]
+        return difficulty if pitch_result == "STRIKE" else -1
+
+
+_PITCH_TABLES = config_cache("pitch_tables", PITCH_FIELDS, maxsize=64)
+
+
+def pitch_table(config=None):
+    """The shared PitchTable for a config's pitch rules (built on first use)."""
+    if config is None:
+        from game.config import DEFAULT_CONFIG
+        config = DEFAULT_CONFIG
+    key = _PITCH_TABLES.project(config)
+    table = _PITCH_TABLES.get(key)
+    if table is None:
+        table = _PITCH_TABLES.put(key, PitchTable(config))
+    return table
+
+
+def find_pitch_outcome(dice_pool, committed_pitch, config=None):
+    """
+    Automatically finds the best possible version of the committed pitch.
+    Returns: (chosen_dice, difficulty, pitch_result)
+    """
+    return pitch_table(config).outcome(dice_pool, committed_pitch)
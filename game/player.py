@@ -1,13 +1,72 @@
+"""
+Players and how their ratings become levers.
+
+A rating runs 0-100 (50 = average) and moves a lever one step either way:
+below 35 is a step down, 65 and up a step up. A hitter's contact rating moves
+both commit levers and their power rating the power bonus. A pitcher's
+arsenal is the pitches they throw (the arsenal lever) and sets the dice pool
+(two dice plus one per pitch, so the full FB/CB/CU arsenal throws 5 dice);
+their control rating adds or takes away two gas
+tokens — the AI's re-rolls toward a pitch usually replace two dice, so a
+single token mostly goes unspent.
+"""
+from game.config import GameConfig
+from game.pitch_utils import PITCH_TYPES, arsenal
+
+AVERAGE_RATING = 50
+RATING_STEPS = (35, 65)  # below the first is a step down, the second and up a step up
+
+
+def rating_step(rating):
+    """-1, 0 or +1: how far a 0-100 rating moves its lever."""
+    low, high = RATING_STEPS
+    return (rating >= high) - (rating < low)
+
+
+def hitter_config(stats):
+    """The hitter levers (game.config.HITTER_FIELDS) for a hitter's stats."""
+    contact = rating_step(stats.get("contact", AVERAGE_RATING))
+    return GameConfig(correct_commit_bonus=1 + contact,
+                      wrong_commit_penalty=-1 + contact,
+                      hitter_power_bonus=rating_step(stats.get("power", AVERAGE_RATING)))
+
+
+def pitcher_config(pitches, stats):
+    """The pitcher levers for an arsenal (a collection of PITCH_TYPES) and stats."""
+    dice = 2 + len(set(pitches))
+    control = rating_step(stats.get("control", AVERAGE_RATING))
+    # An average arm keeps the automatic gas, so it shares configs (and solved tables) with the defaults
+    gas = max(0, 6 - dice + 2 * control) if control else None
+    return GameConfig(pitcher_dice=dice, gas_per_at_bat=gas, arsenal=arsenal(pitches))
+
+
 class Player:
+    __slots__ = ("name", "stats")
+
     def __init__(self, name, stats):
         self.name = name
         self.stats = stats
 
+    def config(self):
+        return hitter_config(self.stats)
+
+
 class Pitcher(Player):
+    __slots__ = ("pitches",)
+
     def __init__(self, name, stats, pitches):
         super().__init__(name, stats)
+        unknown = set(pitches) - set(PITCH_TYPES)
+        if unknown:
+            raise ValueError(f"{name}: unknown pitch type(s) {sorted(unknown)}")
         self.pitches = pitches
 
+    def config(self):
+        return pitcher_config(self.pitches, self.stats)
+
+
 class Hitter(Player):
+    __slots__ = ()
+
     def __init__(self, name, stats):
         super().__init__(name, stats)
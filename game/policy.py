@@ -0,0 +1,443 @@
+"""
+Equilibrium AI: solved mixed strategies for the pitch-commit / hitter-commit game.
+
+Every pitch is a zero-sum game scored for the hitter in wOBA weights
+(RUN_VALUES, outs worth 0). The pitcher sees the hand and announces a re-roll;
+then the pitcher commits a pitch type while the hitter — who has seen the
+hand and the re-roll — picks one of HITTER_ACTIONS, neither seeing the other's
+choice. The pitcher re-rolls toward the smallest game value and mixes pitches
+by the game's optimal strategy; the hitter mixes their actions by theirs.
+With hidden_reroll the hitter decides before the re-roll is shown, so the
+re-roll becomes part of the pitcher's mixed move.
+
+solve_policy works backwards from the full count to 0-0 (value iteration):
+each state's value is the expected game value over every hand, given the
+values of the states a pitch leads to. Two-strike fouls can revisit a count
+with another streak, so those states are iterated until they settle. Each
+matrix game is solved exactly by the simplex method.
+
+The solution is stored as flat arrays (PolicyTable): per (state, hand) the
+pitcher's moves and their cumulative probabilities, per (state, hand the
+hitter can see) the hitter's. A decision is one index computation, one
+uniform and a bisect. Solved tables are saved under policies/ keyed by the
+rules and the game/ source, so each rule set is solved once, and later runs
+memory-map them (game/tables.py) instead of reading them in.
+"""
+import time
+from array import array
+from bisect import bisect_right
+from itertools import combinations, combinations_with_replacement
+
+from game.bats import _contact_outcome_counts, _get_swing_dice, _pitch_outcome_distribution, _reroll_outcomes, power_outcomes
+from game.cache import config_cache
+from game.config import AI_FIELDS, ALL_FIELDS, DEFAULT_CONFIG
+from game.pitch_utils import PITCH_TYPES
+from game.store import GAME_DIR, code_version
+from game.tables import fields_digest, open_artifact, write_artifact
+
+POLICY_DIR = GAME_DIR.parent / "policies"
+
+# The hitter's wOBA weights (2024 FanGraphs) — what each result is worth in the game
+RUN_VALUES = {"BB": 0.690, "SINGLE": 0.888, "DOUBLE": 1.271, "TRIPLE": 1.616, "HR": 2.101}
+
+HITTER_ACTIONS = (('n', None, None),) + tuple(
+    ('s', commit_pitch, swing_type) for commit_pitch in PITCH_TYPES for swing_type in ('p', 'c'))
+STREAKS = ((None, 0), ("FB", 1), ("FB", 2), ("FB", 3), ("OFFSPEED", 1), ("OFFSPEED", 2), ("OFFSPEED", 3))
+_STREAK_INDEX = {streak: i for i, streak in enumerate(STREAKS)}
+_EPSILON = 1e-12
+
+
+def solve_matrix_game(payoff):
+    """
+    The value and optimal mixed strategies of a zero-sum game in which the row player
+    gets payoff[i][j] when they play i and the column player plays j.
+    Returns (value, row strategy, column strategy).
+
+    Solves the column player's LP — max sum(y) subject to (payoff + shift) y <= 1, y >= 0 —
+    by the simplex method with Bland's rule; the row strategy is its dual.
+    """
+    rows, cols = len(payoff), len(payoff[0])
+    shift = 1.0 - min(min(row) for row in payoff)
+    width = cols + rows
+    tableau = [[v + shift for v in row] + [float(k == i) for k in range(rows)] + [1.0]
+               for i, row in enumerate(payoff)]
+    objective = [-1.0] * cols + [0.0] * (rows + 1)
+    basis = list(range(cols, width))
+    while True:
+        enter = next((j for j in range(width) if objective[j] < -_EPSILON), None)
+        if enter is None:
+            break
+        leave, best = None, None
+        for i, row in enumerate(tableau):
+            if row[enter] > _EPSILON:
+                ratio = row[-1] / row[enter]
+                if best is None or ratio < best - _EPSILON or (ratio <= best + _EPSILON and basis[i] < basis[leave]):
+                    leave, best = i, ratio
+        pivot_row = tableau[leave]
+        lead = pivot_row[enter]
+        pivot_row[:] = [v / lead for v in pivot_row]
+        for row in tableau:
+            factor = row[enter]
+            if row is not pivot_row and factor:
+                row[:] = [v - factor * p for v, p in zip(row, pivot_row)]
+        factor = objective[enter]
+        objective[:] = [v - factor * p for v, p in zip(objective, pivot_row)]
+        basis[leave] = enter
+
+    scale = 1.0 / objective[-1]  # the shifted game's value: 1 / sum(y)
+    column = [0.0] * cols
+    for i, j in enumerate(basis):
+        if j < cols:
+            column[j] = tableau[i][-1] * scale
+    row_strategy = [max(0.0, objective[cols + i]) * scale for i in range(rows)]
+    return scale - shift, row_strategy, column
+
+
+def _reroll_options(hand, gas):
+    """
+    Every distinct re-roll of a sorted hand using at most `gas` dice.
+    Returns [(kept dice, number re-rolled, mask over the hand's positions)], keeping the hand first.
+    """
+    options, seen = [], set()
+    for num_reroll in range(min(gas, len(hand)) + 1):
+        for positions in combinations(range(len(hand)), num_reroll):
+            kept = tuple(d for i, d in enumerate(hand) if i not in positions)
+            if kept not in seen:
+                seen.add(kept)
+                options.append((kept, num_reroll, sum(1 << i for i in positions)))
+    return options
+
+
+def _state_index(balls, strikes, streak, gas, max_gas):
+    return ((balls * 3 + strikes) * len(STREAKS) + streak) * (max_gas + 1) + gas
+
+
+class _Game:
+    """One pitch's payoffs from one state: what each hitter action is worth against each pitch."""
+
+    def __init__(self, state, num_dice, config, values):
+        from game.exact import _next_streak, _streak_modifier
+        balls, strikes, streak, gas = state
+        self.config = config
+        self.values = values
+        streak_type, streak_count = STREAKS[streak]
+        self.max_gas = config.effective_gas()
+        self.balls, self.strikes, self.gas = balls, strikes, gas
+        # The pitcher's columns: the index in PITCH_TYPES of each pitch in the arsenal
+        self.columns = [p for p, pitch_type in enumerate(PITCH_TYPES) if pitch_type in config.pitch_types()]
+        self.pitch = []  # per pitch type: (difficulty modifier, streak index after it)
+        for pitch_type in PITCH_TYPES:
+            category = "FB" if pitch_type == "FB" else "OFFSPEED"
+            self.pitch.append((_streak_modifier(category, streak_type, streak_count),
+                               _STREAK_INDEX[_next_streak(category, streak_type, streak_count)]))
+        self.swings = []  # per swing action: (commit index, contact dice, EV of contact)
+        for _, commit_pitch, swing_type in HITTER_ACTIONS[1:]:
+            contact_dice, power_dice = _get_swing_dice(swing_type, 'none')
+            power = power_outcomes(power_dice, config.hitter_power_bonus, power_dice >= 3)
+            ev = sum(p * RUN_VALUES.get(result, 0.0) for result, p in power.probs.items())
+            self.swings.append((PITCH_TYPES.index(commit_pitch), contact_dice, ev))
+
+    def _value(self, balls, strikes, streak, gas):
+        if balls >= 4:
+            return RUN_VALUES["BB"]
+        if strikes >= 3:
+            return 0.0
+        return self.values[_state_index(balls, strikes, streak, gas, self.max_gas)]
+
+    def matrix(self, kept, num_reroll):
+        """The payoff matrix (hitter actions x the arsenal's pitches) after re-rolling num_reroll dice and keeping `kept`."""
+        config, balls, strikes = self.config, self.balls, self.strikes
+        gas = self.gas - num_reroll
+        total = 6 ** num_reroll
+        columns = []
+        distribution = _pitch_outcome_distribution(kept, num_reroll, config)
+        for p in self.columns:
+            pitch_type = PITCH_TYPES[p]
+            modifier, streak = self.pitch[p]
+            strike_value = self._value(balls, strikes + 1, streak, gas)
+            foul_value = self._value(balls, min(strikes + 1, 2), streak, gas)
+            ball_value = self._value(balls + 1, strikes, streak, gas)
+            take = 0.0
+            by_difficulty = {}
+            for (pitch_result, difficulty), ways in distribution[pitch_type].items():
+                take += ways * (strike_value if pitch_result == "STRIKE" else ball_value)
+                by_difficulty[difficulty] = by_difficulty.get(difficulty, 0) + ways
+            column = [take / total]
+            for commit, contact_dice, contact_ev in self.swings:
+                bonus = config.correct_commit_bonus if commit == p else config.wrong_commit_penalty
+                swings = 6 ** contact_dice
+                value = 0.0
+                for difficulty, ways in by_difficulty.items():
+                    contact, foul, miss = _contact_outcome_counts(contact_dice, bonus, difficulty + modifier)
+                    value += ways * (contact * contact_ev + foul * foul_value + miss * strike_value) / swings
+                column.append(value / total)
+            columns.append(column)
+        return [list(row) for row in zip(*columns)]
+
+
+def _solve_state(state, num_dice, config, values, hands, hidden, record=None):
+    """
+    The value of one state given the values of the states it leads to.
+    record(hand, pitcher moves, hitter strategies) is called per hand when given:
+    pitcher moves are [(mask, pitch index, probability)], hitter strategies {(kept, num_reroll): [p per action]}.
+    """
+    game = _Game(state, num_dice, config, values)
+    total_ways = 6 ** num_dice
+    games = {}
+    value = 0.0
+    for hand, ways in hands:
+        options = _reroll_options(hand, state[3])
+        if hidden:
+            matrix = [[] for _ in HITTER_ACTIONS]
+            for kept, num_reroll, _ in options:
+                for row, extra in zip(matrix, game.matrix(kept, num_reroll)):
+                    row.extend(extra)
+            hand_value, hitter, pitcher = solve_matrix_game(matrix)
+            if record:
+                moves = [(mask, p, pitcher[k * len(game.columns) + j])
+                         for k, (_, _, mask) in enumerate(options) for j, p in enumerate(game.columns)]
+                record(hand, moves, {(hand, 0): hitter})
+        else:
+            best = None
+            for kept, num_reroll, mask in options:
+                key = (kept, num_reroll)
+                solved = games.get(key)
+                if solved is None:
+                    solved = games[key] = solve_matrix_game(game.matrix(kept, num_reroll))
+                if best is None or solved[0] < best[0] - _EPSILON:
+                    best = (solved[0], mask, solved[2])
+            hand_value, mask, pitches = best
+            if record:
+                record(hand, [(mask, p, prob) for p, prob in zip(game.columns, pitches)],
+                       {(kept, num_reroll): games[(kept, num_reroll)][1] for kept, num_reroll, _ in options})
+        value += ways * hand_value
+    return value / total_ways
+
+
+def _counts_backwards():
+    """Every count, full counts first, so a state's successors are solved before it."""
+    return sorted(((b, s) for b in range(4) for s in range(3)), key=lambda count: -sum(count))
+
+
+def solve_policy(config=None, num_dice=None, tolerance=1e-10, verbose=False):
+    """Solves the pitch game for a config's rules (and num_dice, default config.pitcher_dice). Returns a PolicyTable."""
+    if config is None:
+        config = DEFAULT_CONFIG
+    if num_dice is None:
+        num_dice = config.pitcher_dice
+    max_gas = config.effective_gas()
+    hidden = config.hidden_reroll
+    hands = _reroll_outcomes(num_dice)
+    values = array("d", bytes(8 * 12 * len(STREAKS) * (max_gas + 1)))
+    start = time.perf_counter()
+
+    for balls, strikes in _counts_backwards():
+        for gas in range(max_gas + 1):
+            states = [(balls, strikes, streak, gas) for streak in range(len(STREAKS))]
+            while True:  # only two-strike fouls lead back into the same states
+                change = 0.0
+                for state in states:
+                    i = _state_index(*state, max_gas)
+                    new = _solve_state(state, num_dice, config, values, hands, hidden)
+                    change = max(change, abs(new - values[i]))
+                    values[i] = new
+                if strikes < 2 or change < tolerance:
+                    break
+        if verbose:
+            print(f"\r  Solving {num_dice}-die pitch games... {balls}-{strikes} done "
+                  f"({time.perf_counter() - start:.0f}s)", end="", flush=True)
+
+    # One more pass over the settled values to read off both players' strategies
+    builder = _TableBuilder(num_dice, max_gas, hidden)
+    for balls, strikes in _counts_backwards():
+        for gas in range(max_gas + 1):
+            for streak in range(len(STREAKS)):
+                state = (balls, strikes, streak, gas)
+                _solve_state(state, num_dice, config, values, hands, hidden, builder.recorder(state))
+    if verbose:
+        print(f"\r  Solved {num_dice}-die pitch games in {time.perf_counter() - start:.1f}s.            ")
+    return builder.build(values)
+
+
+def _hand_indices(num_dice):
+    return {hand: i for i, hand in enumerate(combinations_with_replacement(range(1, 7), num_dice))}
+
+
+def _info_indices(num_dice, max_gas, hidden):
+    """Index of everything the hitter can see: (kept dice, number re-rolled) — just the hand with hidden re-rolls."""
+    infos = {}
+    for num_reroll in range((0 if hidden else min(max_gas, num_dice)) + 1):
+        for kept in combinations_with_replacement(range(1, 7), num_dice - num_reroll):
+            infos[(kept, num_reroll)] = len(infos)
+    return infos
+
+
+class _TableBuilder:
+    def __init__(self, num_dice, max_gas, hidden):
+        self.num_dice, self.max_gas, self.hidden = num_dice, max_gas, hidden
+        self.hands = _hand_indices(num_dice)
+        self.infos = _info_indices(num_dice, max_gas, hidden)
+        self.pitcher = {}
+        self.hitter = {}
+
+    def recorder(self, state):
+        state_i = _state_index(*state, self.max_gas)
+
+        def record(hand, pitcher_moves, hitter_strategies):
+            self.pitcher[state_i * len(self.hands) + self.hands[hand]] = [
+                (mask * len(PITCH_TYPES) + p, prob) for mask, p, prob in pitcher_moves]
+            for info, strategy in hitter_strategies.items():
+                self.hitter[state_i * len(self.infos) + self.infos[info]] = list(enumerate(strategy))
+        return record
+
+    @staticmethod
+    def _pack(entries, slots, code_type):
+        """Flattens {slot: [(code, probability)]} into offsets, codes and cumulative probabilities."""
+        offsets, codes, cdf = array("I", [0]), array(code_type), array("f")
+        for slot in range(slots):
+            moves = [(code, p) for code, p in entries.get(slot, ()) if p > 1e-9]
+            total = sum(p for _, p in moves) or 1.0
+            running = 0.0
+            for k, (code, p) in enumerate(moves):
+                running += p / total
+                codes.append(code)
+                cdf.append(1.0 if k == len(moves) - 1 else running)
+            offsets.append(len(codes))
+        return offsets, codes, cdf
+
+    def build(self, values):
+        n_states = 12 * len(STREAKS) * (self.max_gas + 1)
+        pitcher = self._pack(self.pitcher, n_states * len(self.hands), "H")
+        hitter = self._pack(self.hitter, n_states * len(self.infos), "B")
+        return PolicyTable(self.num_dice, self.max_gas, self.hidden, values, *pitcher, *hitter)
+
+
+class PolicyTable:
+    """
+    Solved strategies for one rule set and pool size.
+    values[state]: the hitter's expected wOBA weight per PA from each state under equilibrium play.
+    """
+
+    _ARRAYS = ("values", "pitcher_offsets", "pitcher_moves", "pitcher_cdf",
+               "hitter_offsets", "hitter_moves", "hitter_cdf")
+
+    def __init__(self, num_dice, max_gas, hidden, values, pitcher_offsets, pitcher_moves, pitcher_cdf,
+                 hitter_offsets, hitter_moves, hitter_cdf):
+        self.num_dice, self.max_gas, self.hidden = num_dice, max_gas, hidden
+        self.values = values
+        self.pitcher_offsets, self.pitcher_moves, self.pitcher_cdf = pitcher_offsets, pitcher_moves, pitcher_cdf
+        self.hitter_offsets, self.hitter_moves, self.hitter_cdf = hitter_offsets, hitter_moves, hitter_cdf
+        self._hands = _hand_indices(num_dice)
+        self._infos = _info_indices(num_dice, max_gas, hidden)
+
+    def value(self, balls=0, strikes=0, streak_type=None, streak_count=0, gas=None):
+        """Expected wOBA weight per PA from a state (by default the start of an at-bat)."""
+        gas = self.max_gas if gas is None else gas
+        return self.values[self._state(balls, strikes, streak_type, streak_count, gas)]
+
+    def nbytes(self):
+        return sum(getattr(self, name).itemsize * len(getattr(self, name)) for name in self._ARRAYS)
+
+    def _state(self, balls, strikes, streak_type, streak_count, gas):
+        streak = _STREAK_INDEX[(streak_type, min(streak_count, 3))]
+        return _state_index(balls, strikes, streak, min(gas, self.max_gas), self.max_gas)
+
+    def _pitcher_slot(self, hand, balls, strikes, streak_type, streak_count, gas):
+        state = self._state(balls, strikes, streak_type, streak_count, gas)
+        slot = state * len(self._hands) + self._hands[hand]
+        return self.pitcher_offsets[slot], self.pitcher_offsets[slot + 1]
+
+    def _hitter_slot(self, kept, num_reroll, balls, strikes, streak_type, streak_count, gas):
+        state = self._state(balls, strikes, streak_type, streak_count, gas)
+        slot = state * len(self._infos) + self._infos[(tuple(sorted(kept)), num_reroll)]
+        return self.hitter_offsets[slot], self.hitter_offsets[slot + 1]
+
+    def _pitcher_move(self, dice, hand, code):
+        """(re_roll_input, chosen_pitch) for a move code, with the re-roll as positions in the unsorted dice."""
+        mask, pitch = divmod(code, len(PITCH_TYPES))
+        chosen = []
+        for position, value in enumerate(hand):
+            if mask >> position & 1:
+                chosen.append(next(i for i, d in enumerate(dice) if d == value and i not in chosen))
+        return " ".join(str(i + 1) for i in sorted(chosen)), PITCH_TYPES[pitch]
+
+    @staticmethod
+    def _draw(cdf, start, stop, rng):
+        if stop - start == 1:
+            return start
+        return bisect_right(cdf, rng.random(), start, stop - 1)
+
+    def pitcher_move(self, dice, balls, strikes, streak_type, streak_count, gas, rng):
+        """The pitcher's (re_roll_input, chosen_pitch): one lookup, and one uniform from rng if the move is mixed."""
+        hand = tuple(sorted(dice))
+        start, stop = self._pitcher_slot(hand, balls, strikes, streak_type, streak_count, gas)
+        return self._pitcher_move(dice, hand, self.pitcher_moves[self._draw(self.pitcher_cdf, start, stop, rng)])
+
+    def pitcher_distribution(self, dice, balls, strikes, streak_type, streak_count, gas):
+        """[(re_roll_input, chosen_pitch, probability)] — what pitcher_move can return."""
+        hand = tuple(sorted(dice))
+        start, stop = self._pitcher_slot(hand, balls, strikes, streak_type, streak_count, gas)
+        moves, previous = [], 0.0
+        for i in range(start, stop):
+            moves.append(self._pitcher_move(dice, hand, self.pitcher_moves[i]) + (self.pitcher_cdf[i] - previous,))
+            previous = self.pitcher_cdf[i]
+        return moves
+
+    def hitter_move(self, kept, num_reroll, balls, strikes, streak_type, streak_count, gas, rng):
+        """The hitter's (swing_decision, commit_pitch, swing_type) having seen the kept dice and the re-roll count."""
+        start, stop = self._hitter_slot(kept, num_reroll, balls, strikes, streak_type, streak_count, gas)
+        return HITTER_ACTIONS[self.hitter_moves[self._draw(self.hitter_cdf, start, stop, rng)]]
+
+    def hitter_distribution(self, kept, num_reroll, balls, strikes, streak_type, streak_count, gas):
+        """[(decision, probability)] — what hitter_move can return."""
+        start, stop = self._hitter_slot(kept, num_reroll, balls, strikes, streak_type, streak_count, gas)
+        decisions, previous = [], 0.0
+        for i in range(start, stop):
+            decisions.append((HITTER_ACTIONS[self.hitter_moves[i]], self.hitter_cdf[i] - previous))
+            previous = self.hitter_cdf[i]
+        return decisions
+
+    def save(self, path, digest):
+        """Writes the table as a game.tables artifact keyed by digest (the rules'). Replaces path atomically."""
+        write_artifact(path, "policy", digest, {name: getattr(self, name) for name in self._ARRAYS},
+                       {"num_dice": self.num_dice, "max_gas": self.max_gas, "hidden": self.hidden})
+
+    @classmethod
+    def load(cls, path, digest):
+        """The table saved at path, memory-mapped — or None if there's no valid one for digest."""
+        opened = open_artifact(path, "policy", digest)
+        if opened is None:
+            return None
+        meta, arrays = opened
+        return cls(meta["num_dice"], meta["max_gas"], meta["hidden"], *(arrays[name] for name in cls._ARRAYS))
+
+
+# Everything but which AI plays — the rules a table is solved for
+RULE_FIELDS = tuple(field for field in ALL_FIELDS if field not in AI_FIELDS)
+_POLICY_TABLES = config_cache("policy_tables", RULE_FIELDS, maxsize=8)
+
+
+def policy_path(config, num_dice):
+    """Where the table for a config's rules and a pool size is saved: keyed by the rules and the game/ source."""
+    return POLICY_DIR / f"{fields_digest(config, RULE_FIELDS)[:20]}-{num_dice}d-{code_version()[:12]}.policy"
+
+
+def policy_table(config=None, num_dice=None, verbose=False):
+    """
+    The PolicyTable for a config's rules and pool size: from memory, else mapped from
+    policies/, else solved now (a minute or so) and saved there.
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    if num_dice is None:
+        num_dice = config.pitcher_dice
+    key = (_POLICY_TABLES.project(config), num_dice)
+    table = _POLICY_TABLES.get(key)
+    if table is None:
+        path, digest = policy_path(config, num_dice), fields_digest(config, RULE_FIELDS)
+        table = PolicyTable.load(path, digest)
+        if table is None or table.num_dice != num_dice:
+            table = solve_policy(config, num_dice, verbose=verbose)
+            table.save(path, digest)
+        _POLICY_TABLES.put(key, table)
+    return table
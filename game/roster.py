@@ -0,0 +1,185 @@
+"""
+Rosters of rated players, and the hitter x pitcher matchup matrix.
+
+A roster file is a JSON array of player objects (data/players.json) or JSON
+Lines, one object per line. It is read a chunk at a time, so a file of a
+million players never has to be in memory as text or as dicts. Each player is
+    {"name": str, "stats": {"power", "contact", "control": 0-100}, "pitches": [...]}
+with missing ratings taken as average. Every player bats; players with
+pitches also pitch (game.player has the rating-to-lever mapping).
+
+The Roster keeps players as parallel arrays (struct of arrays): one list of
+names and one byte array per rating, with the arsenal as a bitmask over
+PITCH_TYPES (0 = doesn't pitch).
+
+Ratings map onto a handful of levers, so players sort into a few lever
+classes — identical ratings always share one — and the matchup matrix solves
+each (hitter class, pitcher class) pair once, however many players the league
+has.
+"""
+import json
+from array import array
+
+from game.config import matchup_config
+from game.parallel import solve_many
+from game.pitch_utils import PITCH_TYPES
+from game.player import AVERAGE_RATING, Hitter, Pitcher, hitter_config, pitcher_config
+
+RATINGS = ("power", "contact", "control")
+_PITCH_BIT = {pitch_type: 1 << i for i, pitch_type in enumerate(PITCH_TYPES)}
+# Between objects a roster file only has whitespace, commas and the outer brackets
+_SEPARATORS = frozenset(" \t\r\n,[]")
+
+
+def iter_player_records(path, chunk_size=1 << 16):
+    """Yields each player object of a JSON array or JSON Lines file, reading chunk_size characters at a time."""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+        while True:
+            while pos < len(buf) and buf[pos] in _SEPARATORS:
+                pos += 1
+            if pos == len(buf):
+                if eof:
+                    return
+                buf, pos = f.read(chunk_size), 0
+                eof = not buf
+                continue
+            try:
+                record, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            if not isinstance(record, dict):
+                raise ValueError(f"{path}: expected a player object, got {record!r}")
+            yield record
+
+
+class Roster:
+    """Players as parallel arrays, indexed 0..len-1 in file order."""
+
+    __slots__ = ("names", "power", "contact", "control", "arsenal")
+
+    def __init__(self):
+        self.names = []
+        self.power = array("B")
+        self.contact = array("B")
+        self.control = array("B")
+        self.arsenal = array("B")
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, record):
+        """Appends one player object. Returns its index."""
+        name = record["name"]
+        stats = record.get("stats", {})
+        for rating in RATINGS:
+            value = stats.get(rating, AVERAGE_RATING)
+            if not 0 <= value <= 100:
+                raise ValueError(f"{name}: {rating} rating {value} is outside 0-100")
+            getattr(self, rating).append(round(value))
+        mask = 0
+        for pitch_type in record.get("pitches", ()):
+            if pitch_type not in _PITCH_BIT:
+                raise ValueError(f"{name}: unknown pitch type {pitch_type!r}")
+            mask |= _PITCH_BIT[pitch_type]
+        self.arsenal.append(mask)
+        self.names.append(name)
+        return len(self.names) - 1
+
+    def stats(self, i):
+        return {rating: getattr(self, rating)[i] for rating in RATINGS}
+
+    def pitches(self, i):
+        mask = self.arsenal[i]
+        return [pitch_type for pitch_type in PITCH_TYPES if mask & _PITCH_BIT[pitch_type]]
+
+    def hitters(self):
+        """Indices of every player — everyone bats."""
+        return range(len(self.names))
+
+    def pitchers(self):
+        """Indices of the players with an arsenal."""
+        return [i for i, mask in enumerate(self.arsenal) if mask]
+
+    def hitter_config(self, i):
+        return hitter_config(self.stats(i))
+
+    def pitcher_config(self, i):
+        return pitcher_config(self.pitches(i), self.stats(i))
+
+    def player(self, i):
+        """Player i as a game.player object: a Pitcher if they pitch, else a Hitter."""
+        if self.arsenal[i]:
+            return Pitcher(self.names[i], self.stats(i), self.pitches(i))
+        return Hitter(self.names[i], self.stats(i))
+
+
+def load_roster(path, chunk_size=1 << 16):
+    roster = Roster()
+    for record in iter_player_records(path, chunk_size):
+        roster.add(record)
+    return roster
+
+
+def _classes(indices, config_of):
+    """
+    Groups players by their levers — players with the same ratings always share one.
+    Returns (class per player as an array, one config per class).
+    """
+    classes, configs, members = {}, [], array("I")
+    for i in indices:
+        config = config_of(i)
+        c = classes.get(config)
+        if c is None:
+            c = classes[config] = len(configs)
+            configs.append(config)
+        members.append(c)
+    return members, configs
+
+
+class MatchupMatrix:
+    """
+    The exact at-bat solution of every hitter against every pitcher, stored by lever class:
+    hitters[h] facing pitchers[p] is solutions[hitter_class[h] * n_pitcher_classes + pitcher_class[p]],
+    so the matrix takes memory for its rows, columns and distinct matchups, not every cell.
+    """
+
+    __slots__ = ("roster", "hitters", "pitchers", "hitter_class", "pitcher_class", "n_pitcher_classes", "solutions")
+
+    def __init__(self, roster, hitters, pitchers, hitter_class, pitcher_class, n_pitcher_classes, solutions):
+        self.roster = roster
+        self.hitters = hitters
+        self.pitchers = pitchers
+        self.hitter_class = hitter_class
+        self.pitcher_class = pitcher_class
+        self.n_pitcher_classes = n_pitcher_classes
+        self.solutions = solutions
+
+    def cell(self, h, p):
+        """Index into solutions for hitters[h] facing pitchers[p] (row and column, not roster indices)."""
+        return self.hitter_class[h] * self.n_pitcher_classes + self.pitcher_class[p]
+
+    def solution(self, h, p):
+        """solve_at_bat's result for hitters[h] facing pitchers[p]."""
+        return self.solutions[self.cell(h, p)]
+
+
+def matchup_matrix(roster, workers=None, hitters=None, pitchers=None):
+    """
+    Solves every hitter x pitcher matchup of a roster (all of each by default),
+    one solve per distinct pair of lever classes, spread over a process pool.
+    """
+    hitters = list(roster.hitters() if hitters is None else hitters)
+    pitchers = list(roster.pitchers() if pitchers is None else pitchers)
+    hitter_class, hitter_configs = _classes(hitters, roster.hitter_config)
+    pitcher_class, pitcher_configs = _classes(pitchers, roster.pitcher_config)
+    # Hitter and pitcher classes set disjoint levers, so every pair is a distinct matchup config
+    configs = [matchup_config(pitcher, hitter) for hitter in hitter_configs for pitcher in pitcher_configs]
+    return MatchupMatrix(roster, hitters, pitchers, hitter_class, pitcher_class, len(pitcher_configs),
+                         solve_many(configs, workers))
@@ -0,0 +1,200 @@
+"""
+The at-bat rules as a pure state machine — no printing, prompting or sleeping.
+
+An AtBat is the state between pitches. pitch() takes a state, the pitcher's
+hand and both players' decisions, rolls whatever the rules call for on rng
+(re-roll, contact and power dice, in that order) and returns the next state.
+Pass an `events` list to get a record of what happened, for a front end to
+show; headless callers leave it out and nothing is built.
+
+Events are tuples, kind first:
+    ("reroll", final_dice)              the re-rolled hand, sorted
+    ("reroll_invalid",)                 unreadable re-roll input — hand kept, gas still spent
+    ("streak", modifier, streak_type, streak_count, category)
+    ("pitch", chosen_pitch, chosen_dice, difficulty, pitch_result)
+    ("take", pitch_result)
+    ("commit", commit_pitch, chosen_pitch, contact_roll_bonus)
+    ("contact", contact_dice, power_dice, difficulty, contact_roll_bonus, roll, critical)
+    ("power", roll, power_value, result)
+    ("foul",) / ("miss",)
+    ("end", result)
+
+Nothing here touches shared state except the rng it is handed, so threads can
+play at-bats side by side as long as each has its own DiceSource.
+"""
+from typing import NamedTuple
+
+from game.ai import make_hitter_decision, make_pitcher_decision
+from game.bats import power_result
+from game.config import DEFAULT_CONFIG
+from game.dice import default_dice
+from game.pitch_utils import find_pitch_outcome
+
+IN_PLAY = ("SINGLE", "DOUBLE", "TRIPLE", "HR", "OUT", "WEAK_OUT")
+
+
+class AtBat(NamedTuple):
+    """The state of an at-bat between pitches. result is None until it's over."""
+    balls: int = 0
+    strikes: int = 0
+    streak_type: str = None
+    streak_count: int = 0
+    gas: int = 0  # spent on re-rolls, never refilled
+    pitches: int = 0
+    last_strike_swinging: bool = False
+    result: str = None
+
+
+def start(config=None):
+    """A fresh 0-0 at-bat with the config's gas."""
+    return AtBat(gas=(config or DEFAULT_CONFIG).effective_gas())
+
+
+def swing(contact_dice, power_dice, contact_roll_bonus, pitch_difficulty, power_bonus, rng, events=None):
+    """
+    Rolls a swing: contact dice against the difficulty, then power dice on contact.
+    Returns one of IN_PLAY, "FOUL" or "MISS".
+    """
+    contact_roll = rng.stream("contact").roll(contact_dice)
+    critical = contact_roll.count(6) >= 2
+    if events is not None:
+        events.append(("contact", contact_dice, power_dice, pitch_difficulty, contact_roll_bonus,
+                       contact_roll, critical))
+
+    successful_dice = sum(1 for die in contact_roll if die + contact_roll_bonus >= pitch_difficulty)
+    if successful_dice >= 2 or critical:
+        power_roll = rng.stream("power").roll(power_dice)
+        power_value = sum(power_roll) + power_bonus
+        result = power_result(power_value, full_range=power_dice >= 3)
+        if events is not None:
+            events.append(("power", power_roll, power_value, result))
+        return result
+    if successful_dice == 1:
+        if events is not None:
+            events.append(("foul",))
+        return "FOUL"
+    if events is not None:
+        events.append(("miss",))
+    return "MISS"
+
+
+def pitch(state, dice, re_roll_input, chosen_pitch, decision, config=None, rng=None, events=None):
+    """
+    Plays one pitch. dice: the pitcher's rolled hand (not modified).
+    decision: the hitter's (swing_decision, commit_pitch, swing_type).
+    Returns the next AtBat.
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    if rng is None:
+        rng = default_dice()
+    balls, strikes, streak_type, streak_count, gas, pitches, last_strike_swinging, _ = state
+    swing_decision, commit_pitch, swing_type = decision
+
+    # Execute the re-roll
+    if re_roll_input:
+        gas -= len(re_roll_input.split())
+        try:
+            indices = [int(i) - 1 for i in re_roll_input.split()]
+            new_dice = rng.stream("reroll").roll(len(indices))
+            dice = list(dice)
+            for i, new_die in zip(indices, new_dice):
+                if 0 <= i < len(dice): dice[i] = new_die
+            dice.sort()
+            if events is not None:
+                events.append(("reroll", dice))
+        except (ValueError, IndexError):
+            if events is not None:
+                events.append(("reroll_invalid",))
+
+    # Streak: a change-up after a run sets it up, a third of the same is predictable
+    category = "FB" if chosen_pitch == "FB" else "OFFSPEED"
+    modifier = 0
+    if streak_count >= 2:
+        modifier = min(streak_count - 1, 2) if category != streak_type else -1
+        if events is not None:
+            events.append(("streak", modifier, streak_type, streak_count, category))
+
+    chosen_dice, difficulty, pitch_result = find_pitch_outcome(dice, chosen_pitch, config)
+    difficulty += modifier
+    if events is not None:
+        events.append(("pitch", chosen_pitch, chosen_dice, difficulty, pitch_result))
+
+    if category == streak_type:
+        streak_count += 1
+    else:
+        streak_type, streak_count = category, 1
+
+    result = None
+    if swing_decision == 'n':
+        if pitch_result == "STRIKE":
+            strikes += 1
+            last_strike_swinging = False
+        else:
+            balls += 1
+        if events is not None:
+            events.append(("take", pitch_result))
+    else:
+        # Commit bonus: right pitch helps every contact die, wrong pitch hurts
+        contact_roll_bonus = 0
+        if commit_pitch:
+            if commit_pitch.upper() == chosen_pitch:
+                contact_roll_bonus = config.correct_commit_bonus
+            else:
+                contact_roll_bonus = config.wrong_commit_penalty
+            if events is not None:
+                events.append(("commit", commit_pitch, chosen_pitch, contact_roll_bonus))
+
+        contact_dice, power_dice = (2, 4) if swing_type == 'p' else (4, 2)
+        swing_result = swing(contact_dice, power_dice, contact_roll_bonus, difficulty,
+                             config.hitter_power_bonus, rng, events)
+        if swing_result in IN_PLAY:
+            result = swing_result
+        elif swing_result == "FOUL":
+            if strikes < 2: strikes += 1
+        else:
+            strikes += 1
+            last_strike_swinging = True
+
+    if result is None:
+        if strikes >= 3:
+            result = "K_S" if last_strike_swinging else "K_L"
+        if balls >= 4:
+            result = "BB"
+    if result is not None and events is not None:
+        events.append(("end", result))
+    return AtBat(balls, strikes, streak_type, streak_count, gas, pitches + 1, last_strike_swinging, result)
+
+
+def simulate_at_bat(pitcher_dice_pool, config=None, rng=None, log=None):
+    """
+    One CPU-vs-CPU at-bat, headless. Draws exactly what play_at_bat draws, in the
+    same order, so a seeded rng gives the same at-bat either way.
+    log: a game.eventlog.PitchLogWriter to record every pitch in.
+    Returns {"result", "pitches", "balls", "strikes", "pitch_types"} like play_at_bat.
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+    if rng is None:
+        rng = default_dice()
+    state = start(config)
+    pitch_types = {"FB": 0, "CB": 0, "CU": 0}
+    while state.result is None:
+        balls, strikes, streak_type, streak_count, gas = state[:5]
+        dice = rng.stream("pitch").roll(pitcher_dice_pool)
+        re_roll_input, chosen_pitch = make_pitcher_decision(
+            dice, balls, strikes, streak_type, streak_count, gas,
+            config=config, verbose=False, rng=rng.stream("pitcher_ai"))
+        decision = make_hitter_decision(
+            dice, "" if config.hidden_reroll else re_roll_input, balls, strikes,
+            streak_type, streak_count, gas, config=config, verbose=False, rng=rng.stream("hitter_ai"))
+        pitch_types[chosen_pitch] += 1
+        if log is None:
+            state = pitch(state, dice, re_roll_input, chosen_pitch, decision, config, rng)
+        else:
+            events = []
+            next_state = pitch(state, dice, re_roll_input, chosen_pitch, decision, config, rng, events)
+            log.record(state, dice, re_roll_input, chosen_pitch, decision, events, next_state)
+            state = next_state
+    return {"result": state.result, "pitches": state.pitches, "balls": state.balls,
+            "strikes": state.strikes, "pitch_types": pitch_types}
@@ -0,0 +1,236 @@
+"""
+Games and seasons: innings, outs and base runners on top of the at-bat engine.
+
+A plate appearance is one draw from its matchup's outcome distribution. Each
+(pitcher, hitter) matchup is solved once with the exact solver
+(game.exact.solve_at_bat on matchup_config), turned into an AliasTable and
+cached, so a plate appearance costs one uniform and a table lookup however
+many games are played. Identical matchups share a table. With pitch_level=True
+every plate appearance is instead played pitch by pitch through
+rules.simulate_at_bat, for pitch counts or pitch logs (a game.eventlog.PitchLogSet,
+one log per matchup config).
+
+Base running is kept simple and deterministic — bases are a 3-bit mask
+(1 = first, 2 = second, 4 = third):
+    BB           batter to first, runners advance only when forced
+    SINGLE       runners on second and third score, runner on first to second
+    DOUBLE       runners on second and third score, runner on first to third
+    TRIPLE / HR  everyone scores (the batter too on a HR)
+    OUT          hard contact — a runner on third scores unless it's the third out
+    WEAK_OUT, K  nobody moves
+"""
+from game.config import matchup_config
+from game.dice import AliasTable, DiceSource
+from game.exact import RESULTS, solve_at_bat
+from game.rules import simulate_at_bat
+
+INNINGS = 9
+_RESULT_INDEX = {result: i for i, result in enumerate(RESULTS)}
+_OUTS = {"K_S", "K_L", "OUT", "WEAK_OUT"}
+
+
+def _advance(result, bases):
+    """(bases after, runs scored before any third out) for one result from a base state."""
+    on_first, on_second, on_third = bases & 1, bases & 2, bases & 4
+    if result == "BB":
+        if not on_first:
+            return bases | 1, 0
+        if not on_second:
+            return bases | 3, 0
+        if not on_third:
+            return 7, 0
+        return 7, 1
+    if result == "SINGLE":
+        return 1 | (2 if on_first else 0), bool(on_second) + bool(on_third)
+    if result == "DOUBLE":
+        return 2 | (4 if on_first else 0), bool(on_second) + bool(on_third)
+    if result == "TRIPLE":
+        return 4, bin(bases).count("1")
+    if result == "HR":
+        return 0, bin(bases).count("1") + 1
+    if result == "OUT" and on_third:
+        return bases & 3, 1
+    return bases, 0
+
+
+# _TRANSITIONS[result index][bases] -> (bases after, runs, outs made)
+_TRANSITIONS = [
+    [_advance(result, bases) + (int(result in _OUTS),) for bases in range(8)]
+    for result in RESULTS
+]
+
+
+class Team:
+    """
+    A lineup of nine hitter configs (their HITTER_FIELDS are used) and a rotation of
+    starting pitcher configs (everything else), taking turns game by game.
+    """
+
+    def __init__(self, name, lineup, rotation):
+        self.name = name
+        self.lineup = list(lineup)
+        self.rotation = list(rotation)
+        self.starts = 0
+
+    def next_starter(self):
+        pitcher = self.rotation[self.starts % len(self.rotation)]
+        self.starts += 1
+        return pitcher
+
+
+class MatchupCache:
+    """AliasTables of plate-appearance outcomes, one per distinct matchup config."""
+
+    def __init__(self):
+        self._tables = {}
+
+    def __len__(self):
+        return len(self._tables)
+
+    def table(self, pitcher, hitter):
+        config = matchup_config(pitcher, hitter)
+        table = self._tables.get(config)
+        if table is None:
+            probs = solve_at_bat(config)["results"]
+            table = self._tables[config] = AliasTable(range(len(RESULTS)), [probs[r] for r in RESULTS])
+        return table
+
+
+class _Lineup:
+    """One team at bat against one opposing starter for a game: where it is in the order, and its matchups."""
+
+    def __init__(self, team, pitcher, cache, pitch_level):
+        self.team = team
+        self.slot = 0
+        if pitch_level:
+            self.configs = [matchup_config(pitcher, hitter) for hitter in team.lineup]
+        else:
+            self.tables = [cache.table(pitcher, hitter) for hitter in team.lineup]
+
+
+def _half_inning(batting, rng, stats, pitch_level, log, walk_off_target=None):
+    """
+    Plays one half inning. Returns the runs scored. stats: [count per RESULTS index, ..., runs, pitches].
+    walk_off_target: the home side stops as soon as it has scored this many.
+    """
+    outs = bases = runs = 0
+    lineup_size = len(batting.team.lineup)
+    while outs < 3:
+        slot = batting.slot
+        batting.slot = (slot + 1) % lineup_size
+        if pitch_level:
+            config = batting.configs[slot]
+            at_bat = simulate_at_bat(config.pitcher_dice, config, rng,
+                                     log.writer(config) if log is not None else None)
+            result = _RESULT_INDEX[at_bat["result"]]
+            stats[-1] += at_bat["pitches"]
+        else:
+            result = batting.tables[slot].index(rng)
+        stats[result] += 1
+        bases_after, scored, out = _TRANSITIONS[result][bases]
+        outs += out
+        if outs >= 3:
+            break
+        bases = bases_after
+        runs += scored
+        if walk_off_target is not None and runs >= walk_off_target:
+            break
+    stats[-2] += runs
+    return runs
+
+
+def play_game(away, home, cache=None, rng=None, pitch_level=False, log=None, stats=None):
+    """
+    One game: nine innings (more if tied), home team batting last, a walk-off ends it.
+    Each team's next starter pitches the whole game.
+    stats: {team name: counts list} to add each side's batting to.
+    log: with pitch_level, a game.eventlog.PitchLogSet to record every pitch in.
+    Returns (away runs, home runs, innings played).
+    """
+    cache = cache if cache is not None else MatchupCache()
+    rng = rng if rng is not None else DiceSource()
+    if stats is None:
+        stats = {}
+    away_stats = stats.setdefault(away.name, new_batting_line())
+    home_stats = stats.setdefault(home.name, new_batting_line())
+    away_bats = _Lineup(away, home.next_starter(), cache, pitch_level)
+    home_bats = _Lineup(home, away.next_starter(), cache, pitch_level)
+
+    away_runs = home_runs = 0
+    inning = 0
+    while inning < INNINGS or away_runs == home_runs:
+        inning += 1
+        away_runs += _half_inning(away_bats, rng, away_stats, pitch_level, log)
+        if inning >= INNINGS and home_runs > away_runs:
+            break  # home team leads — no need for the bottom half
+        target = away_runs - home_runs + 1 if inning >= INNINGS else None
+        home_runs += _half_inning(home_bats, rng, home_stats, pitch_level, log, target)
+    return away_runs, home_runs, inning
+
+
+def new_batting_line():
+    """A team's batting counts: one per RESULTS entry, then runs, then pitches (pitch-level games)."""
+    return [0] * (len(RESULTS) + 2)
+
+
+def round_robin(teams, games):
+    """
+    A schedule in which every team plays `games` games, by the circle method: each
+    round every team plays once, and pairings repeat every len(teams) - 1 rounds
+    with home and away swapped. With an odd number of teams one team sits out each
+    round, so rounds are added until everyone has played `games`; when both the
+    team count and `games` are odd the total is odd and one team plays one fewer.
+    Yields (away, home).
+    """
+    order = list(range(len(teams))) + ([None] if len(teams) % 2 else [])
+    n = len(order)
+    if n < 2:
+        return
+    played = [0] * len(teams)
+    round_no = idle = 0
+    while idle < n - 1:  # a full cycle without a game: nobody left who can be paired
+        turn = round_no % (n - 1)
+        rotated = [order[0]] + order[1:][turn:] + order[1:][:turn]
+        idle += 1
+        for i in range(n // 2):
+            a, b = rotated[i], rotated[n - 1 - i]
+            if a is None or b is None or played[a] >= games or played[b] >= games:
+                continue
+            played[a] += 1
+            played[b] += 1
+            idle = 0
+            yield (teams[a], teams[b]) if (round_no + i) % 2 else (teams[b], teams[a])
+        round_no += 1
+
+
+def play_season(teams, games=162, seed=None, pitch_level=False, log=None, cache=None):
+    """
+    Plays a round-robin season of `games` games per team (see round_robin for odd leagues).
+    Returns {"standings": {team: {"W", "L", "RS", "RA"}}, "batting": {team: batting line},
+             "games": games played, "matchups": distinct matchups solved}.
+    """
+    rng = DiceSource(seed)
+    cache = cache if cache is not None else MatchupCache()
+    standings = {team.name: {"W": 0, "L": 0, "RS": 0, "RA": 0} for team in teams}
+    batting = {team.name: new_batting_line() for team in teams}
+    played = 0
+    for away, home in round_robin(teams, games):
+        away_runs, home_runs, _ = play_game(away, home, cache, rng, pitch_level, log, batting)
+        winner, loser = (home, away) if home_runs > away_runs else (away, home)
+        standings[winner.name]["W"] += 1
+        standings[loser.name]["L"] += 1
+        for team, scored, allowed in ((away, away_runs, home_runs), (home, home_runs, away_runs)):
+            standings[team.name]["RS"] += scored
+            standings[team.name]["RA"] += allowed
+        played += 1
+    return {"standings": standings, "batting": batting, "games": played, "matchups": len(cache)}
+
+
+def slash_line(line):
+    """(BA, OBP, SLG, plate appearances) from a batting line."""
+    counts = dict(zip(RESULTS, line))
+    pa = sum(line[:len(RESULTS)])
+    hits = counts["SINGLE"] + counts["DOUBLE"] + counts["TRIPLE"] + counts["HR"]
+    ab = pa - counts["BB"]
+    tb = counts["SINGLE"] + 2 * counts["DOUBLE"] + 3 * counts["TRIPLE"] + 4 * counts["HR"]
+    return (hits / ab if ab else 0.0, (hits + counts["BB"]) / pa if pa else 0.0, tb / ab if ab else 0.0, pa)
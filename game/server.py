@@ -0,0 +1,404 @@
+"""
+Multi-session Diceball server: many concurrent at-bats over a TCP line protocol.
+
+One asyncio event loop hosts every session. Each connection is a Client with a
+reader task. The reader answers lobby commands itself and hands a seated
+player's moves to the session waiting on them. Each session is a coroutine
+that plays rules.pitch one pitch at a time. A seat is either a Client or the
+CPU. CPU decisions (and B.A.T.S. lookups) run in a shared thread pool, so a
+cold table build or an equilibrium solve never stalls the loop. Nothing
+sleeps: pacing is up to the client (or `pace` for CPU-only sessions).
+
+Protocol — one command or message per line, fields separated by spaces.
+
+Client to server:
+    NEW <pitcher> <hitter> [dice]   start a session; each side is human or cpu. The
+                                    creator takes the first human seat (or watches cpu vs cpu)
+    JOIN <session>                  take the open seat of a waiting session
+    LIST                            sessions waiting for a player
+    THROW <fb|cb|cu> [die ...]      pitcher: secret pitch (from the arsenal), plus the dice (1-based) to re-roll
+    TAKE                            hitter: take the pitch
+    SWING <fb|cb|cu> <p|c>          hitter: commit to a pitch with a power or contact swing
+    BATS <fb|cb|cu> <p|c>           hitter: B.A.T.S. for that commit and swing before deciding
+    QUIT
+
+Server to client:
+    HELLO diceball <version>
+    SESSION <id> <pitcher|hitter|watching>
+    OPEN <id> <open seat> <dice>    one per LIST entry, then END_LIST
+    START <id> <pitcher kind> <hitter kind> <dice>
+    PITCH <n> COUNT <b>-<s> GAS <gas> STREAK <type|-> <count>
+    DICE <d> ...
+    TURN <pitcher|hitter>           sent to the seat whose move it is
+    REROLL <die ...|none|hidden>    the pitcher's announced re-roll, before the hitter's turn
+    BATS <pitch-diff> <pitch%> <contact%>, then END_BATS   for the current pitch; not sent once the
+                                    hitter has moved
+    REVEAL <pitch> <take|swing> [<commit> <p|c>]
+    EVENT <kind> <field> ...        each game.rules event, lists joined by commas, None as -
+    RESULT <result> <pitches>
+    ABANDONED <reason>              the session ended early (a player left or ran out of time)
+    ERROR <message>                 the last command was refused — nothing changed
+    BYE
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
+
+from game.ai import make_hitter_decision, make_pitcher_decision
+from game.bats import calculate_bats_probabilities
+from game.config import DEFAULT_CONFIG
+from game.dice import DiceSource, derive_seed
+from game.pitch_utils import PITCH_TYPES
+from game.rules import pitch, start
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 7707
+SEAT_KINDS = ("human", "cpu")
+POOL_SIZES = ("4", "5")
+_COMMITS = tuple(pitch_type.lower() for pitch_type in PITCH_TYPES)
+_MAX_LINE = 1024
+_BACKLOG = 1024  # pending connections — a burst of clients must not overflow the accept queue
+_DICE_BUFFER = 256  # random bytes per refill — small, so hundreds of sessions stay cheap
+
+
+class Disconnected(Exception):
+    """A seated player left (or timed out) in the middle of a session."""
+
+
+def _field(value):
+    if value is None:
+        return "-"
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(v) for v in value) or "-"
+    return str(value)
+
+
+def format_event(event):
+    """A game.rules event tuple as an EVENT line."""
+    return "EVENT " + " ".join(_field(value) for value in event)
+
+
+class Client:
+    """One connection: a line writer, and a mailbox for moves while it holds a seat."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.session = None
+        self.moves = asyncio.Queue()
+        self.expecting = None  # the seat whose move the session is waiting on, or None
+        self.closed = False
+
+    def send(self, *lines):
+        if not self.closed:
+            self.writer.write("".join(f"{line}\n" for line in lines).encode())
+
+    async def flush(self):
+        if not self.closed:
+            try:
+                await self.writer.drain()
+            except ConnectionError:
+                self.closed = True
+
+
+class Session:
+    """One at-bat between two seats. pitcher / hitter: a Client, or None for the CPU."""
+
+    def __init__(self, server, session_id, pitcher_kind, hitter_kind, num_dice):
+        self.server = server
+        self.id = session_id
+        self.kinds = {"pitcher": pitcher_kind, "hitter": hitter_kind}
+        self.num_dice = num_dice
+        # Gas follows the pool, as in the simulator
+        self.config = replace(server.config, pitcher_dice=num_dice)
+        seed = server.seed
+        self.rng = DiceSource(derive_seed(seed, "session", session_id) if seed is not None else None, _DICE_BUFFER)
+        self.seats = {"pitcher": None, "hitter": None}
+        self.watcher = None
+        self.ready = asyncio.Event()
+        self.task = None
+        self.bats_tasks = set()  # B.A.T.S. lookups in flight — the loop only holds weak references
+
+    def open_seats(self):
+        return [seat for seat, kind in self.kinds.items() if kind == "human" and self.seats[seat] is None]
+
+    def clients(self):
+        """Every connection following this session: its players, or whoever watches a cpu vs cpu session."""
+        return [client for client in (self.seats["pitcher"], self.seats["hitter"], self.watcher) if client is not None]
+
+    def seat(self, client, seat):
+        self.seats[seat] = client
+        client.session = self
+        if not self.open_seats():
+            self.ready.set()
+
+    def broadcast(self, *lines):
+        for client in self.clients():
+            client.send(*lines)
+
+    async def flush(self):
+        await asyncio.gather(*(client.flush() for client in self.clients()))
+
+    async def _human_move(self, seat):
+        client = self.seats[seat]
+        client.expecting = seat
+        client.send(f"TURN {seat}")
+        await client.flush()
+        while True:
+            try:
+                command = await asyncio.wait_for(client.moves.get(), self.server.move_timeout)
+            except asyncio.TimeoutError:
+                raise Disconnected(f"the {seat} ran out of time") from None
+            if command is None:
+                raise Disconnected(f"the {seat} left")
+            move = self._parse_move(seat, command, client)
+            if move is not None:
+                client.expecting = None
+                # A lookup still running was for this pitch — its reply must not land in the next one
+                await self._drop_bats()
+                return move
+
+    def _parse_move(self, seat, words, client):
+        """A valid move from a command, or None after telling the client what was wrong."""
+        verb, args = words[0], words[1:]
+        if seat == "pitcher":
+            if verb != "THROW" or not args or args[0].lower() not in _COMMITS:
+                client.send("ERROR pitcher moves are: THROW <fb|cb|cu> [die ...]")
+                return None
+            if args[0].upper() not in self.config.pitch_types():
+                client.send(f"ERROR this pitcher throws {self.config.arsenal}")
+                return None
+            positions = [int(d) if d.isdigit() else 0 for d in args[1:]]
+            gas = self.state.gas
+            if len(positions) > gas:
+                client.send(f"ERROR not enough gas: {gas} left")
+                return None
+            if not all(1 <= d <= self.num_dice for d in positions) or len(set(positions)) < len(positions):
+                client.send(f"ERROR re-roll dice are distinct positions 1-{self.num_dice}")
+                return None
+            return " ".join(map(str, sorted(positions))), args[0].upper()
+        if verb == "TAKE" and not args:
+            return 'n', None, None
+        if verb == "SWING" and len(args) == 2 and args[0].lower() in _COMMITS and args[1].lower() in ('p', 'c'):
+            return 's', args[0].lower(), args[1].lower()
+        if verb == "BATS" and len(args) == 2 and args[0].lower() in _COMMITS and args[1].lower() in ('p', 'c'):
+            # The lookup runs later: it gets this pitch's dice and state, whatever the session has moved on to
+            task = asyncio.create_task(self._send_bats(
+                client, self.state, tuple(self.dice), self.hitter_reroll_info, args[0].lower(), args[1].lower()))
+            self.bats_tasks.add(task)
+            task.add_done_callback(self.bats_tasks.discard)
+            return None
+        client.send("ERROR hitter moves are: TAKE, SWING <fb|cb|cu> <p|c> or BATS <fb|cb|cu> <p|c>")
+        return None
+
+    async def _send_bats(self, client, state, dice, hitter_reroll_info, commit_to, swing_type):
+        balls, strikes, streak_type, streak_count, gas = state[:5]
+        rows = await self.server.offload(
+            calculate_bats_probabilities, list(dice), hitter_reroll_info, swing_type, 0, 0, 0, 0,
+            streak_type, streak_count, 's', commit_to, gas, config=self.config)
+        client.send(*(f"BATS {row['pitch_id']} {row['pitch_prob']:.4f} {row['contact_prob']:.4f}" for row in rows),
+                    "END_BATS")
+        await client.flush()
+
+    async def _drop_bats(self):
+        """Cancels every B.A.T.S. lookup still running and waits for them to stop."""
+        for task in self.bats_tasks:
+            task.cancel()
+        await asyncio.gather(*self.bats_tasks, return_exceptions=True)
+
+    async def _pitcher_move(self):
+        if self.seats["pitcher"] is not None:
+            return await self._human_move("pitcher")
+        balls, strikes, streak_type, streak_count, gas = self.state[:5]
+        return await self.server.offload(
+            make_pitcher_decision, self.dice, balls, strikes, streak_type, streak_count, gas,
+            config=self.config, verbose=False, rng=self.rng.stream("pitcher_ai"))
+
+    async def _hitter_move(self):
+        if self.seats["hitter"] is not None:
+            return await self._human_move("hitter")
+        balls, strikes, streak_type, streak_count, gas = self.state[:5]
+        return await self.server.offload(
+            make_hitter_decision, self.dice, self.hitter_reroll_info, balls, strikes, streak_type, streak_count,
+            gas, config=self.config, verbose=False, rng=self.rng.stream("hitter_ai"))
+
+    async def run(self):
+        """Waits for the seats, then plays the at-bat. Always releases its clients."""
+        try:
+            await self.ready.wait()
+            await self._play()
+        except Disconnected as e:
+            self.broadcast(f"ABANDONED {e}")
+        finally:
+            # Nothing may follow RESULT / ABANDONED — drop any lookup still running
+            await self._drop_bats()
+            await self.flush()
+            self.server.end_session(self)
+
+    async def _play(self):
+        self.state = state = start(self.config)
+        self.broadcast(f"START {self.id} {self.kinds['pitcher']} {self.kinds['hitter']} {self.num_dice}")
+        cpu_only = not any(self.seats.values())
+        while state.result is None:
+            balls, strikes, streak_type, streak_count, gas = state[:5]
+            self.broadcast(f"PITCH {state.pitches + 1} COUNT {balls}-{strikes} GAS {gas} "
+                           f"STREAK {_field(streak_type)} {streak_count}")
+            self.dice = self.rng.stream("pitch").roll(self.num_dice)
+            self.hitter_reroll_info = ""
+            self.broadcast("DICE " + " ".join(map(str, self.dice)))
+            await self.flush()
+
+            re_roll_input, chosen_pitch = await self._pitcher_move()
+            if self.config.hidden_reroll:
+                announced = "hidden"
+            else:
+                self.hitter_reroll_info = re_roll_input
+                announced = re_roll_input or "none"
+            self.broadcast(f"REROLL {announced}")
+            decision = await self._hitter_move()
+
+            swing_decision, commit_pitch, swing_type = decision
+            swing_text = f"swing {commit_pitch.upper()} {swing_type}" if swing_decision == 's' else "take"
+            events = []
+            self.state = state = pitch(state, self.dice, re_roll_input, chosen_pitch, decision,
+                                       self.config, self.rng, events)
+            self.broadcast(f"REVEAL {chosen_pitch} {swing_text}", *map(format_event, events))
+            await self.flush()
+            if cpu_only and self.server.pace:
+                await asyncio.sleep(self.server.pace)
+        self.broadcast(f"RESULT {state.result} {state.pitches}")
+        self.server.played += 1
+
+
+class GameServer:
+    """
+    Hosts sessions on one event loop. config: the rules every session plays (its pool
+    size comes from NEW). workers: threads for CPU decisions. seed: makes every session's
+    dice reproducible by session id. pace: seconds between pitches of a CPU-only session.
+    move_timeout: seconds a human has for each move (None = no limit).
+    """
+
+    def __init__(self, config=None, workers=None, seed=None, pace=0.0, move_timeout=None):
+        self.config = config or DEFAULT_CONFIG
+        self.seed = seed
+        self.pace = pace
+        self.move_timeout = move_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1),
+                                           thread_name_prefix="diceball-ai")
+        self.sessions = {}
+        self.clients = set()
+        self._next_id = 1
+        self.played = 0  # at-bats played to a result
+
+    async def offload(self, fn, *args, **kwargs):
+        """Runs fn in the AI thread pool and awaits its result."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    def new_session(self, pitcher_kind, hitter_kind, num_dice):
+        session = Session(self, self._next_id, pitcher_kind, hitter_kind, num_dice)
+        self._next_id += 1
+        self.sessions[session.id] = session
+        return session
+
+    def end_session(self, session):
+        self.sessions.pop(session.id, None)
+        for client in session.clients():
+            client.session = None
+            client.expecting = None
+
+    def _new(self, client, args):
+        if len(args) not in (2, 3) or any(kind not in SEAT_KINDS for kind in args[:2]) or \
+                (len(args) == 3 and args[2] not in POOL_SIZES):
+            client.send("ERROR usage: NEW <human|cpu> <human|cpu> [4|5]")
+            return
+        session = self.new_session(args[0], args[1], int(args[2]) if len(args) == 3 else self.config.pitcher_dice)
+        open_seats = session.open_seats()
+        if not open_seats:
+            session.watcher = client
+            client.session = session
+            session.ready.set()
+            client.send(f"SESSION {session.id} watching")
+        else:
+            session.seat(client, open_seats[0])
+            client.send(f"SESSION {session.id} {open_seats[0]}")
+        session.task = asyncio.create_task(session.run())
+
+    def _join(self, client, args):
+        session = self.sessions.get(int(args[0])) if len(args) == 1 and args[0].isdigit() else None
+        if session is None or not session.open_seats():
+            client.send("ERROR no open seat in that session")
+            return
+        seat = session.open_seats()[0]
+        session.seat(client, seat)
+        client.send(f"SESSION {session.id} {seat}")
+
+    def _list(self, client):
+        for session in list(self.sessions.values()):
+            for seat in session.open_seats():
+                client.send(f"OPEN {session.id} {seat} {session.num_dice}")
+        client.send("END_LIST")
+
+    async def handle(self, reader, writer):
+        """One connection, from HELLO to BYE."""
+        client = Client(reader, writer)
+        self.clients.add(client)
+        client.send(f"HELLO diceball {PROTOCOL_VERSION}")
+        try:
+            while True:
+                await client.flush()
+                try:
+                    raw = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not raw:
+                    break
+                words = raw.decode(errors="replace").split()
+                if not words:
+                    continue
+                verb = words[0] = words[0].upper()
+                if verb == "QUIT":
+                    client.send("BYE")
+                    break
+                if client.expecting is not None:
+                    client.moves.put_nowait(words)
+                elif verb in ("THROW", "TAKE", "SWING", "BATS"):
+                    client.send("ERROR not your turn")
+                elif client.session is not None:
+                    client.send(f"ERROR already in session {client.session.id}")
+                elif verb == "NEW":
+                    self._new(client, words[1:])
+                elif verb == "JOIN":
+                    self._join(client, words[1:])
+                elif verb == "LIST":
+                    self._list(client)
+                else:
+                    client.send("ERROR unknown command")
+        finally:
+            await client.flush()
+            client.closed = True
+            self.clients.discard(client)
+            self._leave(client)
+            writer.close()
+
+    def _leave(self, client):
+        session = client.session
+        if session is None:
+            return
+        if session.watcher is client or not session.ready.is_set():
+            # Nobody left to play it (or to watch it): drop it, and run() cleans up
+            session.task.cancel()
+        else:
+            client.moves.put_nowait(None)
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+        """Serves until cancelled. ready: called with the bound (host, port) once listening."""
+        server = await asyncio.start_server(self.handle, host, port, limit=_MAX_LINE, backlog=_BACKLOG)
+        try:
+            if ready is not None:
+                ready(server.sockets[0].getsockname()[:2])
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
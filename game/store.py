@@ -0,0 +1,80 @@
+"""
+On-disk store of simulated CPU-vs-CPU at-bat counts.
+
+Rows are keyed by the config's digest and a hash of the game/ source, so a
+change to the rules or the AI starts fresh instead of mixing old samples in.
+Each row holds cumulative outcome and pitch-mix counts; new runs add to them,
+so a config that has already been simulated only needs topping up.
+"""
+import hashlib
+import json
+import sqlite3
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+
+RESULTS = ("BB", "K_S", "K_L", "SINGLE", "DOUBLE", "TRIPLE", "HR", "OUT", "WEAK_OUT")
+PITCH_TYPES = ("FB", "CB", "CU")
+
+GAME_DIR = Path(__file__).resolve().parent
+DEFAULT_PATH = GAME_DIR.parent / "results.sqlite3"
+
+_COUNT_COLUMNS = RESULTS + PITCH_TYPES
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """A hash of every module in game/ — stored counts are only reused by the same code."""
+    digest = hashlib.sha256()
+    for path in sorted(GAME_DIR.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class ResultStore:
+    """Cumulative at-bat counts per (config digest, code version) in a SQLite file."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(self.path)
+        columns = ", ".join(f'"{c}" INTEGER NOT NULL DEFAULT 0' for c in _COUNT_COLUMNS)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS at_bats ("
+            f"config_digest TEXT NOT NULL, code_version TEXT NOT NULL, config TEXT NOT NULL, "
+            f"at_bats INTEGER NOT NULL DEFAULT 0, {columns}, "
+            f"PRIMARY KEY (config_digest, code_version))"
+        )
+        self._conn.commit()
+
+    def load(self, config):
+        """Returns (counts, pitch_counts, at_bats) stored for a config — zeros if it's new."""
+        quoted = ", ".join(f'"{c}"' for c in _COUNT_COLUMNS)
+        row = self._conn.execute(
+            f"SELECT at_bats, {quoted} FROM at_bats WHERE config_digest = ? AND code_version = ?",
+            (config.digest(), code_version()),
+        ).fetchone()
+        if row is None:
+            row = (0,) * (1 + len(_COUNT_COLUMNS))
+        at_bats, values = row[0], row[1:]
+        counts = dict(zip(RESULTS, values[:len(RESULTS)]))
+        pitch_counts = dict(zip(PITCH_TYPES, values[len(RESULTS):]))
+        return counts, pitch_counts, at_bats
+
+    def add(self, config, counts, pitch_counts, at_bats):
+        """Adds a run's counts to the config's totals. Returns the new (counts, pitch_counts, at_bats)."""
+        values = [counts.get(c, 0) for c in RESULTS] + [pitch_counts.get(c, 0) for c in PITCH_TYPES]
+        quoted = ", ".join(f'"{c}"' for c in _COUNT_COLUMNS)
+        updates = ", ".join(f'"{c}" = "{c}" + excluded."{c}"' for c in _COUNT_COLUMNS)
+        self._conn.execute(
+            f"INSERT INTO at_bats (config_digest, code_version, config, at_bats, {quoted}) "
+            f"VALUES (?, ?, ?, ?, {', '.join('?' * len(_COUNT_COLUMNS))}) "
+            f"ON CONFLICT (config_digest, code_version) DO UPDATE SET "
+            f"at_bats = at_bats + excluded.at_bats, {updates}",
+            [config.digest(), code_version(), json.dumps(asdict(config), sort_keys=True), at_bats] + values,
+        )
+        self._conn.commit()
+        return self.load(config)
+
+    def close(self):
+        self._conn.close()
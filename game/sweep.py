@@ -0,0 +1,167 @@
+"""
+Resumable lever sweeps: CPU-vs-CPU at-bats for every combination of lever values.
+
+A sweep crosses a value list per GameConfig field into configs and simulates
+each config whole in one worker of game.parallel's process pool. A config's
+dice come from derive_seed(sweep seed, config digest), so its counts don't
+depend on the order configs finish in, on the worker count or on restarts.
+
+Results stream to an append-only JSON Lines file as configs finish. The first
+line is a header: the sweep seed, the at-bats per config and the game/ code
+version. Every other line is one config's levers and counts. The file is its
+own checkpoint. Running the same sweep again skips every config already in it
+and appends the rest. A line cut short by a crash is ignored when reading and
+dropped before appending.
+"""
+import json
+import os
+import random
+from dataclasses import asdict, fields, replace
+from itertools import product
+from pathlib import Path
+
+from game.config import AI_MODES, GameConfig
+from game.dice import derive_seed
+from game.parallel import imap_unordered, simulate_shard
+from game.pitch_utils import arsenal
+from game.store import PITCH_TYPES, RESULTS, code_version
+
+FORMAT_VERSION = 1
+
+_FIELD_TYPES = {field.name: field.type for field in fields(GameConfig)}
+_CHOICES = {"difficulty_method": ("max", "mid", "min"), "pitcher_ai": AI_MODES, "hitter_ai": AI_MODES}
+
+
+def parse_value(field, text):
+    """One lever value from text, typed like the GameConfig field. Raises ValueError."""
+    if field == "gas_per_at_bat" and text.lower() == "auto":
+        return None
+    if field == "arsenal":
+        return arsenal(text.upper().split("/"))
+    kind = _FIELD_TYPES[field]
+    if kind is bool:
+        if text.lower() in ("true", "yes", "1"):
+            return True
+        if text.lower() in ("false", "no", "0"):
+            return False
+        raise ValueError(f"{field} must be True or False, not {text!r}")
+    if kind is int:
+        return int(text)
+    if text not in _CHOICES[field]:
+        raise ValueError(f"{field} must be one of {', '.join(_CHOICES[field])}, not {text!r}")
+    return text
+
+
+def parse_grid(specs):
+    """
+    A sweep grid from "field=v1,v2,..." specs; an integer field also takes "lo..hi"
+    (inclusive). Returns {field: [values]} in spec order. Raises ValueError.
+    """
+    grid = {}
+    for spec in specs:
+        field, sep, values = spec.partition("=")
+        field = field.strip()
+        if not sep or field not in _FIELD_TYPES:
+            raise ValueError(f"expected <field>=<values> with a GameConfig field, not {spec!r}")
+        parsed = []
+        for text in values.split(","):
+            text = text.strip()
+            lo, dots, hi = text.partition("..")
+            if dots and _FIELD_TYPES[field] is int:
+                parsed.extend(range(int(lo), int(hi) + 1))
+            else:
+                parsed.append(parse_value(field, text))
+        if not parsed:
+            raise ValueError(f"no values for {field}")
+        grid[field] = list(dict.fromkeys(parsed))
+    return grid
+
+
+def sweep_configs(base, grid):
+    """Every combination of the grid's values applied to base, each distinct config once."""
+    keys = list(grid)
+    configs = (replace(base, **dict(zip(keys, values))) for values in product(*grid.values()))
+    return list({config.digest(): config for config in configs}.values())
+
+
+def _sweep_config(config, n, seed):
+    """Plays one config's n at-bats (in a worker). Returns its result record."""
+    results, pitch_types, pitches = simulate_shard(config, [config.pitcher_dice], 0, n, seed)
+    return {
+        "digest": config.digest(),
+        "config": asdict(config),
+        "at_bats": n,
+        "results": {r: results.get(r, 0) for r in RESULTS},
+        "pitch_types": {pt: pitch_types.get(pt, 0) for pt in PITCH_TYPES},
+        "pitches": sum(count * per_pa for per_pa, count in pitches.items()),
+    }
+
+
+def read_sweep(path):
+    """
+    The header and records of a sweep file: (header or None, {digest: record}).
+    Only reads: a trailing line without its newline (cut short by a crash, or still
+    being written by a running sweep) is ignored, not removed.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None, {}
+    data = path.read_bytes()
+    lines = data[:data.rfind(b"\n") + 1].splitlines()
+    if not lines:
+        return None, {}
+    header = json.loads(lines[0])
+    records = {}
+    for line in lines[1:]:
+        record = json.loads(line)
+        records[record["digest"]] = record
+    return header, records
+
+
+def _drop_torn_line(path):
+    """Truncates a trailing line cut short by a crash, so appending carries on after the last whole record."""
+    data = path.read_bytes()
+    complete = data.rfind(b"\n") + 1
+    if complete < len(data):
+        with open(path, "r+b") as f:
+            f.truncate(complete)
+
+
+def run_sweep(configs, n, path, workers=None, seed=None, progress=None):
+    """
+    n at-bats for every config, appended to the sweep file at path as each finishes.
+    Resumes a file started with the same n and code; seed defaults to the file's
+    (or a fresh one for a new file). progress: called with (done, total) after
+    every config. Returns the records of every config, in the order of configs.
+    Raises ValueError if the file belongs to a different sweep.
+    """
+    path = Path(path)
+    header, records = read_sweep(path)
+    if header is None:
+        header = {"format": FORMAT_VERSION, "seed": random.getrandbits(64) if seed is None else seed,
+                  "at_bats": n, "code_version": code_version()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(header) + "\n")
+    elif header.get("format") != FORMAT_VERSION or header["code_version"] != code_version():
+        raise ValueError(f"{path} was written by a different version of the game — start a new sweep file")
+    elif header["at_bats"] != n or seed not in (None, header["seed"]):
+        raise ValueError(f"{path} sweeps {header['at_bats']:,} at-bats per config with seed {header['seed']} "
+                         f"— resume it with the same settings or start a new file")
+    seed = header["seed"]
+
+    pending = [config for config in configs if config.digest() not in records]
+    total, done = len(configs), len(configs) - len(pending)
+    if progress is not None:
+        progress(done, total)
+    jobs = [(config, n, derive_seed(seed, config.digest())) for config in pending]
+    _drop_torn_line(path)
+    with open(path, "a") as out:
+        for result in imap_unordered(_sweep_config, jobs, workers):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            os.fsync(out.fileno())  # each finished config is checkpointed before the next
+            records[result["digest"]] = result
+            done += 1
+            if progress is not None:
+                progress(done, total)
+    return [records[config.digest()] for config in configs]
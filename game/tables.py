@@ -0,0 +1,136 @@
+"""
+Precomputed table artifacts: flat arrays saved once and memory-mapped at startup.
+
+An artifact is one file:
+
+    MAGIC (8 bytes)  header length (4 bytes, little-endian)  JSON header
+    then each array's raw bytes, padded so every array starts on an 8-byte boundary
+
+The header names the artifact's kind, the digest of the config fields the
+table depends on, the game/ code version, the byte order, free-form metadata
+and each array's (name, typecode, length, offset). open_artifact checks all of
+them and returns None for anything that doesn't match, so a stale or foreign
+file is simply rebuilt. The arrays come back as read-only memoryviews over one
+mmap: nothing is parsed or copied, loading is near-instant whatever the size,
+and every process that maps the file shares the same physical pages.
+
+Tables save themselves under tables/ in the project directory; tables.py
+builds them ahead of time. File names end in -<code version>, so an edit under
+game/ gives every table a new name: writing an artifact removes the files of the
+same kind and key left by other code versions, and remove_stale() clears a
+whole directory.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from game.store import GAME_DIR, code_version
+
+TABLE_DIR = GAME_DIR.parent / "tables"
+
+FORMAT_VERSION = 1
+MAGIC = b"DICETBL" + bytes([FORMAT_VERSION])
+_LENGTH = struct.Struct("<I")
+_ALIGN = 8
+
+
+def fields_digest(config, fields):
+    """A stable hash of just the given config fields — what a table's contents depend on."""
+    values = {field: getattr(config, field) for field in fields}
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode()).hexdigest()
+
+
+def artifact_path(kind, digest, *parts):
+    """Where an artifact lives: named by its kind, key digest, any extra parts and the code version."""
+    name = "-".join([kind, digest[:20], *map(str, parts), code_version()[:12]])
+    return TABLE_DIR / f"{name}.table"
+
+
+def _padding(position):
+    return -position % _ALIGN
+
+
+def write_artifact(path, kind, digest, arrays, meta=None):
+    """
+    Saves arrays ({name: array.array}) as an artifact. Replaces path atomically, so
+    readers (and other processes writing the same table) never see a partial file.
+    """
+    layout, offset = [], 0
+    for name, data in arrays.items():
+        layout.append([name, data.typecode, len(data), offset])
+        offset += len(data) * data.itemsize
+        offset += _padding(offset)
+    header = {"kind": kind, "digest": digest, "code_version": code_version(), "byteorder": sys.byteorder,
+              "meta": meta or {}, "arrays": layout}
+    encoded = json.dumps(header).encode()
+    start = len(MAGIC) + _LENGTH.size + len(encoded)
+    encoded += b" " * _padding(start)  # the arrays begin aligned
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + _LENGTH.pack(len(encoded)) + encoded)
+        for data in arrays.values():
+            data.tofile(f)
+            f.write(bytes(_padding(len(data) * data.itemsize)))
+    os.replace(tmp, path)
+    _remove_versions(path)
+
+
+def _version_prefix(path):
+    """path's name up to its code version: what every version of the same table shares."""
+    return path.stem.rpartition("-")[0]
+
+
+def _remove_versions(path):
+    """Deletes the artifacts for path's kind and key written by other code versions."""
+    prefix = _version_prefix(path)
+    for other in path.parent.glob(f"{prefix}-*{path.suffix}"):
+        if other != path and _version_prefix(other) == prefix:
+            other.unlink(missing_ok=True)
+
+
+def remove_stale(directory, suffix):
+    """Deletes every artifact in directory not written by the current code. Returns their paths."""
+    current = code_version()[:12]
+    stale = [path for path in directory.glob(f"*{suffix}") if path.stem.rpartition("-")[2] != current]
+    for path in stale:
+        path.unlink(missing_ok=True)
+    return stale
+
+
+def open_artifact(path, kind, digest):
+    """
+    Maps an artifact. Returns (meta, {name: read-only memoryview}), or None when the
+    file is missing, truncated, or was written for another kind, key, code version,
+    format or byte order.
+    """
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):  # ValueError: an empty file can't be mapped
+        return None
+    prefix = len(MAGIC) + _LENGTH.size
+    if len(mapped) < prefix or mapped[:len(MAGIC)] != MAGIC:
+        return None
+    (length,) = _LENGTH.unpack_from(mapped, len(MAGIC))
+    try:
+        header = json.loads(mapped[prefix:prefix + length])
+    except ValueError:
+        return None
+    if (header.get("kind"), header.get("digest"), header.get("code_version"), header.get("byteorder")) != \
+            (kind, digest, code_version(), sys.byteorder):
+        return None
+
+    view, base, arrays = memoryview(mapped), prefix + length, {}
+    for name, typecode, count, offset in header["arrays"]:
+        start = base + offset
+        stop = start + count * array(typecode).itemsize
+        if stop > len(mapped):
+            return None
+        arrays[name] = view[start:stop].cast(typecode)
+    return header["meta"], arrays
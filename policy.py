@@ -0,0 +1,54 @@
+"""
+Diceball equilibrium AI: solves the pitch game for a rule set, saves the policy
+tables under policies/ and compares the equilibrium AIs with the heuristic ones
+(exactly — every pairing goes through the at-bat solver). See game/policy.py.
+
+Usage:
+    uv run policy.py                      # 4- and 5-die pools, visible re-rolls
+    uv run policy.py --dice 4 --hidden-reroll
+"""
+import time
+from dataclasses import replace
+
+from game.config import AI_MODES, GameConfig
+from game.exact import RESULTS, solve_at_bat
+from game.policy import POLICY_DIR, policy_path, policy_table, RUN_VALUES
+from game.season import slash_line
+
+
+def _woba(results):
+    return sum(p * RUN_VALUES.get(result, 0.0) for result, p in results.items())
+
+
+def print_policy(config, num_dice):
+    cached = policy_path(config, num_dice).exists()
+    start = time.perf_counter()
+    table = policy_table(config, num_dice, verbose=True)
+    seconds = time.perf_counter() - start
+    print(f"\n{'=' * 62}")
+    print(f"  {num_dice}-DIE POLICY  —  {'loaded' if cached else 'solved'} in {seconds:.1f}s"
+          f"  |  {table.nbytes() / 1024:,.0f} KiB  |  "
+          f"{len(table.pitcher_moves):,} pitcher / {len(table.hitter_moves):,} hitter moves")
+    print(f"{'=' * 62}")
+    print(f"  Equilibrium value from 0-0: {table.value():.4f} wOBA weight per PA\n")
+    print(f"  {'Pitcher AI':<12} {'Hitter AI':<12} {'wOBA':>6} {'BA':>6} {'OBP':>6} {'SLG':>6} {'K%':>6} {'BB%':>6}")
+    for pitcher_ai in AI_MODES:
+        for hitter_ai in AI_MODES:
+            solution = solve_at_bat(replace(config, pitcher_ai=pitcher_ai, hitter_ai=hitter_ai), num_dice)
+            results = solution["results"]
+            ba, obp, slg = slash_line([results[r] for r in RESULTS])[:3]
+            print(f"  {pitcher_ai:<12} {hitter_ai:<12} {_woba(results):>6.3f} {ba:>6.3f} {obp:>6.3f} {slg:>6.3f} "
+                  f"{results['K_S'] + results['K_L']:>6.1%} {results['BB']:>6.1%}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Solve and compare Diceball equilibrium AIs.")
+    parser.add_argument("--dice", type=int, nargs="+", default=[4, 5], help="pitcher dice pools to solve")
+    parser.add_argument("--hidden-reroll", action="store_true", help="the hitter decides before the re-roll")
+    args = parser.parse_args()
+
+    config = GameConfig(hidden_reroll=args.hidden_reroll)
+    for num_dice in args.dice:
+        print_policy(replace(config, pitcher_dice=num_dice), num_dice)
+    print(f"\n  Tables are saved in {POLICY_DIR}/.")
@@ -0,0 +1,67 @@
+"""
+Diceball roster matchups: loads a roster file and solves every hitter x pitcher
+matchup exactly over a process pool (see game/roster.py).
+
+Usage:
+    uv run roster.py                              # data/players.json
+    uv run roster.py league.jsonl --workers 16 --top 20
+"""
+import time
+from collections import Counter
+
+from game.exact import RESULTS
+from game.roster import load_roster, matchup_matrix
+from game.season import slash_line
+
+
+def _slash(solution):
+    """(BA, OBP, SLG) of one matchup's exact outcome distribution."""
+    return slash_line([solution["results"][r] for r in RESULTS])[:3]
+
+
+def print_matrix(matrix, top, seconds):
+    roster, hitters, pitchers = matrix.roster, matrix.hitters, matrix.pitchers
+    print(f"\n{'=' * 58}")
+    print(f"  DICEBALL MATCHUPS  —  {len(hitters):,} hitters x {len(pitchers):,} pitchers"
+          f"  |  {len(matrix.solutions)} matchups solved  |  {seconds:.1f}s")
+    print(f"{'=' * 58}")
+    if not pitchers:
+        print("\n  No pitchers on the roster.")
+        return
+
+    # Row and column means by lever class: every member of a class has the same row (or column)
+    ops = [obp + slg for _, obp, slg in map(_slash, matrix.solutions)]
+    n_classes = matrix.n_pitcher_classes
+    pitcher_weights = Counter(matrix.pitcher_class)
+    hitter_weights = Counter(matrix.hitter_class)
+    class_row = {hc: sum(w * ops[hc * n_classes + pc] for pc, w in pitcher_weights.items()) / len(pitchers)
+                 for hc in hitter_weights}
+    class_col = {pc: sum(w * ops[hc * n_classes + pc] for hc, w in hitter_weights.items()) / len(hitters)
+                 for pc in pitcher_weights}
+    row_ops = [class_row[hc] for hc in matrix.hitter_class]
+    col_ops = [class_col[pc] for pc in matrix.pitcher_class]
+
+    print(f"\n  Best hitters (mean OPS against every pitcher):")
+    for h in sorted(range(len(hitters)), key=lambda h: -row_ops[h])[:top]:
+        i = hitters[h]
+        print(f"    {roster.names[i]:<24} {row_ops[h]:.3f}   power {roster.power[i]:>3}  contact {roster.contact[i]:>3}")
+    print(f"\n  Best pitchers (mean OPS allowed to every hitter):")
+    for p in sorted(range(len(pitchers)), key=lambda p: col_ops[p])[:top]:
+        i = pitchers[p]
+        print(f"    {roster.names[i]:<24} {col_ops[p]:.3f}   "
+              f"{'/'.join(roster.pitches(i)):<9} control {roster.control[i]:>3}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Diceball roster matchup matrix.")
+    parser.add_argument("path", nargs="?", default="data/players.json",
+                        help="a JSON array or JSON Lines file of players")
+    parser.add_argument("--workers", type=int, default=None, help="solver processes (default: all CPUs)")
+    parser.add_argument("--top", type=int, default=10, help="how many hitters and pitchers to list")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    roster = load_roster(args.path)
+    matrix = matchup_matrix(roster, args.workers)
+    print_matrix(matrix, args.top, time.perf_counter() - start)
@@ -0,0 +1,84 @@
+"""
+Diceball season simulator: a league of teams plays a round-robin season of
+nine-inning games, each plate appearance drawn from its matchup's exact
+outcome distribution (see game/season.py).
+
+Usage:
+    uv run season.py                        # 30 teams x 162 games
+    uv run season.py --teams 8 --games 40 --seed 3
+    uv run season.py --teams 4 --games 10 --pitch-level   # play every pitch instead
+"""
+import random
+import time
+
+from game.config import GameConfig
+from game.season import Team, play_season, slash_line
+
+# Demo archetypes — each lineup spot and rotation slot is drawn from these
+HITTER_TYPES = {
+    "contact":  GameConfig(correct_commit_bonus=2, hitter_power_bonus=-1),
+    "balanced": GameConfig(),
+    "power":    GameConfig(wrong_commit_penalty=-2, hitter_power_bonus=1),
+}
+PITCHER_TYPES = {
+    "4-die": GameConfig(pitcher_dice=4),
+    "5-die": GameConfig(pitcher_dice=5),
+}
+
+
+def demo_league(num_teams, seed=None):
+    """num_teams teams with lineups and five-man rotations drawn from the demo archetypes."""
+    rng = random.Random(seed)
+    return [
+        Team(f"Team {i + 1:02d}",
+             [HITTER_TYPES[rng.choice(list(HITTER_TYPES))] for _ in range(9)],
+             [PITCHER_TYPES[rng.choice(list(PITCHER_TYPES))] for _ in range(5)])
+        for i in range(num_teams)
+    ]
+
+
+def print_season(season, seconds):
+    standings, batting = season["standings"], season["batting"]
+    print(f"\n{'=' * 58}")
+    print(f"  DICEBALL SEASON  —  {season['games']:,} games  |  {season['matchups']} matchups solved  |  {seconds:.1f}s")
+    print(f"{'=' * 58}")
+    print(f"\n  {'Team':<10} {'W':>4} {'L':>4} {'Pct':>6} {'RS':>5} {'RA':>5}   {'BA':>5} {'OBP':>5} {'SLG':>5}")
+    for name, rec in sorted(standings.items(), key=lambda item: (-item[1]["W"], item[0])):
+        ba, obp, slg, _ = slash_line(batting[name])
+        pct = rec["W"] / max(rec["W"] + rec["L"], 1)
+        print(f"  {name:<10} {rec['W']:>4} {rec['L']:>4} {pct:>6.3f} {rec['RS']:>5} {rec['RA']:>5}"
+              f"   {ba:.3f} {obp:.3f} {slg:.3f}")
+
+    league = [sum(column) for column in zip(*batting.values())]
+    ba, obp, slg, pa = slash_line(league)
+    runs, pitches = league[-2], league[-1]
+    print(f"\n  League: {ba:.3f}/{obp:.3f}/{slg:.3f}  |  {runs / (2 * season['games']):.2f} R/G per team"
+          f"  |  {pa:,} PA  [MLB 2024: .243/.312/.399, 4.39 R/G]")
+    if pitches:
+        print(f"  Pitches per PA: {pitches / pa:.2f}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Diceball season simulator.")
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--games", type=int, default=162, help="games per team")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the league and the season")
+    parser.add_argument("--pitch-level", action="store_true",
+                        help="play every plate appearance pitch by pitch instead of sampling its outcome")
+    parser.add_argument("--log", default=None, metavar="DIR",
+                        help="with --pitch-level, record every pitch: one pitch log per matchup config "
+                             "under DIR (see game/eventlog.py)")
+    args = parser.parse_args()
+    if args.log and not args.pitch_level:
+        parser.error("--log needs --pitch-level")
+
+    teams = demo_league(args.teams, args.seed)
+    start = time.perf_counter()
+    if args.log:
+        from game.eventlog import PitchLogSet
+        with PitchLogSet(args.log) as log:
+            season = play_season(teams, args.games, args.seed, pitch_level=True, log=log)
+    else:
+        season = play_season(teams, args.games, args.seed, pitch_level=args.pitch_level)
+    print_season(season, time.perf_counter() - start)
@@ -0,0 +1,40 @@
+"""
+Diceball game server: hosts many concurrent at-bats — any mix of human and CPU
+pitchers and hitters — over a TCP line protocol (see game/server.py).
+
+Usage:
+    uv run server.py                                  # 127.0.0.1:7707
+    uv run server.py --host 0.0.0.0 --workers 4 --move-timeout 120
+    uv run server.py --pitcher-ai equilibrium         # CPU pitchers play the solved strategy
+
+Then, from any terminal:
+    nc 127.0.0.1 7707
+    NEW human cpu 4        # pitch against the CPU; answer each TURN with THROW fb 1 3
+"""
+import asyncio
+from dataclasses import replace
+
+from game.config import AI_MODES, DEFAULT_CONFIG
+from game.server import DEFAULT_PORT, GameServer
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Diceball multi-session game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="threads for CPU decisions (default: up to 8)")
+    parser.add_argument("--seed", type=int, default=None, help="reproducible dice per session id")
+    parser.add_argument("--pace", type=float, default=0.0, help="seconds between pitches of cpu vs cpu sessions")
+    parser.add_argument("--move-timeout", type=float, default=None, help="seconds a human has for each move")
+    parser.add_argument("--pitcher-ai", choices=AI_MODES, default=DEFAULT_CONFIG.pitcher_ai)
+    parser.add_argument("--hitter-ai", choices=AI_MODES, default=DEFAULT_CONFIG.hitter_ai)
+    args = parser.parse_args()
+
+    config = replace(DEFAULT_CONFIG, pitcher_ai=args.pitcher_ai, hitter_ai=args.hitter_ai)
+    server = GameServer(config, args.workers, args.seed, args.pace, args.move_timeout)
+    try:
+        asyncio.run(server.serve(args.host, args.port,
+                                 ready=lambda address: print(f"Diceball server listening on {address[0]}:{address[1]}")))
+    except KeyboardInterrupt:
+        print(f"\nStopped after {server.played:,} at-bats.")
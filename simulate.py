@@ -3,37 +3,38 @@ Diceball simulation harness.
 Runs N at-bats with AI pitcher vs AI hitter and reports MLB-comparable stats.
 
 Usage:
-    uv run simulate.py [num_at_bats] [pitcher_dice]
+    uv run simulate.py [num_at_bats] [pitcher_dice] [--workers N] [--seed S]
     uv run simulate.py 1000 5
     uv run simulate.py 5000          # uses all pitcher dice counts (4-7)
+    uv run simulate.py 1000000 --workers 32 --seed 7   # sharded over a process pool, reproducible
+    uv run simulate.py 20000 --profile                 # per-phase timing breakdown after the report
+    uv run simulate.py 100000 --log runs/default       # also record every pitch (see game/eventlog.py)
 """
 
-import sys
 from collections import defaultdict
-from game.engine import play_at_bat
+from game.dice import DiceSource
+from game.rules import simulate_at_bat
 
-# Suppress AI decision prints during simulation
-import builtins
-_real_print = builtins.print
-
-def _silent_print(*args, **kwargs):
-    pass
-
-def run_simulation(num_at_bats: int, pitcher_dice: int | None = None) -> dict:
-    """Run num_at_bats simulated at-bats and return aggregated stats."""
+def run_simulation(num_at_bats: int, pitcher_dice: int | None = None,
+                   workers: int | None = None, seed: int | None = None, log=None) -> dict:
+    """Run num_at_bats simulated at-bats and return aggregated stats. log: a PitchLogWriter (serial runs only)."""
     dice_counts = [pitcher_dice] if pitcher_dice else [4, 5]
+    if workers:
+        from game.config import DEFAULT_CONFIG
+        from game.parallel import simulate_parallel
+        results, _, pitches = simulate_parallel(DEFAULT_CONFIG, num_at_bats, workers=workers,
+                                                seed=seed, dice_counts=dice_counts)
+        return dict(results), list(pitches.elements())
+
+    rng = DiceSource(seed) if seed is not None else None
     results = defaultdict(int)
     pitch_totals = []
 
-    builtins.print = _silent_print
-    try:
-        for i in range(num_at_bats):
-            dice = dice_counts[i % len(dice_counts)]
-            outcome = play_at_bat(dice, pitcher_is_ai=True, hitter_is_ai=True, verbose=False)
-            results[outcome["result"]] += 1
-            pitch_totals.append(outcome["pitches"])
-    finally:
-        builtins.print = _real_print
+    for i in range(num_at_bats):
+        dice = dice_counts[i % len(dice_counts)]
+        outcome = simulate_at_bat(dice, rng=rng, log=log)
+        results[outcome["result"]] += 1
+        pitch_totals.append(outcome["pitches"])
 
     return dict(results), pitch_totals
 
@@ -54,36 +55,62 @@ def print_report(results: dict, pitch_totals: list, num_at_bats: int, pitcher_di
 
     dice_label = str(pitcher_dice) if pitcher_dice else "4-5 (mixed)"
 
-    _real_print(f"\n{'='*50}")
-    _real_print(f"  DICEBALL SIMULATION  —  {num_at_bats:,} at-bats  |  Pitcher dice: {dice_label}")
-    _real_print(f"{'='*50}")
-    _real_print(f"\n  Outcome breakdown:")
+    print(f"\n{'='*50}")
+    print(f"  DICEBALL SIMULATION  —  {num_at_bats:,} at-bats  |  Pitcher dice: {dice_label}")
+    print(f"{'='*50}")
+    print(f"\n  Outcome breakdown:")
     for label, key in [("  Home Run", "HR"), ("  Triple", "TRIPLE"), ("  Double", "DOUBLE"), ("  Single", "SINGLE"),
                         ("  Out (hard)", "OUT"), ("  Out (weak)", "WEAK_OUT"),
                         ("  Walk", "BB")]:
         n = results.get(key, 0)
-        _real_print(f"    {label:<20} {n:>6,}   ({n/num_at_bats:>5.1%})")
-    _real_print(f"    {'  Strikeout (swing)':<20} {k_s:>6,}   ({k_s/num_at_bats:>5.1%})")
-    _real_print(f"    {'  Strikeout (look)':<20} {k_l:>6,}   ({k_l/num_at_bats:>5.1%})")
-    _real_print(f"    {'  Strikeout (total)':<20} {k_total:>6,}   ({k_rate:>5.1%})")
-
-    _real_print(f"\n  Rate stats (MLB 2023 benchmarks in brackets):")
-    _real_print(f"    BA          {ba:.3f}   [.248]")
-    _real_print(f"    OBP         {obp:.3f}   [.320]")
-    _real_print(f"    HR/AB       {hr_rate:.3f}   [.034]")
-    _real_print(f"    K%          {k_rate:.1%}   [22.7%]")
-    _real_print(f"    K% swing    {k_s/num_at_bats:.1%}   [~14%]")
-    _real_print(f"    K% look     {k_l/num_at_bats:.1%}   [~9%]")
-    _real_print(f"    BB%         {bb_rate:.1%}   [ 8.4%]")
-    _real_print(f"    Avg pitches {avg_pitches:.1f}   [3.8 P/PA in MLB]")
-    _real_print(f"{'='*50}\n")
+        print(f"    {label:<20} {n:>6,}   ({n/num_at_bats:>5.1%})")
+    print(f"    {'  Strikeout (swing)':<20} {k_s:>6,}   ({k_s/num_at_bats:>5.1%})")
+    print(f"    {'  Strikeout (look)':<20} {k_l:>6,}   ({k_l/num_at_bats:>5.1%})")
+    print(f"    {'  Strikeout (total)':<20} {k_total:>6,}   ({k_rate:>5.1%})")
+
+    print(f"\n  Rate stats (MLB 2023 benchmarks in brackets):")
+    print(f"    BA          {ba:.3f}   [.248]")
+    print(f"    OBP         {obp:.3f}   [.320]")
+    print(f"    HR/AB       {hr_rate:.3f}   [.034]")
+    print(f"    K%          {k_rate:.1%}   [22.7%]")
+    print(f"    K% swing    {k_s/num_at_bats:.1%}   [~14%]")
+    print(f"    K% look     {k_l/num_at_bats:.1%}   [~9%]")
+    print(f"    BB%         {bb_rate:.1%}   [ 8.4%]")
+    print(f"    Avg pitches {avg_pitches:.1f}   [3.8 P/PA in MLB]")
+    print(f"{'='*50}\n")
 
 
 if __name__ == "__main__":
-    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
-    dice = int(sys.argv[2]) if len(sys.argv) > 2 else None
-
-    _real_print(f"Running {n:,} simulated at-bats... ", end="", flush=True)
-    results, pitch_totals = run_simulation(n, dice)
-    _real_print("done.")
+    import argparse
+    parser = argparse.ArgumentParser(description="Diceball simulation harness.")
+    parser.add_argument("num_at_bats", nargs="?", type=int, default=1000)
+    parser.add_argument("pitcher_dice", nargs="?", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="shard the run over this many worker processes")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="base seed for the dice (same seed + workers = same results)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the engine and AI phases and print a breakdown (serial runs only)")
+    parser.add_argument("--log", default=None, metavar="DIR",
+                        help="append one record per pitch to a binary pitch log in DIR (serial runs only)")
+    args = parser.parse_args()
+    if args.log and args.workers:
+        parser.error("--log records serial runs only; drop --workers")
+    n, dice = args.num_at_bats, args.pitcher_dice
+    if args.profile:
+        from game import perf
+        perf.enable()
+
+    print(f"Running {n:,} simulated at-bats... ", end="", flush=True)
+    if args.log:
+        from game.config import DEFAULT_CONFIG
+        from game.eventlog import PitchLogWriter
+        with PitchLogWriter(args.log, DEFAULT_CONFIG) as log:
+            results, pitch_totals = run_simulation(n, dice, args.workers, args.seed, log)
+        print(f"done. ({args.log} now holds {log.records:,} pitches)")
+    else:
+        results, pitch_totals = run_simulation(n, dice, args.workers, args.seed)
+        print("done.")
     print_report(results, pitch_totals, n, dice)
+    if args.profile:
+        perf.report()
@@ -3,8 +3,13 @@
 Diceball Simulator — tune game levers, run N at-bats CPU vs CPU,
 and compare results to MLB target stats.
 """
-from game.engine import play_at_bat
-from game.config import GameConfig
+from dataclasses import replace
+
+from game.dice import DiceSource, derive_seed
+from game.rules import simulate_at_bat
+from game.config import AI_MODES, GameConfig
+from game.pitch_utils import arsenal
+from game.store import ResultStore
 
 # 2024 MLB league averages: (target, tolerance for ✓)
 MLB_TARGETS = {
@@ -22,12 +27,14 @@ MLB_TARGETS = {
 PITCHER_LEVERS = [
     ("pitcher_dice",      "Pitcher dice pool",         "4 or 5 d6"),
     ("gas_per_at_bat",    "Gas (re-rolls) per at-bat", "int or 'auto'"),
+    ("arsenal",           "Pitch arsenal",             "pitches thrown, e.g. FB/CB/CU or FB/CU"),
     ("fb_match_count",    "FB match count",            "3=three-of-a-kind, 2=pair"),
     ("cb_run_length",     "CB run length",             "3=full run, 2=two-die run"),
     ("cb_allow_six",      "CB allow 6 in run",         "True or False"),
     ("cu_diff_count",     "CU diff count",             "3=three diff same-parity, 2=two diff"),
     ("difficulty_method", "Pitch difficulty",          "max=high die, mid=middle die, min=low die"),
     ("hidden_reroll",     "Hidden re-roll",            "True or False"),
+    ("pitcher_ai",        "CPU pitcher",               "heuristic or equilibrium"),
 ]
 
 # Hitter levers — affect how good the batter is
@@ -35,6 +42,7 @@ HITTER_LEVERS = [
     ("correct_commit_bonus", "Correct commit bonus",  "integer, e.g. +1"),
     ("wrong_commit_penalty", "Wrong commit penalty",  "integer, e.g. -1"),
     ("hitter_power_bonus",   "Hitter power bonus",    "integer added to every power roll"),
+    ("hitter_ai",            "CPU hitter",            "heuristic or equilibrium"),
 ]
 
 LEVER_LABELS = PITCHER_LEVERS + HITTER_LEVERS
@@ -46,6 +54,7 @@ def display_config(cfg):
     values = {
         "pitcher_dice":         str(cfg.pitcher_dice),
         "gas_per_at_bat":       f"{gas}  ({gas_label})",
+        "arsenal":              cfg.arsenal,
         "fb_match_count":       f"{cfg.fb_match_count}  ({'three-of-a-kind' if cfg.fb_match_count == 3 else 'pair'})",
         "cb_run_length":        f"{cfg.cb_run_length}  ({'full 3-die run' if cfg.cb_run_length == 3 else '2-die run'})",
         "cb_allow_six":         str(cfg.cb_allow_six),
@@ -55,6 +64,8 @@ def display_config(cfg):
         "wrong_commit_penalty": str(cfg.wrong_commit_penalty),
         "hitter_power_bonus":   f"{cfg.hitter_power_bonus:+d}",
         "hidden_reroll":        str(cfg.hidden_reroll),
+        "pitcher_ai":           cfg.pitcher_ai,
+        "hitter_ai":            cfg.hitter_ai,
     }
     print("\nConfig:")
     for i, (key, label, _) in enumerate(LEVER_LABELS, 1):
@@ -62,80 +73,203 @@ def display_config(cfg):
 
 
 def edit_config(cfg):
+    """Prompts for one lever. Returns the edited config (configs are frozen) — cfg itself if nothing changed."""
     display_config(cfg)
     raw = input("\nEnter lever number to edit (or Enter to cancel): ").strip()
     if not raw:
-        return
+        return cfg
     try:
         idx = int(raw) - 1
         if idx < 0 or idx >= len(LEVER_LABELS):
             print("Invalid number.")
-            return
+            return cfg
     except ValueError:
         print("Invalid input.")
-        return
+        return cfg
 
     key, label, hint = LEVER_LABELS[idx]
     current = getattr(cfg, key)
     val = input(f"  {label} [{current}]  ({hint}): ").strip()
     if not val:
-        return
+        return cfg
 
-    if key == "hidden_reroll":
-        if val.lower() in ("true", "yes", "1"):
-            cfg.hidden_reroll = True
-        elif val.lower() in ("false", "no", "0"):
-            cfg.hidden_reroll = False
-        else:
-            print("Must be True or False.")
-    elif key == "cb_allow_six":
+    if key in ("hidden_reroll", "cb_allow_six"):
         if val.lower() in ("true", "yes", "1"):
-            cfg.cb_allow_six = True
+            changes = {key: True}
         elif val.lower() in ("false", "no", "0"):
-            cfg.cb_allow_six = False
+            changes = {key: False}
         else:
             print("Must be True or False.")
+            return cfg
     elif key == "gas_per_at_bat":
-        if val.lower() == "auto":
-            cfg.gas_per_at_bat = None
-        else:
-            cfg.gas_per_at_bat = int(val)
+        changes = {key: None if val.lower() == "auto" else int(val)}
+    elif key == "arsenal":
+        try:
+            changes = {key: arsenal(val.upper().split("/"))}
+        except ValueError:
+            print("Must be one or more of FB, CB and CU, separated by /.")
+            return cfg
     elif key == "difficulty_method":
-        if val in ("max", "mid", "min"):
-            cfg.difficulty_method = val
-        else:
+        if val not in ("max", "mid", "min"):
             print("Must be max, mid, or min.")
+            return cfg
+        changes = {key: val}
+    elif key in ("pitcher_ai", "hitter_ai"):
+        if val not in AI_MODES:
+            print("Must be heuristic or equilibrium.")
+            return cfg
+        changes = {key: val}
     elif key == "pitcher_dice":
-        cfg.pitcher_dice = int(val)
-        cfg.gas_per_at_bat = None  # reset gas to auto when dice pool changes
+        # reset gas to auto when dice pool changes
+        changes = {key: int(val), "gas_per_at_bat": None}
     else:
-        setattr(cfg, key, int(val))
+        changes = {key: int(val)}
     print(f"  → {label} set.")
+    return replace(cfg, **changes)
+
 
+RESULT_KEYS = ("BB", "K_S", "K_L", "SINGLE", "DOUBLE", "TRIPLE", "HR", "OUT", "WEAK_OUT")
 
-def run_simulations(cfg, n):
-    counts = {"BB": 0, "K_S": 0, "K_L": 0,
-              "SINGLE": 0, "DOUBLE": 0, "TRIPLE": 0, "HR": 0,
-              "OUT": 0, "WEAK_OUT": 0}
+
+def _as_count_dicts(results, pitch_types):
+    counts = {k: results.get(k, 0) for k in RESULT_KEYS}
+    pitch_counts = {pt: pitch_types.get(pt, 0) for pt in ("FB", "CB", "CU")}
+    return counts, pitch_counts
+
+
+def run_simulations(cfg, n, workers=None, seed=None, quiet=False, store=None, fresh=False):
+    """
+    Runs n CPU-vs-CPU at-bats. With workers set, the at-bats are sharded over a
+    process pool and the same (seed, n, workers) always gives the same counts;
+    a serial run with a seed is reproducible too. quiet: no progress output.
+
+    store: a ResultStore — unseeded runs reuse the config's stored at-bats and only
+    simulate the shortfall, so the counts returned can cover more than n at-bats
+    (their sum is the number of at-bats). fresh: simulate all n at-bats on new dice
+    and only then add them to the store — for checks that mustn't reuse old samples.
+    """
+    if store is not None and seed is None and fresh:
+        counts, pitch_counts = run_simulations(cfg, n, workers, quiet=quiet)
+        store.add(cfg, counts, pitch_counts, n)
+        return counts, pitch_counts
+    if store is not None and seed is None:
+        counts, pitch_counts, stored = store.load(cfg)
+        if stored < n:
+            new_counts, new_pitch_counts = run_simulations(cfg, n - stored, workers, quiet=quiet)
+            counts, pitch_counts, stored = store.add(cfg, new_counts, new_pitch_counts, n - stored)
+        elif not quiet:
+            print(f"  Using {stored:,} stored at-bats.")
+        return counts, pitch_counts
+
+    if workers:
+        from game.parallel import simulate_parallel
+        if not quiet:
+            print(f"\r  Simulating {n} at-bats on {workers} workers...", end="", flush=True)
+        results, pitch_types, _ = simulate_parallel(cfg, n, workers=workers, seed=seed)
+        if not quiet:
+            print(f"\r  Done — {n} at-bats simulated.                ")
+        return _as_count_dicts(results, pitch_types)
+
+    rng = DiceSource(seed) if seed is not None else None
+    counts = {k: 0 for k in RESULT_KEYS}
     pitch_counts = {"FB": 0, "CB": 0, "CU": 0}
     for i in range(n):
-        if i % 200 == 0:
+        if i % 200 == 0 and not quiet:
             print(f"\r  Simulating... {i}/{n}", end="", flush=True)
-        ab = play_at_bat(cfg.pitcher_dice, pitcher_is_ai=True, hitter_is_ai=True,
-                         verbose=False, config=cfg)
+        ab = simulate_at_bat(cfg.pitcher_dice, cfg, rng)
         r = ab["result"]
         if r in counts:
             counts[r] += 1
         for pt, c in ab.get("pitch_types", {}).items():
             pitch_counts[pt] = pitch_counts.get(pt, 0) + c
-    print(f"\r  Done — {n} at-bats simulated.       ")
+    if not quiet:
+        print(f"\r  Done — {n} at-bats simulated.       ")
+    return counts, pitch_counts
+
+
+_CI_Z = 1.96           # 95% intervals
+_CI_FIRST_BATCH = 500  # at-bats before the first precision check
+_CI_MAX_N = 200_000    # default cap on a precision run
+_CI_STATS = ("BA", "OBP", "SLG", "BB%", "K%", "HR/PA", "BABIP")
+
+
+def run_to_precision(cfg, precision, max_n, workers=None, seed=None, quiet=False, store=None, fresh=False):
+    """
+    Simulates until every stat in _CI_STATS is pinned down: each 95% interval's
+    half-width at most `precision` x that stat's MLB_TARGETS tolerance (0.5 = half
+    the tolerance), or max_n at-bats, whichever comes first. Each batch is sized from
+    the worst stat's projected need, at most doubling the sample.
+
+    Returns (counts, pitch_counts) like run_simulations — sum(counts.values()) at-bats.
+    store: starts from the config's stored at-bats and saves every batch (unseeded runs).
+    fresh: starts from zero at-bats all the same; the new batches are still saved.
+    """
+    if store is not None and seed is None and not fresh:
+        counts, pitch_counts, total = store.load(cfg)
+    else:
+        if seed is not None:
+            store = None
+        counts, pitch_counts, total = dict.fromkeys(RESULT_KEYS, 0), dict.fromkeys(("FB", "CB", "CU"), 0), 0
+
+    batch_no = 0
+    while total < max_n:
+        if total:
+            intervals = stat_intervals(counts, total)
+            worst = max((intervals[stat][1] / (precision * MLB_TARGETS[stat][1])) ** 2 for stat in _CI_STATS)
+            if worst <= 1:
+                break
+            step = min(max(int(total * worst) - total, _CI_FIRST_BATCH), total)
+        else:
+            step = _CI_FIRST_BATCH
+        step = min(step, max_n - total)
+        if not quiet:
+            print(f"\r  Simulating to precision... {total:,} at-bats, adding {step:,}    ", end="", flush=True)
+        batch_seed = derive_seed(seed, "ci", batch_no) if seed is not None else None
+        new_counts, new_pitch_counts = run_simulations(cfg, step, workers, batch_seed, quiet=True)
+        stored = store.add(cfg, new_counts, new_pitch_counts, step) if store is not None else None
+        if stored is not None and not fresh:
+            counts, pitch_counts, total = stored
+        else:
+            counts = {k: counts[k] + new_counts[k] for k in RESULT_KEYS}
+            pitch_counts = {pt: pitch_counts[pt] + new_pitch_counts.get(pt, 0) for pt in pitch_counts}
+            total += step
+        batch_no += 1
+
+    if not quiet:
+        met = all(hw <= precision * MLB_TARGETS[stat][1] for stat, (_, hw) in stat_intervals(counts, total).items())
+        print(f"\r  Done — {total:,} at-bats{'' if met else f' (stopped at the {max_n:,} cap)'}.               ")
+    return counts, pitch_counts
+
+
+def exact_results(cfg, n=1000):
+    """
+    Expected counts per n at-bats from the exact solver — no sampling noise.
+    Returns (counts, pitch_counts) like run_simulations, with float values.
+    """
+    from game.exact import solve_at_bat
+    solution = solve_at_bat(cfg)
+    counts = {k: solution["results"][k] * n for k in RESULT_KEYS}
+    pitch_counts = {pt: solution["pitch_types"][pt] * n for pt in ("FB", "CB", "CU")}
+    return counts, pitch_counts
+
+
+def run_batch_simulations(cfg, n, seed=None):
+    """Same counts as run_simulations, from the vectorized NumPy engine."""
+    from game.batch import simulate_batch
+    print(f"  Simulating {n:,} at-bats (batch)...", end="", flush=True)
+    counts, pitch_counts = simulate_batch(cfg, n, seed=seed)
+    print(f"\r  Done — {n:,} at-bats simulated.       ")
     return counts, pitch_counts
 
 
 PITCH_DISPLAY = {"FB": "Fastball", "CB": "Breaking Ball", "CU": "Off Speed"}
 
 
-def display_results(counts, pitch_counts, n):
+def display_results(counts, pitch_counts, n, exact=False, precision=None):
+    """
+    exact: counts are expected values from exact_results rather than sampled tallies.
+    precision: the run_to_precision target, shown next to the achieved intervals.
+    """
     BB  = counts["BB"]
     K_S = counts["K_S"]
     K_L = counts["K_L"]
@@ -181,7 +315,8 @@ def display_results(counts, pitch_counts, n):
     O_BOT = "└───────────────────┴────────┴──────────┴─────────────────┘"
 
     print(f"\n{O_TOP}")
-    print(f"│{'  OUTCOME BREAKDOWN  (' + str(f'{n:,}') + ' at-bats)':<57}│")
+    sample_label = f"exact, per {n:,} PA" if exact else f"{n:,} at-bats"
+    print(f"│{'  OUTCOME BREAKDOWN  (' + sample_label + ')':<57}│")
     print(O_SEP)
     print(f"│  {'Result':<16} │ {'Count':>6} │ {'Game %':>7}  │ {'MLB 2024 ~':<15} │")
     print(O_MID)
@@ -206,7 +341,8 @@ def display_results(counts, pitch_counts, n):
             mlb_str = f"~{MLB_OUTCOME[label]:.1%}"
         else:
             mlb_str = ""
-        print(f"│  {label:<16} │ {cnt:>6} │ {rate:>7.1%}  │ {mlb_str:<15} │")
+        cnt_str = f"{cnt:.1f}" if exact else str(cnt)
+        print(f"│  {label:<16} │ {cnt_str:>6} │ {rate:>7.1%}  │ {mlb_str:<15} │")
     print(O_BOT)
 
     # --- Pitch mix ---
@@ -218,7 +354,8 @@ def display_results(counts, pitch_counts, n):
     P_MID = "├───────────────────┼────────┼──────────┼──────────┤"
     P_BOT = "└───────────────────┴────────┴──────────┴──────────┘"
     print(f"\n{P_TOP}")
-    print(f"│{'  PITCH MIX  (' + str(f'{total_pitches:,}') + ' pitches)':<50}│")
+    pitches_label = f"{total_pitches / n:.2f} pitches/PA" if exact else f"{total_pitches:,} pitches"
+    print(f"│{'  PITCH MIX  (' + pitches_label + ')':<50}│")
     print(P_SEP)
     print(f"│  {'Type':<16} │ {'Count':>6} │ {'Game %':>7}  │ {'MLB ~':<8} │")
     print(P_MID)
@@ -226,7 +363,8 @@ def display_results(counts, pitch_counts, n):
         cnt = pitch_counts.get(code, 0)
         pct = cnt / total_pitches if total_pitches > 0 else 0.0
         mlb = MLB_PITCH_MIX.get(code, "")
-        print(f"│  {label:<16} │ {cnt:>6} │ {pct:>7.1%}  │ {mlb:<8} │")
+        cnt_str = f"{cnt:.1f}" if exact else str(cnt)
+        print(f"│  {label:<16} │ {cnt_str:>6} │ {pct:>7.1%}  │ {mlb:<8} │")
     print(P_BOT)
 
     def flag(val, target, tol):
@@ -264,6 +402,9 @@ def display_results(counts, pitch_counts, n):
         print(f"│  {name:<8} │ {game_str:>8} │ {target_str:>8} │ {status:<16} │")
     print(S_BOT)
 
+    if not exact:
+        display_intervals(counts, n, precision)
+
     # --- wOBA / wRC+ / WAR ---
     # 2024 MLB linear weights (FanGraphs)
     LG_wOBA      = 0.317
@@ -291,8 +432,35 @@ def display_results(counts, pitch_counts, n):
     print(W_BOT)
 
 
-def compute_stats(counts, n):
-    """Return a dict of key stats from raw counts."""
+def display_intervals(counts, n, precision=None):
+    """The 95% interval of each sampled stat against its MLB tolerance — is n enough to trust the ✓s?"""
+    C_TOP = "┌" + "─" * 52 + "┐"
+    C_SEP = "├───────────┬──────────┬──────────┬──────────────────┤"
+    C_MID = "├───────────┼──────────┼──────────┼──────────────────┤"
+    C_BOT = "└───────────┴──────────┴──────────┴──────────────────┘"
+    goal = f"goal ≤ {precision:g} × tol" if precision else "± vs tolerance"
+    print(f"\n{C_TOP}")
+    print(f"│{'  95% INTERVALS  (' + goal + ')':<52}│")
+    print(C_SEP)
+    print(f"│  {'Stat':<8} │ {'±':>8} │ {'Tol':>8} │ {'':16} │")
+    print(C_MID)
+    for stat, (_, hw) in stat_intervals(counts, n).items():
+        fmt = ".1%" if stat.endswith("%") or stat == "HR/PA" else ".3f"
+        tol = MLB_TARGETS[stat][1]
+        ratio = hw / tol
+        if precision:
+            status = f"{ratio:.2f} × tol {'✓' if ratio <= precision else '✗'}"
+        else:
+            status = f"{ratio:.2f} × tol"
+        print(f"│  {stat:<8} │ {format(hw, fmt):>8} │ {format(tol, fmt):>8} │ {status:<16} │")
+    print(C_BOT)
+
+
+def _stat_ratios(counts, n):
+    """
+    Every stat as the ratio it is of the raw counts: {stat: (numerator, denominator)}.
+    compute_stats, stat_intervals and the search's standard errors all start here.
+    """
     BB  = counts["BB"]
     H1  = counts["SINGLE"]
     H2  = counts["DOUBLE"]
@@ -302,53 +470,227 @@ def compute_stats(counts, n):
     H   = H1 + H2 + H3 + HR
     AB  = n - BB
     TB  = H1 + 2*H2 + 3*H3 + 4*HR
-    BA  = H / AB       if AB > 0 else 0.0
-    OBP = (H + BB) / n if n  > 0 else 0.0
-    SLG = TB / AB      if AB > 0 else 0.0
-    wOBA = (0.690*BB + 0.888*H1 + 1.271*H2 + 1.616*H3 + 2.101*HR) / n if n > 0 else 0.0
-    return {"BA": BA, "OBP": OBP, "SLG": SLG, "wOBA": wOBA,
-            "BB%": BB/n, "K%": K/n, "HR/PA": HR/n}
+    return {
+        "BA":    (H, AB),
+        "OBP":   (H + BB, n),
+        "SLG":   (TB, AB),
+        "wOBA":  (0.690*BB + 0.888*H1 + 1.271*H2 + 1.616*H3 + 2.101*HR, n),
+        "BB%":   (BB, n),
+        "K%":    (K, n),
+        "HR/PA": (HR, n),
+        "BABIP": (H - HR, AB - K - HR),
+    }
+
+
+def _slg_variance(counts, ratios):
+    """The per-at-bat variance of total bases — SLG is their mean over at-bats."""
+    TB, AB = ratios["SLG"]
+    squares = counts["SINGLE"] + 4*counts["DOUBLE"] + 9*counts["TRIPLE"] + 16*counts["HR"]
+    return max(squares / AB - (TB / AB) ** 2, 0.0)
+
 
+def stat_intervals(counts, n, z=_CI_Z):
+    """
+    {stat: (estimate, interval half-width)} for every stat in _CI_STATS, normal
+    approximation. Rates use the Agresti-Coull adjusted proportion for the width, so
+    a small run that happens to have no triples or homers doesn't look exact.
+    """
+    ratios = _stat_ratios(counts, n)
 
-def _run_search(base_cfg, search_space, target_ba, target_obp, target_slg, n_sims=1000):
-    """Generic search over a lever subspace. Returns best GameConfig."""
+    def rate(hits, trials):
+        if trials <= 0:
+            return 0.0, float("inf")
+        p = (hits + z * z / 2) / (trials + z * z)
+        return hits / trials, z * (p * (1 - p) / (trials + z * z)) ** 0.5
+
+    intervals = {stat: rate(*ratios[stat]) for stat in _CI_STATS if stat != "SLG"}
+    TB, AB = ratios["SLG"]
+    intervals["SLG"] = (TB / AB, z * (_slg_variance(counts, ratios) / AB) ** 0.5) if AB > 0 else (0.0, float("inf"))
+    return {stat: intervals[stat] for stat in _CI_STATS}
+
+
+def compute_stats(counts, n):
+    """Return a dict of key stats from raw counts."""
+    ratios = _stat_ratios(counts, n)
+    stats = {}
+    for stat in ("BA", "OBP", "SLG", "wOBA", "BB%", "K%", "HR/PA"):
+        num, den = ratios[stat]
+        stats[stat] = num / den if den > 0 else 0.0
+    return stats
+
+
+# Score scale per stat: a miss of this size costs 1.0
+_SEARCH_SCALES = (0.020, 0.025, 0.030)
+
+_RACE_Z = 2.576          # ~99% intervals — a candidate is only dropped when it's clearly beaten
+_RACE_FIRST_ROUND = 125  # at-bats per candidate in the first round; each round doubles the sample
+
+
+def _search_score(counts, n, target_ba, target_obp, target_slg):
+    s = compute_stats(counts, n)
+    return sum(((s[stat] - target) / scale) ** 2 for stat, target, scale in
+               zip(("BA", "OBP", "SLG"), (target_ba, target_obp, target_slg), _SEARCH_SCALES))
+
+
+def _stat_errors(counts, n):
+    """(estimate, standard error) for BA, OBP and SLG from raw counts."""
+    ratios = _stat_ratios(counts, n)
+    if ratios["BA"][1] <= 0:
+        return [(0.0, 1.0), (0.0, 1.0), (0.0, 4.0)]
+    errors = []
+    for stat in ("BA", "OBP"):
+        hits, trials = ratios[stat]
+        p = hits / trials
+        errors.append((p, (p * (1 - p) / trials) ** 0.5))
+    TB, AB = ratios["SLG"]
+    errors.append((TB / AB, (_slg_variance(counts, ratios) / AB) ** 0.5))
+    return errors
+
+
+def _score_spread(counts, n, target_ba, target_obp, target_slg):
+    """
+    (_search_score, its sampling variance) from the standard errors of BA, OBP and SLG —
+    the delta method, plus the second-order term that matters for candidates near the target.
+    """
+    score = var = 0.0
+    for (est, se), target, scale in zip(_stat_errors(counts, n),
+                                        (target_ba, target_obp, target_slg), _SEARCH_SCALES):
+        miss = (est - target) / scale
+        score += miss ** 2
+        var += (2 * miss * se / scale) ** 2 + 2 * (se / scale) ** 4
+    return score, var
+
+
+def _sample_candidates(candidates, n, workers=None, seed=None, round_no=0, crn=False, offset=0):
+    """
+    n more at-bats for each candidate. Returns a list of (counts, pitch_counts).
+    Without crn every round gets fresh dice; with crn every candidate plays at-bats
+    offset..offset+n-1 on the same per-at-bat streams (common random numbers).
+    """
+    if crn:
+        if workers:
+            from game.parallel import simulate_many
+            runs = simulate_many(candidates, n, workers=workers, seed=seed, crn=True, offset=offset)
+        else:
+            from game.parallel import simulate_shard
+            runs = [simulate_shard(cfg, [cfg.pitcher_dice], offset, offset + n, seed, crn=True)
+                    for cfg in candidates]
+        return [_as_count_dicts(results, pitch_types) for results, pitch_types, _ in runs]
+
+    if workers:
+        from game.parallel import simulate_many
+        runs = simulate_many(candidates, n, workers=workers,
+                             seed=None if seed is None else derive_seed(seed, "race", round_no))
+        return [_as_count_dicts(results, pitch_types) for results, pitch_types, _ in runs]
+
+    return [run_simulations(cfg, n, seed=None if seed is None else derive_seed(seed, "race", round_no, i),
+                            quiet=True)
+            for i, cfg in enumerate(candidates)]
+
+
+def _run_search(base_cfg, search_space, target_ba, target_obp, target_slg, n_sims=1000,
+                workers=None, seed=None, exact=False, crn=False, store=None):
+    """
+    Generic search over a lever subspace. Returns best GameConfig.
+
+    Races the candidates within the grid's budget of n_sims at-bats each: every round
+    doubles the survivors' samples and drops any whose score interval can't beat the
+    best one's, so the at-bats go to the contenders instead of the whole grid.
+    exact: score each candidate from the exact solver instead of sampled at-bats.
+    crn: every candidate plays the same dice (common random numbers), so the ranking
+    reflects the levers rather than each candidate's luck.
+    store: a ResultStore — unseeded, non-CRN searches start from each candidate's
+    stored at-bats (which count against the budget) and save what they add, so a
+    repeated search only simulates what's missing.
+    """
     from itertools import product
-    import copy
 
     keys = list(search_space.keys())
-    candidates = list(product(*search_space.values()))
+    candidates = [replace(base_cfg, **dict(zip(keys, values))) for values in product(*search_space.values())]
     total = len(candidates)
-    best_cfg, best_score = None, float("inf")
-
-    for i, values in enumerate(candidates):
-        print(f"\r  Searching... {i+1}/{total}", end="", flush=True)
-        cfg = copy.copy(base_cfg)
-        for k, v in zip(keys, values):
-            setattr(cfg, k, v)
-        counts, _ = run_simulations(cfg, n_sims)
-        s = compute_stats(counts, n_sims)
-        score = (
-            ((s["BA"]  - target_ba)  / 0.020) ** 2 +
-            ((s["OBP"] - target_obp) / 0.025) ** 2 +
-            ((s["SLG"] - target_slg) / 0.030) ** 2
-        )
-        if score < best_score:
-            best_score, best_cfg = score, cfg
-
-    print(f"\r  Done — searched {total} configurations.       ")
-    return best_cfg
-
-
-def hitter_search(base_cfg, target_ba, target_obp, target_slg, n_sims=1000):
+
+    if exact:
+        best_cfg, best_score = None, float("inf")
+        for i, cfg in enumerate(candidates):
+            print(f"\r  Solving... {i+1}/{total}", end="", flush=True)
+            counts, _ = exact_results(cfg, n_sims)
+            score = _search_score(counts, n_sims, target_ba, target_obp, target_slg)
+            if score < best_score:
+                best_score, best_cfg = score, cfg
+        print(f"\r  Done — solved {total} configurations exactly.       ")
+        return best_cfg
+
+    if crn and seed is None:
+        import random
+        seed = random.getrandbits(64)
+    if store is not None and (crn or seed is not None):
+        store = None  # stored samples are neither paired nor seeded
+
+    totals = [dict.fromkeys(RESULT_KEYS, 0) for _ in candidates]
+    pitch_totals = [dict.fromkeys(("FB", "CB", "CU"), 0) for _ in candidates]
+    sampled = [0] * total
+    if store is not None:
+        for i, cfg in enumerate(candidates):
+            totals[i], pitch_totals[i], sampled[i] = store.load(cfg)
+    alive = list(range(total))
+    budget = n_sims * total
+    level, round_no, spent, new_at_bats = min(_RACE_FIRST_ROUND, n_sims), 0, sum(sampled), 0
+    while True:
+        # Bring every survivor up to `level` at-bats, grouped by how many each still needs
+        short = {}
+        for i in alive:
+            if sampled[i] < level:
+                short.setdefault(level - sampled[i], []).append(i)
+        print(f"\r  Racing — round {round_no + 1}: {len(alive)}/{total} configurations at {level} at-bats...",
+              end="", flush=True)
+        for need, group in short.items():
+            runs = _sample_candidates([candidates[i] for i in group], need, workers, seed, round_no,
+                                      crn, offset=level - need)
+            for i, (counts, pitch_counts) in zip(group, runs):
+                if store is not None:
+                    totals[i], pitch_totals[i], sampled[i] = store.add(candidates[i], counts, pitch_counts, need)
+                    continue
+                for k in RESULT_KEYS:
+                    totals[i][k] += counts[k]
+                for pt in pitch_counts:
+                    pitch_totals[i][pt] += pitch_counts[pt]
+                sampled[i] += need
+            spent += need * len(group)
+            new_at_bats += need * len(group)
+
+        # Drop every candidate that is clearly worse than the current leader
+        spreads = {i: _score_spread(totals[i], sampled[i], target_ba, target_obp, target_slg) for i in alive}
+        leader_score, leader_var = min(spreads.values())
+        alive = [i for i in alive
+                 if spreads[i][0] - leader_score <= _RACE_Z * (spreads[i][1] + leader_var) ** 0.5]
+        if len(alive) == 1:
+            break
+        # Double the survivors' samples, or spend what's left of the budget on them
+        step = min(level, (budget - spent) // len(alive))
+        if step <= 0:
+            break
+        level += step
+        round_no += 1
+
+    best = min(alive, key=lambda i: _search_score(totals[i], sampled[i], target_ba, target_obp, target_slg))
+    reused = f", {spent - new_at_bats:,} from the store" if spent > new_at_bats else ""
+    print(f"\r  Done — raced {total} configurations on {spent:,} at-bats ({new_at_bats:,} new{reused}; "
+          f"{len(alive)} left, best on {sampled[best]:,}).                    ")
+    return candidates[best]
+
+
+def hitter_search(base_cfg, target_ba, target_obp, target_slg, n_sims=1000, workers=None, seed=None,
+                  exact=False, crn=False, store=None):
     """Search over hitter levers (commit bonuses, power bonus). Pitcher config fixed."""
     return _run_search(base_cfg, {
         "correct_commit_bonus": [0, 1, 2],
         "wrong_commit_penalty": [-2, -1, 0],
         "hitter_power_bonus":   [-2, -1, 0, 1, 2, 3],
-    }, target_ba, target_obp, target_slg, n_sims)
+    }, target_ba, target_obp, target_slg, n_sims, workers, seed, exact, crn, store)
 
 
-def pitcher_search(base_cfg, target_ba, target_obp, target_slg, n_sims=1000):
+def pitcher_search(base_cfg, target_ba, target_obp, target_slg, n_sims=1000, workers=None, seed=None,
+                   exact=False, crn=False, store=None):
     """Search over pitcher levers (dice, difficulty, pitch requirements, deception). Hitter config fixed."""
     return _run_search(base_cfg, {
         "pitcher_dice":      [4, 5],
@@ -356,11 +698,23 @@ def pitcher_search(base_cfg, target_ba, target_obp, target_slg, n_sims=1000):
         "hidden_reroll":     [False, True],
         "cb_allow_six":      [False, True],
         "fb_match_count":    [2, 3],
-    }, target_ba, target_obp, target_slg, n_sims)
+    }, target_ba, target_obp, target_slg, n_sims, workers, seed, exact, crn, store)
+
+
+def _report_timing(profile):
+    """With --profile, prints the phase timings for the run just finished and starts a fresh count."""
+    if profile:
+        from game import perf
+        perf.report()
+        perf.reset()
 
 
-def main():
+def main(workers=None, seed=None, exact=False, crn=False, use_store=True, profile=False, precision=None):
     cfg = GameConfig()
+    store = ResultStore() if use_store else None
+    if profile:
+        from game import perf
+        perf.enable()
     print("╔═══════════════════════════════════════╗")
     print("║      DICEBALL SIMULATOR               ║")
     print("╚═══════════════════════════════════════╝")
@@ -369,6 +723,8 @@ def main():
         display_config(cfg)
         print("\n  [e] Edit a lever")
         print("  [r] Run simulations")
+        print("  [b] Run batch simulations     (vectorized — millions of at-bats, needs NumPy)")
+        print("  [x] Exact outcome distribution (solved, no sampling)")
         print("  [h] Target hitter slash line  (searches hitter levers, pitcher config fixed)")
         print("  [p] Target pitcher slash line (searches pitcher levers, hitter config fixed)")
         print("  [q] Quit")
@@ -377,16 +733,38 @@ def main():
         if choice == "q":
             break
         elif choice == "e":
-            edit_config(cfg)
+            cfg = edit_config(cfg)
         elif choice == "r":
-            raw = input("Number of simulations [1000]: ").strip()
+            default_n = _CI_MAX_N if precision else 1000
+            prompt = "Most simulations to run" if precision else "Number of simulations"
+            raw = input(f"{prompt} [{default_n}]: ").strip()
             try:
-                n = int(raw) if raw else 1000
+                n = int(raw) if raw else default_n
             except ValueError:
                 print("Invalid number.")
                 continue
-            counts, pitch_counts = run_simulations(cfg, n)
+            if precision:
+                counts, pitch_counts = run_to_precision(cfg, precision, n, workers, seed, store=store)
+            else:
+                counts, pitch_counts = run_simulations(cfg, n, workers, seed, store=store)
+            display_results(counts, pitch_counts, sum(counts.values()), precision=precision)
+            _report_timing(profile)
+        elif choice == "b":
+            raw = input("Number of simulations [1000000]: ").strip()
+            try:
+                n = int(raw) if raw else 1_000_000
+            except ValueError:
+                print("Invalid number.")
+                continue
+            try:
+                counts, pitch_counts = run_batch_simulations(cfg, n)
+            except (RuntimeError, ValueError) as e:
+                print(e)
+                continue
             display_results(counts, pitch_counts, n)
+        elif choice == "x":
+            counts, pitch_counts = exact_results(cfg)
+            display_results(counts, pitch_counts, 1000, exact=True)
         elif choice in ("h", "p"):
             side = "hitter" if choice == "h" else "pitcher"
             print(f"\nTarget {side} slash line (e.g. .301 .397 .566):")
@@ -399,16 +777,48 @@ def main():
                 continue
             label = f".{int(tba*1000):03d}/.{int(tobp*1000):03d}/.{int(tslg*1000):03d}"
             print(f"\n  Searching {side} levers for {label} ...")
-            best = hitter_search(cfg, tba, tobp, tslg) if choice == "h" else pitcher_search(cfg, tba, tobp, tslg)
+            search = hitter_search if choice == "h" else pitcher_search
+            best = search(cfg, tba, tobp, tslg, workers=workers, seed=seed, exact=exact, crn=crn, store=store)
+            _report_timing(profile)
             print(f"\n  Best {side} config found:")
             cfg = best
             display_config(cfg)
-            print("\n  Running 2,000 verification sims...")
-            counts, pitch_counts = run_simulations(cfg, 2000)
-            display_results(counts, pitch_counts, 2000)
+            if exact:
+                counts, pitch_counts = exact_results(cfg)
+                display_results(counts, pitch_counts, 1000, exact=True)
+                continue
+            if precision:
+                print(f"\n  Verifying to {precision:g} x the MLB tolerances...")
+                counts, pitch_counts = run_to_precision(cfg, precision, _CI_MAX_N, workers, seed,
+                                                        store=store, fresh=True)
+            else:
+                print("\n  Running 2,000 verification sims...")
+                counts, pitch_counts = run_simulations(cfg, 2000, workers, seed, store=store, fresh=True)
+            display_results(counts, pitch_counts, sum(counts.values()), precision=precision)
         else:
             print("Invalid choice.")
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Diceball lever simulator.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="shard simulations over this many worker processes")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="base seed for the dice (same seed + workers = same results)")
+    parser.add_argument("--exact", action="store_true",
+                        help="score lever searches with the exact solver instead of sampling")
+    parser.add_argument("--crn", action="store_true",
+                        help="lever searches play every candidate on the same dice (common random numbers)")
+    parser.add_argument("--no-store", action="store_true",
+                        help="don't read or save at-bat counts in results.sqlite3")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the engine and AI phases and print a breakdown after each run or search")
+    parser.add_argument("--precision", type=float, default=None, metavar="F",
+                        help="[r] and verification runs simulate until every 95%% interval is within "
+                             "F x its MLB tolerance (e.g. 0.5), instead of a fixed count")
+    args = parser.parse_args()
+    if args.precision is not None and args.precision <= 0:
+        parser.error("--precision must be greater than 0")
+    main(workers=args.workers, seed=args.seed, exact=args.exact, crn=args.crn, use_store=not args.no_store,
+         profile=args.profile, precision=args.precision)
@@ -0,0 +1,85 @@
+"""
+Diceball lever sweep: simulates every combination of lever values over a process
+pool, checkpointing each config's counts to a JSON Lines file as it finishes
+(see game/sweep.py). Run the same command again to resume an interrupted sweep.
+
+Usage:
+    uv run sweep.py sweeps/hitting.jsonl correct_commit_bonus=0..2 wrong_commit_penalty=-2..0 hitter_power_bonus=-2..3
+    uv run sweep.py sweeps/full.jsonl pitcher_dice=4,5 gas_per_at_bat=auto,0,1,2 difficulty_method=max,mid,min \\
+        hidden_reroll=false,true hitter_power_bonus=-1..2 --at-bats 20000 --workers 32
+    uv run sweep.py sweeps/full.jsonl --report           # rank what's in a sweep file so far
+"""
+import time
+
+from game.config import GameConfig
+from game.sweep import parse_grid, read_sweep, run_sweep, sweep_configs
+from simulator import MLB_TARGETS, compute_stats
+
+_RANKED_STATS = ("BA", "OBP", "SLG")
+
+
+def _miss(stats):
+    """How far a config's slash line is from MLB, in units of each stat's tolerance."""
+    return sum(((stats[s] - MLB_TARGETS[s][0]) / MLB_TARGETS[s][1]) ** 2 for s in _RANKED_STATS) ** 0.5
+
+
+def print_sweep(records, top, seconds=None):
+    timing = f"  |  {seconds:.1f}s" if seconds is not None else ""
+    print(f"\n{'=' * 58}")
+    print(f"  DICEBALL SWEEP  —  {len(records):,} configs  |  "
+          f"{sum(r['at_bats'] for r in records):,} at-bats{timing}")
+    print(f"{'=' * 58}")
+    if not records:
+        return
+    # Only the levers the sweep varied are worth a column
+    varied = [key for key in records[0]["config"] if len({str(r["config"][key]) for r in records}) > 1]
+    ranked = sorted((_miss(compute_stats(r["results"], r["at_bats"])), i) for i, r in enumerate(records))
+    print(f"\n  Closest to the MLB slash line "
+          f"({'/'.join(f'{MLB_TARGETS[s][0]:.3f}' for s in _RANKED_STATS)}):")
+    for miss, i in ranked[:top]:
+        r = records[i]
+        stats = compute_stats(r["results"], r["at_bats"])
+        levers = "  ".join(f"{key}={r['config'][key]}" for key in varied) or "(one config)"
+        print(f"    {stats['BA']:.3f}/{stats['OBP']:.3f}/{stats['SLG']:.3f}  "
+              f"K% {stats['K%']:>5.1%}  BB% {stats['BB%']:>5.1%}  miss {miss:4.1f}   {levers}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Diceball resumable lever sweep.")
+    parser.add_argument("path", help="sweep file (JSON Lines) — created, or resumed if it exists")
+    parser.add_argument("levers", nargs="*", metavar="FIELD=VALUES",
+                        help="a GameConfig field and its values: comma-separated, or lo..hi for integers")
+    parser.add_argument("--at-bats", type=int, default=5000, help="at-bats per config")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument("--seed", type=int, default=None, help="sweep seed (default: random, kept in the file)")
+    parser.add_argument("--top", type=int, default=10, help="configs to list in the report")
+    parser.add_argument("--report", action="store_true", help="rank the configs already in the file and exit")
+    args = parser.parse_args()
+
+    if args.report:
+        header, records = read_sweep(args.path)
+        if header is None:
+            parser.error(f"{args.path} is not a sweep file")
+        print_sweep(list(records.values()), args.top)
+        raise SystemExit
+    if not args.levers:
+        parser.error("give at least one FIELD=VALUES lever (or --report)")
+    try:
+        configs = sweep_configs(GameConfig(), parse_grid(args.levers))
+    except ValueError as e:
+        parser.error(str(e))
+
+    def progress(done, total):
+        print(f"\r  Swept {done:,}/{total:,} configs...", end="", flush=True)
+
+    start = time.perf_counter()
+    try:
+        records = run_sweep(configs, args.at_bats, args.path, args.workers, args.seed, progress)
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print(f"\n  Interrupted — finished configs are saved in {args.path}; run the same command to resume.")
+        raise SystemExit(130)
+    print()
+    print_sweep(records, args.top, time.perf_counter() - start)
@@ -0,0 +1,78 @@
+"""
+Diceball table artifacts: compiles the CPU pitcher's decision tables ahead of
+time and saves them under tables/, where every later run (and every worker
+process) memory-maps them instead of building them (see game/tables.py).
+
+Usage:
+    uv run tables.py                                  # default rules, 4 and 5 dice
+    uv run tables.py fb_match_count=2,3 difficulty_method=max,mid,min
+    uv run tables.py --policy                         # also solve the equilibrium tables (policies/)
+    uv run tables.py --check                          # replay every pitcher slot against the heuristic
+    uv run tables.py --clean                          # delete tables left by older versions of game/
+"""
+import time
+from dataclasses import replace
+
+from game.ai import PitcherTable, pitcher_table_path
+from game.config import GameConfig
+from game.policy import POLICY_DIR, policy_table
+from game.sweep import parse_grid, sweep_configs
+from game.tables import TABLE_DIR, remove_stale
+
+
+def build_tables(config, num_dice, policy=False, check=False):
+    """
+    Saves one rule set's pitcher table (and with policy, its equilibrium table) unless already
+    saved. check: replays the pitcher table against the heuristic. Returns its mismatched slots.
+    """
+    start = time.perf_counter()
+    table = PitcherTable.load(config, num_dice)
+    status = "loaded"
+    if table is None:
+        table = PitcherTable(config, num_dice)
+        table.save()
+        status = "built"
+    print(f"  pitcher {num_dice}d  {status:<6} {time.perf_counter() - start:6.2f}s  {table.nbytes() / 1024:8,.0f} KiB  "
+          f"{pitcher_table_path(config, num_dice).name}")
+    mismatches = []
+    if check:
+        start = time.perf_counter()
+        mismatches = table.check()
+        print(f"  pitcher {num_dice}d  {'checked' if not mismatches else 'FAILED':<6} "
+              f"{time.perf_counter() - start:6.2f}s  {len(mismatches):,} of {table.slots:,} slots differ")
+    if policy:
+        start = time.perf_counter()
+        table = policy_table(replace(config, pitcher_dice=num_dice), num_dice)
+        print(f"  policy  {num_dice}d  ready  {time.perf_counter() - start:6.2f}s  {table.nbytes() / 1024:8,.0f} KiB")
+    return mismatches
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Build Diceball's memory-mapped table artifacts.")
+    parser.add_argument("levers", nargs="*", metavar="FIELD=VALUES",
+                        help="rule sets to build, as in sweep.py (default: the default rules)")
+    parser.add_argument("--dice", type=int, nargs="+", default=[4, 5], help="pitcher dice pools")
+    parser.add_argument("--policy", action="store_true", help="also solve and save the equilibrium policy tables")
+    parser.add_argument("--check", action="store_true",
+                        help="replay every slot of each pitcher table against the heuristic, draw for draw")
+    parser.add_argument("--clean", action="store_true",
+                        help="delete every saved table written by another version of game/, then exit")
+    args = parser.parse_args()
+    if args.clean:
+        stale = remove_stale(TABLE_DIR, ".table") + remove_stale(POLICY_DIR, ".policy")
+        print(f"  Removed {len(stale)} stale table{'s' if len(stale) != 1 else ''}"
+              f" ({sum(1 for path in stale if path.suffix == '.policy')} policies).")
+        raise SystemExit
+    try:
+        configs = sweep_configs(GameConfig(), parse_grid(args.levers))
+    except ValueError as e:
+        parser.error(str(e))
+
+    failed = False
+    for config in configs:
+        for num_dice in args.dice:
+            failed |= bool(build_tables(config, num_dice, args.policy, args.check))
+    print(f"\n  Tables are saved in {TABLE_DIR}/.")
+    if failed:
+        raise SystemExit("  Some compiled pitcher decisions differ from the heuristic.")